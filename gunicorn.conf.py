@@ -0,0 +1,41 @@
+"""
+Gunicorn configuration for WMS Barcode Scanner Web Application
+Usage: gunicorn -c gunicorn.conf.py
+All values can be overridden with environment variables.
+"""
+
+import os
+
+# Application (module-level app built by create_app())
+wsgi_app = 'src.web.app:app'
+
+# Server socket
+bind = f"{os.getenv('FLASK_HOST', '0.0.0.0')}:{os.getenv('FLASK_PORT', '5000')}"
+
+# Worker processes - bounded thread pool per worker (gthread is safe for pyodbc)
+workers = int(os.getenv('WEB_CONCURRENCY', '4'))
+worker_class = 'gthread'
+threads = int(os.getenv('WEB_THREADS', '8'))
+timeout = int(os.getenv('WEB_TIMEOUT', '30'))
+
+# Recycle workers periodically to bound memory growth from slow leaks;
+# jitter staggers restarts so workers don't all recycle at once
+max_requests = int(os.getenv('WEB_MAX_REQUESTS', '2000'))
+max_requests_jitter = int(os.getenv('WEB_MAX_REQUESTS_JITTER', '400'))
+
+# Import the app once in the master so workers share it copy-on-write
+preload_app = True
+
+# Logging
+accesslog = '-'
+errorlog = '-'
+loglevel = os.getenv('LOG_LEVEL', 'info').lower()
+
+
+def post_fork(server, worker):
+    """Open database connections and log listener per worker (not shared across fork)"""
+    from src.web.app import configure_logging, initialize_database
+
+    configure_logging()
+    if not initialize_database():
+        server.log.warning("Worker %s started in offline mode (database unavailable)", worker.pid)
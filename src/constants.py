@@ -3,6 +3,8 @@ WMS Barcode Scanner - Constants
 Central repository for all hard-coded values used throughout the application.
 """
 
+from types import MappingProxyType
+
 # ============================================================================
 # WINDOW & DIALOG SIZES
 # ============================================================================
@@ -29,6 +31,7 @@ ENTRY_FIELD_LOGIN_WIDTH = 35
 COMBOBOX_WIDTH = 30
 FILTER_FIELD_WIDTH = 20
 JOB_LIST_WIDTH = 25
+COMBOBOX_MAX_ITEMS = 100  # Items put into a combobox list at once; typing filters the rest
 
 # Treeview Heights
 TREEVIEW_HEIGHT_SMALL = 6
@@ -47,14 +50,14 @@ COLUMN_WIDTH_EXTRA_WIDE = 200
 # SPACING & PADDING
 # ============================================================================
 
-# Standard Padding (padx, pady)
-PADDING_STANDARD = {"padx": 10, "pady": 10}
-PADDING_SMALL = {"padx": 5, "pady": 5}
-PADDING_LARGE = {"padx": 10, "pady": 20}
+# Standard Padding (padx, pady) - read-only mappings, use as **PADDING_STANDARD
+PADDING_STANDARD = MappingProxyType({"padx": 10, "pady": 10})
+PADDING_SMALL = MappingProxyType({"padx": 5, "pady": 5})
+PADDING_LARGE = MappingProxyType({"padx": 10, "pady": 20})
 
 # Specific Padding for Sections
-PADDING_SECTION_TOP = {"pady": (0, 20)}
-PADDING_SECTION_VERTICAL = {"pady": (0, 10)}
+PADDING_SECTION_TOP = MappingProxyType({"pady": (0, 20)})
+PADDING_SECTION_VERTICAL = MappingProxyType({"pady": (0, 10)})
 
 # ============================================================================
 # FONTS
@@ -76,6 +79,8 @@ DEFAULT_DATE_RANGE_DAYS = 7  # Default date range for filters
 
 # Auto-close Timers (in milliseconds)
 DUPLICATE_WARNING_AUTO_CLOSE_MS = 3000  # 3 seconds
+SEARCH_DEBOUNCE_MS = 150  # Coalesce rapid search triggers (Enter / combobox)
+SCAN_SUCCESS_TOAST_MS = 1500  # How long the last-scan confirmation stays visible
 
 # Date/Time Formats
 DATE_FORMAT = "%Y-%m-%d"
@@ -88,8 +93,21 @@ FILENAME_DATE_FORMAT = "%Y%m%d"
 
 RECENT_SCANS_LIMIT = 50
 HISTORY_SCANS_LIMIT = 10000
+HISTORY_PAGE_SIZE = 500  # Rows fetched per page in the history tab
+REPORT_PAGE_SIZE = 500  # Report rows fetched per page in the reports tab
+REPORT_CACHE_SIZE = 16  # Distinct report filter sets kept in memory
+REPORT_CACHE_TTL_SECONDS = 60  # Cached report rows older than this are re-queried
+TODAY_COUNT_CACHE_SIZE = 64  # Distinct today-count filter sets kept in memory
+TODAY_COUNT_CACHE_TTL_SECONDS = 5  # Cached today counts older than this are re-queried
+MASTER_DATA_CACHE_SIZE = 128  # Distinct job type / sub job / dependency reads kept in memory
+MASTER_DATA_CACHE_TTL_SECONDS = 60  # Cached master data older than this is re-queried
+CONNECTION_VALIDATE_IDLE_SECONDS = 30  # Probe the database only after this long without a successful query
+DB_POOL_MAX_IDLE = 4  # Idle database connections kept open for reuse
+DB_FETCH_BATCH_SIZE = 1000  # Rows pulled from the cursor per fetchmany() call
+DB_STATEMENT_CACHE_SIZE = 64  # Prepared cursors kept per pooled connection, keyed by SQL text
 IMPORT_PREVIEW_LIMIT = 20
 IMPORT_ERRORS_DISPLAY_LIMIT = 10
+IMPORT_INSERT_BATCH_SIZE = 500  # Imported scans sent per executemany round-trip
 
 # ============================================================================
 # FILE EXTENSIONS
@@ -5,9 +5,97 @@ Base Repository Module
 Provides base class for all repository implementations
 """
 
+import re
+import threading
+import time
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from functools import lru_cache
 from typing import Dict, List, Optional, Any, Tuple
 from .database_manager import DatabaseManager
+from .. import constants
+
+
+# ชื่อคอลัมน์/ORDER BY ที่ยอมให้ต่อเข้า SQL ได้ (ค่าจริงส่งเป็นพารามิเตอร์เสมอ)
+_IDENTIFIER_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+_ORDER_TERM_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*(\s+(ASC|DESC))?$", re.IGNORECASE)
+
+
+@lru_cache(maxsize=256)
+def _build_sql(
+    kind: str,
+    table: str,
+    keys: Tuple[str, ...] = (),
+    order_by: Optional[str] = None,
+    columns: Optional[Tuple[str, ...]] = None
+) -> str:
+    """
+    Build the SQL text for a CRUD helper once per shape
+
+    The result depends only on the table, the column names and the ORDER BY,
+    so repeated calls reuse the same string instead of re-joining it.
+
+    Args:
+        kind: 'select', 'count', 'exists', 'insert', 'update' or 'delete'
+        table: Table name
+        keys: Column names used in WHERE (select/count/exists/delete), VALUES
+            (insert) or SET (update)
+        order_by: Optional ORDER BY, e.g. "created_date DESC" (select only)
+        columns: Columns to return (select only, default: all columns)
+
+    Returns:
+        SQL string with ? placeholders
+
+    Raises:
+        ValueError: If a column name or ORDER BY term is not a plain identifier,
+            or a delete has no key columns
+    """
+    for name in (table,) + keys + (columns or ()):
+        if not _IDENTIFIER_PATTERN.match(name):
+            raise ValueError(f"Invalid column name '{name}'")
+
+    if order_by is not None:
+        terms = [term.strip() for term in order_by.split(",")]
+        if not all(_ORDER_TERM_PATTERN.match(term) for term in terms):
+            raise ValueError(f"Cannot order by '{order_by}'")
+        order_by = ", ".join(terms)
+
+    where_clause = " AND ".join(f"{col} = ?" for col in keys)
+
+    if kind == 'select':
+        query = f"SELECT {', '.join(columns) if columns else '*'} FROM {table}"
+        if where_clause:
+            query += f" WHERE {where_clause}"
+        if order_by:
+            query += f" ORDER BY {order_by}"
+        return query
+
+    if kind == 'count':
+        query = f"SELECT COUNT(*) as count FROM {table}"
+        if where_clause:
+            query += f" WHERE {where_clause}"
+        return query
+
+    if kind == 'exists':
+        subquery = f"SELECT 1 FROM {table}"
+        if where_clause:
+            subquery += f" WHERE {where_clause}"
+        return f"SELECT CASE WHEN EXISTS ({subquery}) THEN 1 ELSE 0 END as found"
+
+    if kind == 'insert':
+        placeholders = ", ".join("?" for _ in keys)
+        return f"INSERT INTO {table} ({', '.join(keys)}) VALUES ({placeholders})"
+
+    if kind == 'update':
+        set_clause = ", ".join(f"{col} = ?" for col in keys)
+        return f"UPDATE {table} SET {set_clause} WHERE id = ?"
+
+    if kind == 'delete':
+        if not where_clause:
+            raise ValueError(f"Refusing to delete from '{table}' without conditions")
+        return f"DELETE FROM {table} WHERE {where_clause}"
+
+    raise ValueError(f"Unknown query kind '{kind}'")
 
 
 class BaseRepository(ABC):
@@ -16,8 +104,27 @@ class BaseRepository(ABC):
 
     Provides common CRUD operations and database access patterns.
     Child classes should implement table-specific logic.
+
+    Repositories for small, rarely-changed tables set read_mostly = True.
+    Their reads made through cached_query are kept for
+    MASTER_DATA_CACHE_TTL_SECONDS, and any write made through this class
+    clears the cache.
     """
 
+    # ตารางข้อมูลหลัก (อ่านบ่อย แก้ไขน้อย) ให้ cache ผลลัพธ์การอ่าน
+    read_mostly: bool = False
+
+    # คอลัมน์ที่ find_* ดึงมาเมื่อไม่ระบุ columns (None = ทุกคอลัมน์)
+    default_columns: Optional[Tuple[str, ...]] = None
+
+    # (connection_string, table, query, params) -> (timestamp, rows)
+    # ใช้ร่วมกันทุก instance เพื่อให้แท็บต่าง ๆ ได้ประโยชน์จาก cache เดียวกัน
+    _query_cache: "OrderedDict[Tuple, Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+    # แท็บ (worker thread) และ request ของ web อ่าน/ล้าง cache พร้อมกัน - ทุกการเข้าถึงต้องถือ lock นี้
+    _cache_lock = threading.Lock()
+    # เพิ่มทุกครั้งที่ล้าง cache - ผลของ query ที่เริ่มก่อนการล้างจะไม่ถูกเก็บ
+    _cache_generation = 0
+
     def __init__(self, db_manager: DatabaseManager):
         """
         Initialize repository with database manager
@@ -36,41 +143,116 @@ class BaseRepository(ABC):
         """
         pass
 
+    # ========================================================================
+    # Master Data Cache
+    # ========================================================================
+
+    @classmethod
+    def invalidate_cache(cls, table: Optional[str] = None) -> None:
+        """
+        Drop cached reads
+
+        Args:
+            table: Only drop reads of this table (default: drop everything)
+        """
+        with BaseRepository._cache_lock:
+            BaseRepository._cache_generation += 1
+            if table is None:
+                BaseRepository._query_cache.clear()
+                return
+            for key in [key for key in BaseRepository._query_cache if key[1] == table]:
+                del BaseRepository._query_cache[key]
+
+    def cached_query(self, query: str, params: Tuple = ()) -> List[Dict[str, Any]]:
+        """
+        Execute a SELECT, reusing a recent result for read-mostly tables
+
+        Args:
+            query: SQL query string
+            params: Query parameters tuple
+
+        Returns:
+            List of result dictionaries (a fresh list on every call)
+        """
+        if not self.read_mostly:
+            return self.db.execute_query(query, params)
+
+        cache = BaseRepository._query_cache
+        key = (self.db.connection_string, self.table_name, query, tuple(params))
+        now = time.monotonic()
+
+        with BaseRepository._cache_lock:
+            cached = cache.get(key)
+            if cached is not None and now - cached[0] < constants.MASTER_DATA_CACHE_TTL_SECONDS:
+                cache.move_to_end(key)
+                return list(cached[1])
+            generation = BaseRepository._cache_generation
+
+        # query นอก lock - thread อื่นใช้ cache ต่อได้ระหว่างรอฐานข้อมูล
+        rows = self.db.execute_query(query, params)
+
+        with BaseRepository._cache_lock:
+            if generation == BaseRepository._cache_generation:
+                cache[key] = (now, rows)
+                cache.move_to_end(key)
+                if len(cache) > constants.MASTER_DATA_CACHE_SIZE:
+                    cache.popitem(last=False)
+
+        return list(rows)
+
     # ========================================================================
     # Common CRUD Operations
     # ========================================================================
 
-    def find_by_id(self, record_id: int) -> Optional[Dict[str, Any]]:
+    def _columns(self, columns: Optional[Tuple[str, ...]]) -> Optional[Tuple[str, ...]]:
+        """Columns for a find_* call: explicit ones, else default_columns"""
+        return tuple(columns) if columns else self.default_columns
+
+    def find_by_id(
+        self,
+        record_id: int,
+        columns: Optional[Tuple[str, ...]] = None
+    ) -> Optional[Dict[str, Any]]:
         """
         Find a single record by ID
 
         Args:
             record_id: The ID to search for
+            columns: Columns to return (default: default_columns, else all)
 
         Returns:
             Dictionary containing the record, or None if not found
         """
-        query = f"SELECT * FROM {self.table_name} WHERE id = ?"
-        results = self.db.execute_query(query, (record_id,))
+        query = _build_sql('select', self.table_name, ('id',), None, self._columns(columns))
+        results = self.cached_query(query, (record_id,))
         return results[0] if results else None
 
-    def find_all(self, order_by: str = "id") -> List[Dict[str, Any]]:
+    def find_all(
+        self,
+        order_by: str = "id",
+        columns: Optional[Tuple[str, ...]] = None
+    ) -> List[Dict[str, Any]]:
         """
         Get all records from the table
 
         Args:
             order_by: Column name to order by (default: "id")
+            columns: Columns to return (default: default_columns, else all)
 
         Returns:
             List of dictionaries containing all records
+
+        Raises:
+            ValueError: If order_by is not a column name (optionally ASC/DESC)
         """
-        query = f"SELECT * FROM {self.table_name} ORDER BY {order_by}"
-        return self.db.execute_query(query)
+        query = _build_sql('select', self.table_name, (), order_by, self._columns(columns))
+        return self.cached_query(query)
 
     def find_where(
         self,
         conditions: Dict[str, Any],
-        order_by: Optional[str] = None
+        order_by: Optional[str] = None,
+        columns: Optional[Tuple[str, ...]] = None
     ) -> List[Dict[str, Any]]:
         """
         Find records matching conditions
@@ -78,21 +260,22 @@ class BaseRepository(ABC):
         Args:
             conditions: Dictionary of column: value pairs to match
             order_by: Optional column name to order results
+            columns: Columns to return (default: default_columns, else all)
 
         Returns:
             List of matching records
 
+        Raises:
+            ValueError: If a column name or order_by is not a plain identifier
+
         Example:
             repo.find_where({'is_active': 1, 'user_id': 5}, order_by='created_date')
         """
-        where_clause = " AND ".join([f"{col} = ?" for col in conditions.keys()])
-        query = f"SELECT * FROM {self.table_name} WHERE {where_clause}"
-
-        if order_by:
-            query += f" ORDER BY {order_by}"
-
+        query = _build_sql(
+            'select', self.table_name, tuple(conditions), order_by or None, self._columns(columns)
+        )
         params = tuple(conditions.values())
-        return self.db.execute_query(query, params)
+        return self.cached_query(query, params)
 
     def count(self, conditions: Optional[Dict[str, Any]] = None) -> int:
         """
@@ -104,15 +287,11 @@ class BaseRepository(ABC):
         Returns:
             Count of matching records
         """
-        if conditions:
-            where_clause = " AND ".join([f"{col} = ?" for col in conditions.keys()])
-            query = f"SELECT COUNT(*) as count FROM {self.table_name} WHERE {where_clause}"
-            params = tuple(conditions.values())
-        else:
-            query = f"SELECT COUNT(*) as count FROM {self.table_name}"
-            params = ()
+        conditions = conditions or {}
+        query = _build_sql('count', self.table_name, tuple(conditions))
+        params = tuple(conditions.values())
 
-        results = self.db.execute_query(query, params)
+        results = self.cached_query(query, params)
         return results[0]['count'] if results else 0
 
     def insert(self, data: Dict[str, Any]) -> int:
@@ -125,11 +304,9 @@ class BaseRepository(ABC):
         Returns:
             Number of rows affected (typically 1)
         """
-        columns = ", ".join(data.keys())
-        placeholders = ", ".join(["?" for _ in data])
-        query = f"INSERT INTO {self.table_name} ({columns}) VALUES ({placeholders})"
+        query = _build_sql('insert', self.table_name, tuple(data))
         params = tuple(data.values())
-        return self.db.execute_non_query(query, params)
+        return self.execute_non_query(query, params)
 
     def update(self, record_id: int, data: Dict[str, Any]) -> int:
         """
@@ -142,10 +319,9 @@ class BaseRepository(ABC):
         Returns:
             Number of rows affected
         """
-        set_clause = ", ".join([f"{col} = ?" for col in data.keys()])
-        query = f"UPDATE {self.table_name} SET {set_clause} WHERE id = ?"
+        query = _build_sql('update', self.table_name, tuple(data))
         params = tuple(list(data.values()) + [record_id])
-        return self.db.execute_non_query(query, params)
+        return self.execute_non_query(query, params)
 
     def delete(self, record_id: int) -> int:
         """
@@ -157,8 +333,8 @@ class BaseRepository(ABC):
         Returns:
             Number of rows affected
         """
-        query = f"DELETE FROM {self.table_name} WHERE id = ?"
-        return self.db.execute_non_query(query, (record_id,))
+        query = _build_sql('delete', self.table_name, ('id',))
+        return self.execute_non_query(query, (record_id,))
 
     def exists(self, conditions: Dict[str, Any]) -> bool:
         """
@@ -170,7 +346,11 @@ class BaseRepository(ABC):
         Returns:
             True if at least one matching record exists
         """
-        return self.count(conditions) > 0
+        # EXISTS stops at the first match instead of counting every row.
+        # Existence checks guard writes, so they are never answered from the cache.
+        query = _build_sql('exists', self.table_name, tuple(conditions))
+        results = self.db.execute_query(query, tuple(conditions.values()))
+        return bool(results[0]['found']) if results else False
 
     # ========================================================================
     # Raw Query Support
@@ -193,6 +373,9 @@ class BaseRepository(ABC):
         """
         Execute a custom INSERT/UPDATE/DELETE query
 
+        Writes to a read-mostly table clear the whole master data cache, since
+        those tables are joined and cascade-deleted together.
+
         Args:
             query: SQL query string
             params: Query parameters tuple
@@ -200,4 +383,28 @@ class BaseRepository(ABC):
         Returns:
             Number of rows affected
         """
-        return self.db.execute_non_query(query, params)
+        try:
+            return self.db.execute_non_query(query, params)
+        finally:
+            if self.read_mostly:
+                self.invalidate_cache()
+
+    def execute_many(self, query: str, params_list: List[Tuple]) -> int:
+        """
+        Execute one INSERT/UPDATE for many parameter rows in a single round-trip
+
+        Args:
+            query: SQL query string
+            params_list: One parameters tuple per row
+
+        Returns:
+            Number of rows written
+
+        Raises:
+            QueryException: If the batch failed (no row of it is written)
+        """
+        try:
+            return self.db.execute_many(query, params_list)
+        finally:
+            if self.read_mostly:
+                self.invalidate_cache()
@@ -5,22 +5,240 @@ Database Manager Module
 Handles all database operations and connections
 """
 
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
 import pyodbc
-import tkinter.messagebox as messagebox
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, Any, Tuple, Union
 from .connection_config import ConnectionConfig
+from .. import constants
+from ..exceptions import ConfigurationException, ConnectionException, DatabaseException, QueryException
+
+
+@lru_cache(maxsize=256)
+def _row_builder(columns: Tuple[str, ...]) -> Callable[[Any], Dict[str, Any]]:
+    """
+    สร้างฟังก์ชันแปลงแถวเป็น dictionary สำหรับชุดคอลัมน์นี้ (สร้างครั้งเดียวต่อชุดคอลัมน์)
+
+    ฟังก์ชันที่ได้คืน dict literal ที่มี key คงที่ เช่น {'id': r[0], 'name': r[1]}
+    ซึ่งเร็วกว่า dict(zip(columns, row)) ที่ต้องสร้าง iterator ทุกแถว
+
+    ชื่อคอลัมน์ถูก intern ทุกตัว (compiler intern ให้เฉพาะชื่อที่เป็น ASCII identifier)
+    ทุกแถวและทุก query จึงใช้ key object เดียวกัน และ row['ชื่อ'] จากโค้ดผู้เรียก
+    เทียบ key ด้วย pointer ได้ทันทีโดยไม่ต้องเทียบทีละตัวอักษร
+    """
+    items = ", ".join(f"{name!r}: r[{index}]" for index, name in enumerate(columns))
+    namespace: Dict[str, Any] = {}
+    exec(f"def build_row(r):\n    return {{{items}}}", namespace)
+    build_row = namespace['build_row']
+    code = build_row.__code__
+    build_row.__code__ = code.replace(co_consts=tuple(_intern_constant(c) for c in code.co_consts))
+    return build_row
+
+
+def _intern_constant(value):
+    """intern สตริง (หรือ tuple ของ key ใน dict literal) ที่เป็นค่าคงที่ของโค้ด"""
+    if type(value) is str:
+        return sys.intern(value)
+    if type(value) is tuple:
+        return tuple(_intern_constant(item) for item in value)
+    return value
+
+
+def _rows_to_dicts(cursor) -> List[Dict[str, Any]]:
+    """
+    แปลงผลลัพธ์ทั้งหมดของ cursor เป็น list ของ dictionary
+
+    ดึงทีละชุด (fetchmany) แทน fetchall เพื่อไม่ต้องถือแถวดิบทั้งหมด
+    ไว้พร้อมกับ list ของ dictionary ในหน่วยความจำ
+    """
+    build_row = _row_builder(tuple(column[0] for column in cursor.description))
+    results: List[Dict[str, Any]] = []
+    while True:
+        batch = cursor.fetchmany(constants.DB_FETCH_BATCH_SIZE)
+        if not batch:
+            return results
+        results.extend([build_row(row) for row in batch])
+
+
+def _close_quietly(conn):
+    """ปิด connection โดยไม่สนใจข้อผิดพลาด (เช่น connection ที่ตายไปแล้ว)"""
+    try:
+        conn.close()
+    except Exception:
+        pass
+
+
+@lru_cache(maxsize=256)
+def _sp_call_sql(sp_name: str, param_count: int) -> str:
+    """สร้างคำสั่ง EXEC ของ stored procedure (สร้างครั้งเดียวต่อชื่อ SP/จำนวนพารามิเตอร์)"""
+    return f"EXEC {sp_name} {','.join('?' * param_count)}"
+
+
+class PreparedStatement:
+    """
+    คำสั่ง SQL ที่เรียกซ้ำบ่อย (เช่น INSERT การสแกน) บน connection/cursor ถาวร
+
+    pyodbc เตรียม (prepare) คำสั่งไว้ครั้งแรกและใช้ซ้ำเมื่อ cursor เดิมรัน SQL
+    ข้อความเดิมอีก จึงไม่ต้องเปิด connection และ parse คำสั่งใหม่ทุกครั้ง
+
+    cursor ที่ว่างอยู่เก็บใน deque (free-list) และถือ lock เฉพาะตอนหยิบ/คืน
+    เท่านั้น ผู้เรียกหลาย thread (เช่น request ของ web) จึงรันคำสั่งพร้อมกันได้
+    โดยไม่ต้องรอกันตลอด round-trip ของฐานข้อมูล
+
+    ใช้กติกาเดียวกับ pool ของ DatabaseManager: connection ที่ว่างเกิน
+    CONNECTION_VALIDATE_IDLE_SECONDS ถูกปิดทิ้ง และเก็บไว้ไม่เกิน DB_POOL_MAX_IDLE ตัว
+    """
+
+    def __init__(self, db_manager: "DatabaseManager", query: str):
+        self.db_manager = db_manager
+        self.query = query
+        self._lock = threading.Lock()
+        # (connection string, เวลาที่คืน, connection, cursor) ที่ว่างอยู่ - เก่าสุดอยู่ซ้าย
+        self._idle: deque = deque()
+
+    def _checkout(self) -> Tuple[Tuple, bool]:
+        """
+        หยิบ cursor ที่ว่าง หรือเปิด connection ใหม่เมื่อไม่มี/connection string เปลี่ยน
+
+        Returns:
+            (entry, reused) - reused เป็น True เมื่อได้ connection เดิมจาก free-list
+        """
+        connection_string = self.db_manager.connection_string
+        now = time.monotonic()
+        stale = []
+        entry = None
+        with self._lock:
+            idle = self._idle
+            while idle and now - idle[0][1] >= constants.CONNECTION_VALIDATE_IDLE_SECONDS:
+                stale.append(idle.popleft())
+            while idle:
+                candidate = idle.pop()
+                if candidate[0] == connection_string:
+                    entry = candidate
+                    break
+                stale.append(candidate)
+
+        for candidate in stale:
+            _close_quietly(candidate[2])
+
+        if entry is not None:
+            return entry, True
+        return self._open(connection_string), False
+
+    @staticmethod
+    def _open(connection_string: str) -> Tuple:
+        """เปิด connection ใหม่พร้อม cursor สำหรับคำสั่งนี้"""
+        conn = pyodbc.connect(connection_string)
+        return (connection_string, 0.0, conn, conn.cursor())
+
+    def _run(self, entry: Tuple, params: Tuple) -> Union[List[Dict], int]:
+        """รันคำสั่งบน entry (ข้อผิดพลาดส่งต่อให้ผู้เรียก)"""
+        _, _, conn, cursor = entry
+        cursor.execute(self.query, params)
+
+        if cursor.description is not None:
+            return _rows_to_dicts(cursor)
+        conn.commit()
+        return cursor.rowcount
+
+    def __call__(self, params: Tuple = ()) -> Union[List[Dict], int]:
+        """
+        รันคำสั่งด้วยพารามิเตอร์ใหม่
+
+        ถ้าคำสั่งล้มเหลวบน connection ที่หยิบจาก free-list (เช่น server/firewall ตัด
+        connection ที่ว่างไปแล้ว) จะปิดตัวนั้นและลองใหม่หนึ่งครั้งบน connection ใหม่
+
+        Returns:
+            list ของ dictionary สำหรับ SELECT, จำนวนแถวที่เปลี่ยนสำหรับคำสั่งอื่น
+
+        Raises:
+            ConnectionException: เปิด connection ไม่ได้
+            QueryException: คำสั่งล้มเหลว (connection นั้นจะถูกปิดและไม่นำกลับมาใช้)
+        """
+        try:
+            entry, reused = self._checkout()
+        except Exception as e:
+            raise ConnectionException(f"ไม่สามารถเชื่อมต่อฐานข้อมูลได้: {str(e)}") from e
+        try:
+            result = self._run(entry, params)
+        except Exception as e:
+            _close_quietly(entry[2])
+            if not reused:
+                raise QueryException(f"เกิดข้อผิดพลาดในการดำเนินการ query: {str(e)}") from e
+            try:
+                entry = self._open(entry[0])
+            except Exception as retry_error:
+                raise ConnectionException(f"ไม่สามารถเชื่อมต่อฐานข้อมูลได้: {str(retry_error)}") from retry_error
+            try:
+                result = self._run(entry, params)
+            except Exception as retry_error:
+                _close_quietly(entry[2])
+                raise QueryException(f"เกิดข้อผิดพลาดในการดำเนินการ query: {str(retry_error)}") from retry_error
+
+        self._release(entry)
+        self.db_manager._mark_alive()
+        return result
+
+    def _release(self, entry: Tuple):
+        """คืน connection เข้า free-list (ถ้าเต็มจะปิดตัวที่ว่างนานที่สุดแทน)"""
+        connection_string, _, conn, cursor = entry
+        evicted = None
+        with self._lock:
+            if len(self._idle) >= constants.DB_POOL_MAX_IDLE:
+                evicted = self._idle.popleft()
+            self._idle.append((connection_string, time.monotonic(), conn, cursor))
+        if evicted is not None:
+            _close_quietly(evicted[2])
+
+    def close(self):
+        """ปิด connection ถาวรทั้งหมดของคำสั่งนี้"""
+        with self._lock:
+            entries = list(self._idle)
+            self._idle.clear()
+        for entry in entries:
+            _close_quietly(entry[2])
 
 
 class DatabaseManager:
-    """จัดการการเชื่อมต่อและดำเนินการกับฐานข้อมูล"""
+    """
+    จัดการการเชื่อมต่อและดำเนินการกับฐานข้อมูล
+
+    ข้อผิดพลาดถูกส่งต่อเป็น ConnectionException / QueryException (ไม่แสดง dialog เอง)
+    ให้ชั้น service/UI เป็นผู้ตัดสินใจว่าจะแจ้งผู้ใช้อย่างไร
+
+    ทุก execute_* ยืม connection จาก pool ของ manager (_connection) แทนการเปิดใหม่
+    ทุกครั้ง: connection ที่ว่างเกิน CONNECTION_VALIDATE_IDLE_SECONDS จะถูกปิดทิ้ง และ
+    connection ที่ query ล้มเหลวจะไม่ถูกคืนเข้า pool จึงไม่ต้องตรวจ liveness ก่อนใช้ทุกครั้ง
+    """
 
     # Config file constant for backwards compatibility
     CONFIG_FILE = "config/sql_config.json"
 
     def __init__(self, connection_info: Optional[Dict[str, Any]] = None):
         self.config_manager = ConnectionConfig()
+        # สร้างครั้งเดียวตอนตั้งค่า/เปลี่ยนการเชื่อมต่อ แล้วส่งให้ pyodbc.connect() ตรงๆ
+        # (pyodbc แปลง keyword กลับเป็นสตริงอยู่แล้ว การแยกเป็น dict ล่วงหน้าจึงไม่ช่วยอะไร)
         self.connection_string = ""
         self.current_user = ""
+        # ชื่อ -> PreparedStatement ที่ใช้ซ้ำตลอดอายุของ manager
+        self._prepared: Dict[str, PreparedStatement] = {}
+        # เวลา (monotonic) ที่คุยกับฐานข้อมูลสำเร็จครั้งล่าสุด
+        self._last_success = 0.0
+        # connection ที่ว่างอยู่: (connection string, เวลาที่คืน, connection, cursor ตาม SQL)
+        self._idle_connections: deque = deque()
+        # id() ของ connection ที่ถูกยืมอยู่ -> cursor ที่เตรียมไว้ตามข้อความ SQL
+        # (ใช้ id() เป็น key เพื่อไม่ต้องพึ่ง __hash__/__eq__ ของ pyodbc.Connection)
+        self._active_cursors: Dict[int, OrderedDict] = {}
+        # scoped_session() ของแต่ละ thread (connection ที่ผูกไว้กับ thread นั้น)
+        self._tls = threading.local()
+        self._pool_lock = threading.Lock()
+        # Timer ที่ปิด connection ว่างที่หมดอายุ (มีเฉพาะตอนที่ pool มี connection ว่าง)
+        self._sweep_timer: Optional[threading.Timer] = None
 
         if connection_info:
             # ใช้ข้อมูลการเชื่อมต่อจาก login
@@ -46,67 +264,330 @@ class DatabaseManager:
         """ทดสอบการเชื่อมต่อฐานข้อมูล"""
         try:
             with pyodbc.connect(self.connection_string) as conn:
+                self._mark_alive()
                 return True
-        except Exception as e:
-            messagebox.showerror("Error", f"ไม่สามารถเชื่อมต่อฐานข้อมูลได้: {str(e)}")
+        except Exception:
+            # ผู้เรียกเป็นผู้ตัดสินใจว่าจะแจ้งผู้ใช้อย่างไร
             return False
     
-    def execute_query(self, query: str, params: Tuple = ()) -> List[Dict]:
-        """ดำเนินการ query และส่งคืนผลลัพธ์เป็น list ของ dictionary"""
+    def _pop_expired(self, now: float) -> List[Any]:
+        """
+        เอา connection ที่ว่างนานเกินกำหนดออกจาก pool (ต้องถือ _pool_lock)
+
+        deque เรียงตามเวลาที่คืน (เก่าสุดอยู่ซ้าย) จึงหยุดที่ตัวแรกที่ยังไม่หมดอายุ
+        ทำงาน O(จำนวนที่หมดอายุ) โดยไม่ต้องมี thread คอยกวาด
+        """
+        expired = []
+        idle = self._idle_connections
+        while idle and now - idle[0][1] >= constants.CONNECTION_VALIDATE_IDLE_SECONDS:
+            expired.append(idle.popleft()[2])
+        return expired
+
+    def _acquire_connection(self, connection_string: str) -> Tuple[Any, OrderedDict]:
+        """หยิบ connection ที่ว่างจาก pool หรือเปิดใหม่ (ทิ้งตัวที่ว่างนานเกินไปหรือใช้ connection string เก่า)"""
+        entry = None
+        with self._pool_lock:
+            stale = self._pop_expired(time.monotonic())
+            while self._idle_connections:
+                candidate = self._idle_connections.pop()
+                if candidate[0] == connection_string:
+                    entry = candidate
+                    break
+                stale.append(candidate[2])
+
+        for conn in stale:
+            _close_quietly(conn)
+
+        if entry is None:
+            return pyodbc.connect(connection_string), OrderedDict()
+        return entry[2], entry[3]
+    
+    def _release_connection(self, connection_string: str, conn, cursors: OrderedDict):
+        """คืน connection เข้า pool (ถ้า pool เต็มจะปิดตัวที่ว่างนานที่สุดแทน)"""
+        now = time.monotonic()
+        timer = None
+        with self._pool_lock:
+            stale = self._pop_expired(now)
+            if len(self._idle_connections) >= constants.DB_POOL_MAX_IDLE:
+                stale.append(self._idle_connections.popleft()[2])
+            self._idle_connections.append((connection_string, now, conn, cursors))
+            if self._sweep_timer is None:
+                timer = self._schedule_sweep(constants.CONNECTION_VALIDATE_IDLE_SECONDS)
+
+        if timer is not None:
+            timer.start()
+        for candidate in stale:
+            _close_quietly(candidate)
+    
+    def _schedule_sweep(self, delay: float) -> threading.Timer:
+        """
+        สร้าง Timer ครั้งเดียวให้กวาด connection ว่างที่หมดอายุ (ต้องถือ _pool_lock)
+
+        ผู้เรียกต้อง start() เองหลังปล่อย lock - Thread.start() รอจน thread ใหม่เริ่มทำงาน
+        จึงไม่ควรทำขณะที่ thread อื่นรอหยิบ/คืน connection อยู่
+        (ถ้า close_connections() cancel ก่อน start() Timer จะจบทันทีโดยไม่กวาด)
+        """
+        timer = threading.Timer(delay, self._sweep_idle_connections)
+        timer.daemon = True
+        self._sweep_timer = timer
+        return timer
+    
+    def _sweep_idle_connections(self):
+        """
+        ปิด connection ว่างที่หมดอายุแม้ไม่มี query ใหม่เข้ามา
+
+        ตั้ง Timer ใหม่เฉพาะเมื่อยังมี connection ว่างเหลือ โดยรอจนตัวที่เก่าที่สุดหมดอายุ
+        """
+        now = time.monotonic()
+        timer = None
+        with self._pool_lock:
+            self._sweep_timer = None
+            stale = self._pop_expired(now)
+            if self._idle_connections:
+                oldest_released_at = self._idle_connections[0][1]
+                delay = oldest_released_at + constants.CONNECTION_VALIDATE_IDLE_SECONDS - now
+                timer = self._schedule_sweep(max(delay, 0.0))
+
+        if timer is not None:
+            timer.start()
+        for conn in stale:
+            _close_quietly(conn)
+    
+    @contextmanager
+    def _connection(self):
+        """
+        ยืม connection จาก pool ของ manager แทนการเปิดใหม่ทุก query
+
+        commit เมื่อสำเร็จ / rollback เมื่อเกิดข้อผิดพลาด (context ของ pyodbc)
+        connection ที่เกิดข้อผิดพลาดจะถูกปิดทิ้งและไม่นำกลับมาใช้
+        connection อยู่ในโหมด autocommit=False ของ pyodbc (ไม่สลับ autocommit ต่อ query
+        เพราะการสลับแต่ละครั้งเป็น round-trip ไปที่ server) - คำสั่งเขียนหลายแถว
+        ให้ใช้ execute_many ซึ่ง commit ครั้งเดียวทั้งชุด
+
+        Raises:
+            ConnectionException: เปิด connection ไม่ได้
+            QueryException: คำสั่งที่รันบน connection ล้มเหลว
+        """
+        connection_string = self.connection_string
+        session = getattr(self._tls, 'session', None)
+        pinned = session.pop('entry', None) if session is not None else None
+        if pinned is not None and pinned[0] != connection_string:
+            self._release_connection(*pinned)
+            pinned = None
+
+        if pinned is not None:
+            _, raw, cursors = pinned
+        else:
+            try:
+                raw, cursors = self._acquire_connection(connection_string)
+            except Exception as e:
+                raise ConnectionException(f"ไม่สามารถเชื่อมต่อฐานข้อมูลได้: {str(e)}") from e
         try:
-            with pyodbc.connect(self.connection_string) as conn:
-                cursor = conn.cursor()
-                cursor.execute(query, params)
-                
-                # รับชื่อคอลัมน์
-                columns = [column[0] for column in cursor.description]
-                
-                # แปลงผลลัพธ์เป็น list ของ dictionary
-                results = []
-                for row in cursor.fetchall():
-                    results.append(dict(zip(columns, row)))
-                
-                return results
+            with raw as conn:
+                self._active_cursors[id(conn)] = cursors
+                try:
+                    yield conn
+                finally:
+                    self._active_cursors.pop(id(conn), None)
         except Exception as e:
-            messagebox.showerror("Error", f"เกิดข้อผิดพลาดในการดำเนินการ query: {str(e)}")
-            return []
+            _close_quietly(raw)
+            if isinstance(e, DatabaseException):
+                raise
+            raise QueryException(f"เกิดข้อผิดพลาดในการดำเนินการ query: {str(e)}") from e
+        except BaseException:
+            _close_quietly(raw)
+            raise
+
+        if session is not None and 'entry' not in session:
+            # เก็บไว้ให้ query ถัดไปใน scope เดียวกันใช้ต่อโดยไม่ต้องผ่าน pool
+            session['entry'] = (connection_string, raw, cursors)
+        else:
+            self._release_connection(connection_string, raw, cursors)
+    
+    @contextmanager
+    def scoped_session(self):
+        """
+        ผูก connection หนึ่งตัวไว้กับ thread ปัจจุบันตลอด scope
+
+        query แรกใน scope ยืม connection จาก pool ตามปกติ query ถัดไปใน thread
+        เดียวกันใช้ connection นั้นต่อโดยไม่ต้องหยิบ/คืนผ่าน pool (เช่น ทั้ง request
+        ของ web) และคืนเข้า pool เมื่อจบ scope - scope ซ้อนกันจะใช้ scope นอกสุด
+        """
+        if getattr(self._tls, 'session', None) is not None:
+            yield
+            return
+
+        session: Dict[str, Any] = {}
+        self._tls.session = session
+        try:
+            yield
+        finally:
+            self._tls.session = None
+            pinned = session.pop('entry', None)
+            if pinned is not None:
+                self._release_connection(*pinned)
+    
+    def _cursor(self, conn, query: str):
+        """
+        cursor สำหรับ SQL นี้บน connection ที่ยืมมา
+
+        pyodbc ข้ามการ prepare เมื่อ cursor เดิมรันข้อความ SQL เดิมซ้ำ จึงเก็บ cursor
+        ไว้ตามข้อความ SQL (LRU) ตลอดอายุของ connection ใน pool
+        """
+        cursors = self._active_cursors.get(id(conn))
+        if cursors is None:
+            return conn.cursor()
+
+        cursor = cursors.get(query)
+        if cursor is not None:
+            cursors.move_to_end(query)
+            return cursor
+
+        cursor = conn.cursor()
+        cursors[query] = cursor
+        if len(cursors) > constants.DB_STATEMENT_CACHE_SIZE:
+            _close_quietly(cursors.popitem(last=False)[1])
+        return cursor
+    
+    def close_connections(self):
+        """ปิด connection ที่ว่างอยู่ใน pool ทั้งหมด"""
+        with self._pool_lock:
+            idle = list(self._idle_connections)
+            self._idle_connections.clear()
+            timer, self._sweep_timer = self._sweep_timer, None
+        if timer is not None:
+            timer.cancel()
+        for entry in idle:
+            _close_quietly(entry[2])
+    
+    def warm_up(self, count: Optional[int] = None) -> int:
+        """
+        เปิด connection ล่วงหน้าให้ pool พร้อมกันหลายตัว (handshake ซ้อนกันแทนที่จะรอทีละตัว)
+
+        เปิดเฉพาะส่วนที่ขาดจาก count (ไม่เกินขนาด pool) ตัวที่เปิดไม่สำเร็จจะถูกข้ามไป
+        query จริงจะเปิดใหม่และแจ้งข้อผิดพลาดเอง
+        Returns:
+            จำนวน connection ที่เปิดเพิ่มเข้า pool
+        """
+        if count is None:
+            count = constants.DB_POOL_MAX_IDLE
+        connection_string = self.connection_string
+        with self._pool_lock:
+            missing = min(count, constants.DB_POOL_MAX_IDLE) - len(self._idle_connections)
+        if missing <= 0:
+            return 0
+
+        def open_connection(_):
+            try:
+                return pyodbc.connect(connection_string)
+            except Exception:
+                return None
+
+        with ThreadPoolExecutor(max_workers=missing) as executor:
+            opened = [conn for conn in executor.map(open_connection, range(missing)) if conn is not None]
+
+        for conn in opened:
+            self._release_connection(connection_string, conn, OrderedDict())
+        if opened:
+            self._mark_alive()
+        return len(opened)
+    
+    def _mark_alive(self):
+        """บันทึกว่าเพิ่งคุยกับฐานข้อมูลสำเร็จ"""
+        self._last_success = time.monotonic()
+    
+    def ensure_connection(self, max_idle: Optional[float] = None) -> bool:
+        """
+        ตรวจสอบการเชื่อมต่อแบบ lazy: ถ้ามี query สำเร็จภายใน max_idle วินาที
+        ถือว่ายังเชื่อมต่ออยู่โดยไม่ต้องเปิด connection ทดสอบใหม่
+        (connection ที่ตายจะถูกตรวจพบตอน execute อยู่แล้ว)
+        """
+        if max_idle is None:
+            max_idle = constants.CONNECTION_VALIDATE_IDLE_SECONDS
+        if time.monotonic() - self._last_success < max_idle:
+            return True
+        return self.test_connection()
+    
+    def execute_query(self, query: str, params: Tuple = ()) -> List[Dict]:
+        """ดำเนินการ query และส่งคืนผลลัพธ์เป็น list ของ dictionary"""
+        with self._connection() as conn:
+            cursor = self._cursor(conn, query)
+            cursor.execute(query, params)
+            
+            # แปลงผลลัพธ์เป็น list ของ dictionary
+            results = _rows_to_dicts(cursor)
+            
+            self._mark_alive()
+            return results
+    
+    def execute_query_tuples(self, query: str, params: Tuple = ()) -> List[tuple]:
+        """ดำเนินการ query และส่งคืนผลลัพธ์เป็น list ของแถวตามลำดับคอลัมน์ (ไม่แปลงเป็น dictionary)"""
+        with self._connection() as conn:
+            cursor = self._cursor(conn, query)
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+            self._mark_alive()
+            return rows
+    
+    def execute_query_iter(self, query: str, params: Tuple = (), batch_size: int = constants.DB_FETCH_BATCH_SIZE) -> Iterator[tuple]:
+        """ดำเนินการ query และทยอยส่งแถวจาก cursor ทีละชุด (ไม่เก็บผลลัพธ์ทั้งหมดไว้ใน list)"""
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
     
     def execute_non_query(self, query: str, params: Tuple = ()) -> int:
         """ดำเนินการ query ที่ไม่ส่งคืนผลลัพธ์ (INSERT, UPDATE, DELETE)"""
-        try:
-            with pyodbc.connect(self.connection_string) as conn:
-                cursor = conn.cursor()
-                cursor.execute(query, params)
-                conn.commit()
-                return cursor.rowcount
-        except Exception as e:
-            messagebox.showerror("Error", f"เกิดข้อผิดพลาดในการดำเนินการ query: {str(e)}")
+        with self._connection() as conn:
+            cursor = self._cursor(conn, query)
+            cursor.execute(query, params)
+            conn.commit()
+            self._mark_alive()
+            return cursor.rowcount
+    
+    def prepare(self, name: str, query: str) -> PreparedStatement:
+        """เตรียมคำสั่งที่ถูกเรียกบ่อยไว้บน connection ถาวร (สร้างครั้งเดียวต่อชื่อ)"""
+        statement = self._prepared.get(name)
+        if statement is None or statement.query != query:
+            if statement is not None:
+                statement.close()
+            statement = PreparedStatement(self, query)
+            self._prepared[name] = statement
+        return statement
+    
+    def close_prepared(self):
+        """ปิด connection ของคำสั่งที่เตรียมไว้ทั้งหมด"""
+        for statement in self._prepared.values():
+            statement.close()
+        self._prepared.clear()
+    
+    def execute_many(self, query: str, params_list: List[Tuple]) -> int:
+        """ดำเนินการ INSERT/UPDATE เดียวกันกับหลายชุดพารามิเตอร์ใน round-trip เดียว (executemany) และ commit ครั้งเดียว"""
+        if not params_list:
             return 0
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            # ส่งพารามิเตอร์ทั้งชุดเป็น array แทนการส่งทีละแถว
+            cursor.fast_executemany = True
+            cursor.executemany(query, params_list)
+            conn.commit()
+            self._mark_alive()
+            return len(params_list)
     
     def execute_sp(self, sp_name: str, params: Tuple = ()) -> List[Dict]:
         """ดำเนินการ stored procedure"""
-        try:
-            with pyodbc.connect(self.connection_string) as conn:
-                cursor = conn.cursor()
-                
-                # สร้าง parameter string สำหรับ stored procedure
-                param_placeholders = ','.join(['?' for _ in params])
-                query = f"EXEC {sp_name} {param_placeholders}"
-                
-                cursor.execute(query, params)
-                
-                # รับชื่อคอลัมน์
-                columns = [column[0] for column in cursor.description]
-                
-                # แปลงผลลัพธ์เป็น list ของ dictionary
-                results = []
-                for row in cursor.fetchall():
-                    results.append(dict(zip(columns, row)))
-                
-                return results
-        except Exception as e:
-            messagebox.showerror("Error", f"เกิดข้อผิดพลาดในการดำเนินการ stored procedure: {str(e)}")
-            return []
+        # ข้อความ EXEC เดิมทุกครั้งสำหรับ SP/จำนวนพารามิเตอร์เดียวกัน จึงใช้ cursor ที่เตรียมไว้ซ้ำได้
+        query = _sp_call_sql(sp_name, len(params))
+        with self._connection() as conn:
+            cursor = self._cursor(conn, query)
+            cursor.execute(query, params)
+            
+            # แปลงผลลัพธ์เป็น list ของ dictionary
+            return _rows_to_dicts(cursor)
     
     def get_connection_info(self) -> Dict[str, Any]:
         """รับข้อมูลการเชื่อมต่อปัจจุบัน"""
@@ -116,19 +597,41 @@ class DatabaseManager:
             'current_user': self.current_user
         }
     
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """
+        สถิติของ pool สำหรับ health check/monitoring
+
+        อ่านค่าโดยไม่ถือ _pool_lock (len() ของ deque/dict เป็น operation เดียวภายใต้ GIL)
+        การ poll บ่อยๆ จึงไม่แย่ง lock กับ query ค่าที่ได้อาจคลาดเคลื่อนเล็กน้อยซึ่งรับได้
+        """
+        return {
+            'idle_connections': len(self._idle_connections),
+            'max_idle_connections': constants.DB_POOL_MAX_IDLE,
+            'borrowed_connections': len(self._active_cursors),
+            'prepared_statements': len(self._prepared),
+            'seconds_since_success': (
+                round(time.monotonic() - self._last_success, 1) if self._last_success else None
+            ),
+        }
+    
     def update_connection(self, new_config: Dict[str, Any]) -> bool:
-        """อัพเดทการเชื่อมต่อ"""
+        """
+        อัพเดทการเชื่อมต่อ
+
+        Raises:
+            ConfigurationException: บันทึกการตั้งค่าใหม่ไม่สำเร็จ
+        """
         try:
             # อัพเดทการตั้งค่า
             if self.config_manager.update_config(new_config):
                 # สร้าง connection string ใหม่
                 self.connection_string = self.config_manager.get_connection_string()
                 self.current_user = self.config_manager.get_current_user()
+                self.close_connections()
                 return True
             return False
         except Exception as e:
-            messagebox.showerror("Error", f"เกิดข้อผิดพลาดในการอัพเดทการเชื่อมต่อ: {str(e)}")
-            return False
+            raise ConfigurationException(f"เกิดข้อผิดพลาดในการอัพเดทการเชื่อมต่อ: {str(e)}") from e
 
     # ========================================================================
     # Convenience methods for backwards compatibility with main_window.py
@@ -165,4 +668,5 @@ class DatabaseManager:
     def update_connection_string(self):
         """อัพเดท connection string ตามการตั้งค่า"""
         self.connection_string = self.config_manager.get_connection_string()
-        self.current_user = self.config_manager.get_current_user() 
\ No newline at end of file
+        self.current_user = self.config_manager.get_current_user()
+        self.close_connections() 
\ No newline at end of file
@@ -21,6 +21,8 @@ class DependencyRepository(BaseRepository):
     - Checking if required jobs have been scanned
     """
 
+    read_mostly = True
+
     @property
     def table_name(self) -> str:
         """Table name for job dependencies"""
@@ -47,7 +49,48 @@ class DependencyRepository(BaseRepository):
             WHERE jd.job_id = ?
             ORDER BY jt.job_name
         """
-        return self.db.execute_query(query, (job_id,))
+        return self.cached_query(query, (job_id,))
+
+    def get_missing_required_jobs(
+        self,
+        job_id: int,
+        barcode: str,
+        hours: int = 24
+    ) -> List[Dict[str, Any]]:
+        """
+        Get required jobs that have not been scanned for a barcode
+
+        Dependencies and their scans are checked in a single round-trip
+        instead of one query per required job. It runs before every scan,
+        so the statement is kept prepared on a persistent cursor.
+
+        Args:
+            job_id: ID of the job being scanned
+            barcode: Barcode being scanned
+            hours: Time window in hours to look back for required scans
+
+        Returns:
+            List of dictionaries with 'required_job_id' and 'job_name'
+            (empty when every dependency is satisfied or there are none)
+
+        Raises:
+            Exception: If the database call fails
+        """
+        query = """
+            SELECT jd.required_job_id, jt.job_name
+            FROM job_dependencies jd
+            JOIN job_types jt ON jd.required_job_id = jt.id
+            WHERE jd.job_id = ?
+            AND NOT EXISTS (
+                SELECT 1
+                FROM scan_logs sl
+                WHERE sl.barcode = ? AND sl.job_id = jd.required_job_id
+                AND sl.scan_date >= DATEADD(HOUR, ?, GETDATE())
+            )
+            ORDER BY jt.job_name
+        """
+        missing_required_jobs = self.db.prepare('missing_required_jobs', query)
+        return missing_required_jobs((job_id, barcode, -hours))
 
     def get_required_job_with_scan_status(
         self,
@@ -72,7 +115,8 @@ class DependencyRepository(BaseRepository):
                     (SELECT COUNT(*)
                      FROM scan_logs
                      WHERE job_id = jd.required_job_id
-                     AND CAST(scan_date AS DATE) = CAST(GETDATE() AS DATE)) as scan_count
+                     AND scan_date >= CAST(GETDATE() AS DATE)
+                     AND scan_date < DATEADD(day, 1, CAST(GETDATE() AS DATE))) as scan_count
                 FROM job_dependencies jd
                 JOIN job_types jt ON jd.required_job_id = jt.id
                 WHERE jd.job_id = ?
@@ -113,7 +157,8 @@ class DependencyRepository(BaseRepository):
                 SELECT COUNT(*) as count
                 FROM scan_logs
                 WHERE job_id = ?
-                AND CAST(scan_date AS DATE) = CAST(GETDATE() AS DATE)
+                AND scan_date >= CAST(GETDATE() AS DATE)
+                AND scan_date < DATEADD(day, 1, CAST(GETDATE() AS DATE))
             """
         else:
             query = "SELECT COUNT(*) as count FROM scan_logs WHERE job_id = ?"
@@ -139,7 +184,46 @@ class DependencyRepository(BaseRepository):
             INSERT INTO job_dependencies (job_id, required_job_id, created_date)
             VALUES (?, ?, GETDATE())
         """
-        return self.db.execute_non_query(query, (job_id, required_job_id))
+        return self.execute_non_query(query, (job_id, required_job_id))
+
+    def add_dependencies(self, job_id: int, required_job_ids: List[int]) -> int:
+        """
+        Add several dependencies for a job in one batched round-trip
+
+        Args:
+            job_id: ID of the job
+            required_job_ids: IDs of the jobs that are required
+
+        Returns:
+            Number of rows inserted
+
+        Raises:
+            QueryException: If the batch failed (no row of it is inserted)
+        """
+        query = """
+            INSERT INTO job_dependencies (job_id, required_job_id, created_date)
+            VALUES (?, ?, GETDATE())
+        """
+        return self.execute_many(
+            query, [(job_id, required_job_id) for required_job_id in required_job_ids]
+        )
+
+    def get_dependent_job_ids(self, required_job_id: int) -> List[int]:
+        """
+        Get IDs of the jobs that require a job
+
+        Args:
+            required_job_id: ID of the required job
+
+        Returns:
+            List of job IDs that depend on it
+
+        Note:
+            Guards a write (cycle check), so it always reads the database -
+            other processes may have added dependencies since the cache was filled
+        """
+        query = "SELECT job_id FROM job_dependencies WHERE required_job_id = ?"
+        return [row['job_id'] for row in self.db.execute_query(query, (required_job_id,))]
 
     def remove_dependency(self, job_id: int, required_job_id: int) -> int:
         """
@@ -156,7 +240,7 @@ class DependencyRepository(BaseRepository):
             DELETE FROM job_dependencies
             WHERE job_id = ? AND required_job_id = ?
         """
-        return self.db.execute_non_query(query, (job_id, required_job_id))
+        return self.execute_non_query(query, (job_id, required_job_id))
 
     def remove_all_dependencies(self, job_id: int) -> int:
         """
@@ -169,7 +253,7 @@ class DependencyRepository(BaseRepository):
             Number of rows affected
         """
         query = "DELETE FROM job_dependencies WHERE job_id = ?"
-        return self.db.execute_non_query(query, (job_id,))
+        return self.execute_non_query(query, (job_id,))
 
     def remove_where_required(self, required_job_id: int) -> int:
         """
@@ -186,7 +270,7 @@ class DependencyRepository(BaseRepository):
             where this job is required by other jobs
         """
         query = "DELETE FROM job_dependencies WHERE required_job_id = ?"
-        return self.db.execute_non_query(query, (required_job_id,))
+        return self.execute_non_query(query, (required_job_id,))
 
     def dependency_exists(self, job_id: int, required_job_id: int) -> bool:
         """
@@ -200,12 +284,14 @@ class DependencyRepository(BaseRepository):
             True if dependency exists
         """
         query = """
-            SELECT COUNT(*) as count
-            FROM job_dependencies
-            WHERE job_id = ? AND required_job_id = ?
+            SELECT CASE WHEN EXISTS (
+                SELECT 1 FROM job_dependencies
+                WHERE job_id = ? AND required_job_id = ?
+            ) THEN 1 ELSE 0 END as found
         """
+        # Guards add/cycle checks, so never answered from the cache
         results = self.db.execute_query(query, (job_id, required_job_id))
-        return results[0]['count'] > 0 if results else False
+        return bool(results[0]['found']) if results else False
 
     def get_dependencies_count(self, job_id: int) -> int:
         """
@@ -239,7 +325,7 @@ class DependencyRepository(BaseRepository):
             JOIN job_types jt2 ON jd.required_job_id = jt2.id
             ORDER BY jt1.job_name, jt2.job_name
         """
-        return self.db.execute_query(query)
+        return self.cached_query(query)
 
     def validate_no_circular_dependency(
         self,
@@ -261,15 +347,7 @@ class DependencyRepository(BaseRepository):
             this would create a circular dependency and return False
         """
         # Check if required_job_id already requires job_id
-        query = """
-            SELECT COUNT(*) as count
-            FROM job_dependencies
-            WHERE job_id = ? AND required_job_id = ?
-        """
-        results = self.db.execute_query(query, (required_job_id, job_id))
-        has_reverse = results[0]['count'] > 0 if results else False
-
-        return not has_reverse
+        return not self.dependency_exists(required_job_id, job_id)
 
     # ========================================================================
     # Table Management
@@ -21,6 +21,9 @@ class JobTypeRepository(BaseRepository):
     - Deleting job types
     """
 
+    read_mostly = True
+    default_columns = ('id', 'job_name')
+
     @property
     def table_name(self) -> str:
         """Table name for job types"""
@@ -38,7 +41,7 @@ class JobTypeRepository(BaseRepository):
             List of job type dictionaries with 'id' and 'job_name'
         """
         query = "SELECT id, job_name FROM job_types ORDER BY job_name"
-        return self.db.execute_query(query)
+        return self.cached_query(query)
 
     def find_by_name(self, job_name: str) -> Optional[Dict[str, Any]]:
         """
@@ -51,7 +54,7 @@ class JobTypeRepository(BaseRepository):
             Job type dictionary or None if not found
         """
         query = "SELECT * FROM job_types WHERE job_name = ?"
-        results = self.db.execute_query(query, (job_name,))
+        results = self.cached_query(query, (job_name,))
         return results[0] if results else None
 
     def create_job_type(self, job_name: str) -> int:
@@ -92,14 +95,25 @@ class JobTypeRepository(BaseRepository):
         Returns:
             True if job name exists
         """
+        # EXISTS stops at the first match instead of counting every row.
+        # Uniqueness guard before a write: always read the database, since
+        # another process may have created the name since the cache was filled.
         if exclude_id:
-            query = "SELECT COUNT(*) as count FROM job_types WHERE job_name = ? AND id != ?"
+            query = """
+                SELECT CASE WHEN EXISTS (
+                    SELECT 1 FROM job_types WHERE job_name = ? AND id != ?
+                ) THEN 1 ELSE 0 END as found
+            """
             results = self.db.execute_query(query, (job_name, exclude_id))
         else:
-            query = "SELECT COUNT(*) as count FROM job_types WHERE job_name = ?"
+            query = """
+                SELECT CASE WHEN EXISTS (
+                    SELECT 1 FROM job_types WHERE job_name = ?
+                ) THEN 1 ELSE 0 END as found
+            """
             results = self.db.execute_query(query, (job_name,))
 
-        return results[0]['count'] > 0 if results else False
+        return bool(results[0]['found']) if results else False
 
     def get_job_type_count(self) -> int:
         """
@@ -5,8 +5,8 @@ ScanLog Repository Module
 Handles all database operations for scan_logs table
 """
 
-from typing import Dict, List, Optional, Any
-from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Any, Tuple
+from datetime import date, datetime, timedelta
 from .base_repository import BaseRepository
 from .database_manager import DatabaseManager
 
@@ -23,6 +23,40 @@ class ScanLogRepository(BaseRepository):
     - Getting summary statistics
     """
 
+    # search_history filters in placeholder order: (argument name, condition)
+    _SEARCH_FILTERS = (
+        ('barcode', "sl.barcode LIKE ?"),
+        ('job_id', "sl.job_id = ?"),
+        ('sub_job_id', "sl.sub_job_id = ?"),
+        ('user_id', "sl.user_id = ?"),
+        # Half-open datetime range keeps the predicate SARGable on IX_scan_logs_scan_date
+        ('start_date', "sl.scan_date >= ?"),
+        ('end_date', "sl.scan_date < ?"),
+    )
+
+    # Columns search_history may sort by (whitelist - never interpolate user input)
+    SEARCH_ORDER_COLUMNS = {
+        'id': "sl.id",
+        'scan_date': "sl.scan_date",
+        'barcode': "sl.barcode",
+        'job_type': "sl.job_type",
+        'sub_job_name': "sjt.sub_job_name",
+        'user_id': "sl.user_id",
+        'notes': "sl.notes",
+    }
+
+    # Column order of search_history_rows results
+    HISTORY_ROW_COLUMNS = ('id', 'scan_date', 'barcode', 'job_type', 'sub_job_name', 'user_id', 'notes')
+
+    # Complete search SQL per (query kind, combination of active filters, ORDER BY)
+    _search_query_cache: Dict[Tuple[str, Tuple[bool, ...], str], str] = {}
+
+    # Complete report SQL per (query kind, active report conditions)
+    _report_query_cache: Dict[Tuple[str, Tuple[str, ...]], str] = {}
+
+    # Whether scan_logs.notes has a full-text index (None = not checked yet)
+    _notes_fulltext: Optional[bool] = None
+
     @property
     def table_name(self) -> str:
         """Table name for scan logs"""
@@ -65,6 +99,85 @@ class ScanLogRepository(BaseRepository):
             (barcode, job_type, user_id, job_id, sub_job_id, notes)
         )
 
+    def create_scans(self, rows: List[Tuple]) -> int:
+        """
+        Create many scan log entries in one batched round-trip
+
+        Args:
+            rows: Tuples of (barcode, job_type, user_id, job_id, sub_job_id, notes)
+
+        Returns:
+            Number of rows inserted
+
+        Raises:
+            QueryException: If the batch failed (no row of it is inserted)
+        """
+        query = """
+            INSERT INTO scan_logs
+            (barcode, scan_date, job_type, user_id, job_id, sub_job_id, notes)
+            VALUES (?, GETDATE(), ?, ?, ?, ?, ?)
+        """
+        return self.db.execute_many(query, rows)
+
+    def create_scan_if_new(
+        self,
+        barcode: str,
+        job_type: str,
+        user_id: str,
+        job_id: int,
+        sub_job_id: Optional[int] = None,
+        notes: str = "",
+        hours: int = 24
+    ) -> int:
+        """
+        Create a scan log entry unless the same scan already exists
+
+        A scan is a duplicate when the latest scan of the barcode for the job
+        within the window has the same sub job (None matches None), so
+        sub1 -> sub2 -> sub1 is allowed. The duplicate check and the INSERT
+        are one statement, so there is a
+        single round-trip and no gap in which another client could record
+        the same scan. UPDLOCK/HOLDLOCK keep concurrent inserts serialized.
+        The statement runs once per scan, so it is kept prepared on a
+        persistent cursor.
+
+        Args:
+            barcode: The barcode that was scanned
+            job_type: Type of job (from job_types table)
+            user_id: ID of the user performing the scan
+            job_id: ID of the job type
+            sub_job_id: Optional ID of the sub job type
+            notes: Optional notes about the scan
+            hours: Time window in hours that counts as a duplicate
+
+        Returns:
+            Number of rows inserted (0 if the scan is a duplicate)
+
+        Raises:
+            Exception: If the database call fails
+        """
+        query = """
+            INSERT INTO scan_logs
+            (barcode, scan_date, job_type, user_id, job_id, sub_job_id, notes)
+            SELECT ?, GETDATE(), ?, ?, ?, ?, ?
+            WHERE NOT EXISTS (
+                SELECT 1
+                FROM (
+                    SELECT TOP 1 sub_job_id
+                    FROM scan_logs WITH (UPDLOCK, HOLDLOCK)
+                    WHERE barcode = ? AND job_id = ?
+                    AND scan_date >= DATEADD(HOUR, ?, GETDATE())
+                    ORDER BY scan_date DESC, id DESC
+                ) latest
+                WHERE latest.sub_job_id = ? OR (latest.sub_job_id IS NULL AND ? IS NULL)
+            )
+        """
+        insert_if_new = self.db.prepare('scan_insert_if_new', query)
+        return insert_if_new(
+            (barcode, job_type, user_id, job_id, sub_job_id, notes,
+             barcode, job_id, -hours, sub_job_id, sub_job_id)
+        )
+
     def get_recent_scans(
         self,
         limit: int = 50,
@@ -130,61 +243,257 @@ class ScanLogRepository(BaseRepository):
         user_id: Optional[str] = None,
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
-        limit: int = 100
+        limit: int = 100,
+        offset: int = 0,
+        order_by: str = 'scan_date',
+        descending: bool = True
     ) -> List[Dict[str, Any]]:
         """
-        Search scan logs with multiple filters
+        Search scan logs with multiple filters (one page at a time)
 
         Args:
-            barcode: Filter by barcode (supports partial match with LIKE)
+            barcode: Filter by barcode prefix (contains match if it has LIKE wildcards)
             job_id: Filter by job type ID
             sub_job_id: Filter by sub job type ID
             user_id: Filter by user ID
             start_date: Filter by start date (YYYY-MM-DD)
             end_date: Filter by end date (YYYY-MM-DD)
-            limit: Maximum records to return
+            limit: Maximum records to return (page size)
+            offset: Number of matching records to skip
+            order_by: Sort key from SEARCH_ORDER_COLUMNS (default: scan_date)
+            descending: Sort direction (default: newest first)
 
         Returns:
             List of matching scan logs with sub job name
+
+        Raises:
+            ValueError: If order_by is not in SEARCH_ORDER_COLUMNS
         """
-        conditions = []
-        params = []
+        query, params = self._page_query(
+            'page', barcode, job_id, sub_job_id, user_id, start_date, end_date,
+            limit, offset, order_by, descending
+        )
+        return self.db.execute_query(query, params)
 
-        if barcode:
-            conditions.append("sl.barcode LIKE ?")
-            params.append(f"%{barcode}%")
+    def search_history_rows(
+        self,
+        barcode: Optional[str] = None,
+        job_id: Optional[int] = None,
+        sub_job_id: Optional[int] = None,
+        user_id: Optional[str] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        limit: int = 100,
+        offset: int = 0,
+        order_by: str = 'scan_date',
+        descending: bool = True
+    ) -> List[tuple]:
+        """
+        Same as search_history but returns plain rows for tight display loops
 
-        if job_id is not None:
-            conditions.append("sl.job_id = ?")
-            params.append(job_id)
+        Rows are positional in HISTORY_ROW_COLUMNS order, which skips building
+        a dictionary per row.
 
-        if sub_job_id is not None:
-            conditions.append("sl.sub_job_id = ?")
-            params.append(sub_job_id)
+        Returns:
+            List of (id, scan_date, barcode, job_type, sub_job_name, user_id, notes)
+        """
+        query, params = self._page_query(
+            'rows', barcode, job_id, sub_job_id, user_id, start_date, end_date,
+            limit, offset, order_by, descending
+        )
+        return self.db.execute_query_tuples(query, params)
 
-        if user_id:
-            conditions.append("sl.user_id = ?")
-            params.append(user_id)
+    def iter_history_rows(
+        self,
+        barcode: Optional[str] = None,
+        job_id: Optional[int] = None,
+        sub_job_id: Optional[int] = None,
+        user_id: Optional[str] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        order_by: str = 'scan_date',
+        descending: bool = True
+    ) -> Iterator[tuple]:
+        """
+        Stream every scan log matching the search filters from the cursor
 
-        if start_date:
-            conditions.append("CAST(sl.scan_date AS DATE) >= ?")
-            params.append(start_date)
+        Same rows and order as search_history_rows without paging, for
+        exporting a whole search result.
 
-        if end_date:
-            conditions.append("CAST(sl.scan_date AS DATE) <= ?")
-            params.append(end_date)
+        Returns:
+            Iterator of (id, scan_date, barcode, job_type, sub_job_name, user_id, notes)
 
-        where_clause = " AND ".join(conditions) if conditions else "1=1"
+        Raises:
+            ValueError: If order_by is not in SEARCH_ORDER_COLUMNS
+        """
+        query, params = self._page_query(
+            'all_rows', barcode, job_id, sub_job_id, user_id, start_date, end_date,
+            None, 0, order_by, descending
+        )
+        return self.db.execute_query_iter(query, params)
 
-        query = f"""
-            SELECT TOP {limit} sl.*, sjt.sub_job_name
+    def _page_query(
+        self,
+        kind: str,
+        barcode: Optional[str],
+        job_id: Optional[int],
+        sub_job_id: Optional[int],
+        user_id: Optional[str],
+        start_date: Optional[str],
+        end_date: Optional[str],
+        limit: Optional[int],
+        offset: int,
+        order_by: str,
+        descending: bool
+    ) -> Tuple[str, tuple]:
+        """Build the paged search SQL and its parameters"""
+        if order_by not in self.SEARCH_ORDER_COLUMNS:
+            raise ValueError(f"Cannot sort scan history by '{order_by}'")
+
+        key, params = self._search_filter_params(
+            barcode, job_id, sub_job_id, user_id, start_date, end_date
+        )
+        order = f"{self.SEARCH_ORDER_COLUMNS[order_by]} {'DESC' if descending else 'ASC'}"
+        if order_by != 'id':
+            # Unique tie-breaker keeps OFFSET paging stable
+            order += ", sl.id DESC"
+        if kind == 'all_rows':
+            return self._get_search_query(kind, key, order), params
+        return self._get_search_query(kind, key, order), params + (offset, limit)
+
+    def count_history(
+        self,
+        barcode: Optional[str] = None,
+        job_id: Optional[int] = None,
+        sub_job_id: Optional[int] = None,
+        user_id: Optional[str] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> int:
+        """
+        Count scan logs matching the same filters as search_history
+
+        Returns:
+            Total number of matching scan logs
+        """
+        key, params = self._search_filter_params(
+            barcode, job_id, sub_job_id, user_id, start_date, end_date
+        )
+        results = self.db.execute_query(self._get_search_query('count', key), params)
+        return results[0]['total_count'] if results else 0
+
+    @classmethod
+    def _search_filter_params(
+        cls,
+        barcode: Optional[str],
+        job_id: Optional[int],
+        sub_job_id: Optional[int],
+        user_id: Optional[str],
+        start_date: Optional[str],
+        end_date: Optional[str]
+    ) -> Tuple[Tuple[bool, ...], tuple]:
+        """
+        Map search filters to a template key and its parameters
+
+        Returns:
+            (one flag per entry in _SEARCH_FILTERS, parameters of active filters)
+        """
+        filters = {
+            'barcode': cls._barcode_pattern(barcode) if barcode else None,
+            'job_id': job_id,
+            'sub_job_id': sub_job_id,
+            'user_id': user_id or None,
+            'start_date': cls._day_start(start_date) if start_date else None,
+            # end_date is inclusive for callers -> exclusive upper bound of the next day
+            'end_date': cls._day_start(end_date) + timedelta(days=1) if end_date else None,
+        }
+        key = tuple(filters[name] is not None for name, _ in cls._SEARCH_FILTERS)
+        params = tuple(filters[name] for name, _ in cls._SEARCH_FILTERS if filters[name] is not None)
+        return key, params
+
+    @staticmethod
+    def _barcode_pattern(barcode: str) -> str:
+        """
+        Build the LIKE pattern for a barcode search
+
+        Plain input becomes a prefix match ('ABC%'), which can seek on
+        IX_scan_logs_barcode and still finds whole scanned barcodes. Input
+        that already contains LIKE wildcards keeps the contains match.
+        """
+        if any(char in barcode for char in "%_["):
+            return f"%{barcode}%"
+        return f"{barcode}%"
+
+    @staticmethod
+    def _day_start(value: Any) -> datetime:
+        """
+        Convert a YYYY-MM-DD string, date or datetime to midnight of that day
+
+        Raises:
+            ValueError: If a string is not in YYYY-MM-DD format
+        """
+        if isinstance(value, date):  # also covers datetime
+            return datetime(value.year, value.month, value.day)
+        return datetime.strptime(str(value).strip()[:10], "%Y-%m-%d")
+
+    @classmethod
+    def _day_range(cls, start_date: Any, end_date: Any) -> Tuple[datetime, datetime]:
+        """
+        Convert an inclusive day range to a half-open datetime range
+
+        ``scan_date >= start AND scan_date < end`` lets SQL Server seek the
+        scan_date index, unlike ``CAST(scan_date AS DATE) BETWEEN ...``.
+        """
+        return cls._day_start(start_date), cls._day_start(end_date) + timedelta(days=1)
+
+    @classmethod
+    def _get_search_query(cls, kind: str, key: Tuple[bool, ...], order: str = "") -> str:
+        """
+        Get the search SQL for a combination of active filters
+
+        The text is built once per combination so the same statement (and
+        SQL Server's cached plan) is reused on every search.
+
+        Args:
+            kind: 'page' (dict rows), 'rows' (HISTORY_ROW_COLUMNS), 'all_rows'
+                ('rows' without paging) or 'count' (COUNT(*))
+            key: One flag per entry in _SEARCH_FILTERS
+            order: ORDER BY expression for 'page' (built from SEARCH_ORDER_COLUMNS)
+
+        Returns:
+            SQL with one placeholder per active filter (plus offset/limit when paged)
+        """
+        cache_key = (kind, key, order)
+        query = cls._search_query_cache.get(cache_key)
+        if query is None:
+            conditions = [
+                condition
+                for (_, condition), active in zip(cls._SEARCH_FILTERS, key)
+                if active
+            ]
+            where_clause = " AND ".join(conditions) if conditions else "1=1"
+            if kind == 'count':
+                query = f"""
+            SELECT COUNT(*) as total_count
+            FROM scan_logs sl
+            WHERE {where_clause}
+        """
+            else:
+                if kind in ('rows', 'all_rows'):
+                    select_list = "sl.id, sl.scan_date, sl.barcode, sl.job_type, sjt.sub_job_name, sl.user_id, sl.notes"
+                else:
+                    select_list = "sl.*, sjt.sub_job_name"
+                paging = "" if kind == 'all_rows' else "OFFSET ? ROWS FETCH NEXT ? ROWS ONLY"
+                query = f"""
+            SELECT {select_list}
             FROM scan_logs sl
             LEFT JOIN sub_job_types sjt ON sl.sub_job_id = sjt.id
             WHERE {where_clause}
-            ORDER BY sl.scan_date DESC
+            ORDER BY {order}
+            {paging}
         """
-
-        return self.db.execute_query(query, tuple(params))
+            cls._search_query_cache[cache_key] = query
+        return query
 
     def get_report_with_sub_job(
         self,
@@ -205,8 +514,8 @@ class ScanLogRepository(BaseRepository):
         Returns:
             List of scan logs with sub job names
         """
-        conditions = ["CAST(sl.scan_date AS DATE) BETWEEN ? AND ?"]
-        params = [start_date, end_date]
+        conditions = ["sl.scan_date >= ?", "sl.scan_date < ?"]
+        params = list(self._day_range(start_date, end_date))
 
         if job_id is not None:
             conditions.append("sl.job_id = ?")
@@ -228,6 +537,248 @@ class ScanLogRepository(BaseRepository):
 
         return self.db.execute_query(query, tuple(params))
 
+    # Report columns, aliased to the names the reports tab displays. scan_date
+    # arrives as 'YYYY-MM-DD HH:MM:SS' text (style 120) so callers never format it.
+    _REPORT_COLUMNS = (
+        "sl.id, sl.barcode, CONVERT(varchar(19), sl.scan_date, 120) AS scan_date, "
+        "sl.job_type AS job_type_name, sjt.sub_job_name AS sub_job_type_name, "
+        "sl.user_id, sl.notes"
+    )
+
+    # Report statement per query kind; {columns} and {where} are filled once per
+    # filter combination by _get_report_query
+    _REPORT_QUERY_TEMPLATES = {
+        'page': """
+            SELECT {columns}
+            FROM scan_logs sl
+            LEFT JOIN sub_job_types sjt ON sl.sub_job_id = sjt.id
+            WHERE {where}
+            ORDER BY sl.scan_date DESC, sl.id DESC
+            OFFSET ? ROWS FETCH NEXT ? ROWS ONLY
+        """,
+        'rows': """
+            SELECT {columns}
+            FROM scan_logs sl
+            LEFT JOIN sub_job_types sjt ON sl.sub_job_id = sjt.id
+            WHERE {where}
+            ORDER BY sl.scan_date DESC, sl.id DESC
+        """,
+        'first_page': """
+            ;WITH r AS (
+                SELECT {columns},
+                       ROW_NUMBER() OVER (ORDER BY sl.scan_date DESC, sl.id DESC) AS row_num,
+                       COUNT(*) OVER () AS total_scans,
+                       DENSE_RANK() OVER (ORDER BY sl.barcode)
+                         + DENSE_RANK() OVER (ORDER BY sl.barcode DESC) - 1 AS unique_barcodes
+                FROM scan_logs sl
+                LEFT JOIN sub_job_types sjt ON sl.sub_job_id = sjt.id
+                WHERE {where}
+            )
+            SELECT * FROM r
+            ORDER BY row_num
+            OFFSET 0 ROWS FETCH NEXT ? ROWS ONLY
+        """,
+    }
+
+    def get_report_page(
+        self,
+        start_date: str,
+        end_date: str,
+        job_id: Optional[int] = None,
+        sub_job_id: Optional[int] = None,
+        notes_filter: Optional[str] = None,
+        offset: int = 0,
+        limit: int = 500
+    ) -> List[Dict[str, Any]]:
+        """
+        Get one page of report rows, newest first
+
+        Args:
+            start_date: Start date (YYYY-MM-DD), inclusive
+            end_date: End date (YYYY-MM-DD), inclusive
+            job_id: Optional filter by job ID
+            sub_job_id: Optional filter by sub job ID
+            notes_filter: Optional text the notes must contain
+            offset: Number of rows to skip
+            limit: Maximum number of rows to return
+
+        Returns:
+            List of report rows (barcode, scan_date, job_type_name,
+            sub_job_type_name, user_id, notes)
+        """
+        conditions, params = self._report_filters(
+            start_date, end_date, job_id, sub_job_id, notes_filter
+        )
+        query = self._get_report_query('page', conditions)
+        return self.db.execute_query(query, params + (offset, limit))
+
+    # Column order of iter_report_rows results (matches _REPORT_COLUMNS)
+    REPORT_ROW_COLUMNS = (
+        'id', 'barcode', 'scan_date', 'job_type_name', 'sub_job_type_name', 'user_id', 'notes'
+    )
+
+    def iter_report_rows(
+        self,
+        start_date: str,
+        end_date: str,
+        job_id: Optional[int] = None,
+        sub_job_id: Optional[int] = None,
+        notes_filter: Optional[str] = None
+    ) -> Iterator[tuple]:
+        """
+        Stream every report row from the cursor, newest first
+
+        Rows are positional in REPORT_ROW_COLUMNS order and are never held
+        in one list, which keeps exports of large reports flat in memory.
+
+        Args:
+            Same filters as get_report_page
+
+        Returns:
+            Iterator of (id, barcode, scan_date, job_type_name,
+            sub_job_type_name, user_id, notes)
+        """
+        conditions, params = self._report_filters(
+            start_date, end_date, job_id, sub_job_id, notes_filter
+        )
+        return self.db.execute_query_iter(self._get_report_query('rows', conditions), params)
+
+    def get_report_first_page(
+        self,
+        start_date: str,
+        end_date: str,
+        job_id: Optional[int] = None,
+        sub_job_id: Optional[int] = None,
+        notes_filter: Optional[str] = None,
+        limit: int = 500
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+        """
+        Get the first report page and whole-report statistics in one round trip
+
+        Totals are computed with window functions over the filtered rows
+        before OFFSET/FETCH applies; row_num keeps the same order as
+        get_report_page() (scan_date is already text in the select list). COUNT(DISTINCT ...) OVER () is not
+        allowed, so distinct barcodes are counted as the sum of ascending and
+        descending DENSE_RANK minus one (barcode is NOT NULL).
+
+        Args:
+            Same filters as get_report_page
+            limit: Maximum number of rows in the page
+
+        Returns:
+            (page rows, {'total_scans': int, 'unique_barcodes': int})
+        """
+        conditions, params = self._report_filters(
+            start_date, end_date, job_id, sub_job_id, notes_filter
+        )
+        query = self._get_report_query('first_page', conditions)
+        rows = self.db.execute_query(query, params + (limit,))
+        if not rows:
+            return [], {'total_scans': 0, 'unique_barcodes': 0}
+
+        statistics = {
+            'total_scans': rows[0]['total_scans'],
+            'unique_barcodes': rows[0]['unique_barcodes']
+        }
+        for row in rows:
+            del row['row_num'], row['total_scans'], row['unique_barcodes']
+        return rows, statistics
+
+    @classmethod
+    def _get_report_query(cls, kind: str, conditions: Tuple[str, ...]) -> str:
+        """
+        Get the report SQL for a query kind and combination of active conditions
+
+        Like _get_search_query, each statement is formatted once, so repeated
+        reports send identical text and reuse SQL Server's cached plan.
+
+        Args:
+            kind: Key of _REPORT_QUERY_TEMPLATES
+            conditions: WHERE conditions from _report_filters
+
+        Returns:
+            SQL with one placeholder per condition (plus any paging placeholders)
+        """
+        cache_key = (kind, conditions)
+        query = cls._report_query_cache.get(cache_key)
+        if query is None:
+            query = cls._REPORT_QUERY_TEMPLATES[kind].format(
+                columns=cls._REPORT_COLUMNS, where=" AND ".join(conditions)
+            )
+            cls._report_query_cache[cache_key] = query
+        return query
+
+    def _report_filters(
+        self,
+        start_date: str,
+        end_date: str,
+        job_id: Optional[int],
+        sub_job_id: Optional[int],
+        notes_filter: Optional[str]
+    ) -> Tuple[Tuple[str, ...], tuple]:
+        """Build the WHERE conditions and parameters shared by the report queries"""
+        conditions = ["sl.scan_date >= ?", "sl.scan_date < ?"]
+        params = list(self._day_range(start_date, end_date))
+
+        if job_id is not None:
+            conditions.append("sl.job_id = ?")
+            params.append(job_id)
+
+        if sub_job_id is not None:
+            conditions.append("sl.sub_job_id = ?")
+            params.append(sub_job_id)
+
+        if notes_filter:
+            # A trailing '*' asks for a word-prefix search ('box*' matches
+            # 'box damaged' but not 'inbox'); anything else stays the literal
+            # substring match also used by the today summary and web report.
+            prefix_search = notes_filter.endswith('*')
+            fulltext_term = self._notes_fulltext_term(notes_filter) if prefix_search else ""
+            if fulltext_term and self.has_notes_fulltext_index():
+                # Index seek on the full-text index instead of scanning every note
+                # (the index is updated asynchronously, so very recent scans may lag)
+                conditions.append("CONTAINS(sl.notes, ?)")
+                params.append(fulltext_term)
+            else:
+                # Literal "contains" match - escape LIKE wildcards typed by the user
+                text = notes_filter.rstrip('*') if prefix_search else notes_filter
+                escaped = text.replace("[", "[[]").replace("%", "[%]").replace("_", "[_]")
+                conditions.append("sl.notes LIKE ?")
+                params.append(f"%{escaped}%")
+
+        return tuple(conditions), tuple(params)
+
+    @staticmethod
+    def _notes_fulltext_term(notes_filter: str) -> str:
+        """
+        Build a CONTAINS search condition matching every word of the filter as a prefix
+
+        e.g. 'box dam' -> '"box*" AND "dam*"'. Returns an empty string when the
+        filter has no searchable words.
+        """
+        words = notes_filter.replace('"', ' ').replace('*', ' ').split()
+        return " AND ".join(f'"{word}*"' for word in words)
+
+    def has_notes_fulltext_index(self) -> bool:
+        """
+        Check (once per repository) whether scan_logs.notes has a full-text index
+
+        The index is optional - see section 7 of wms_setup_db.sql.
+        """
+        if self._notes_fulltext is None:
+            query = """
+                SELECT COUNT(*) as index_count
+                FROM sys.fulltext_index_columns
+                WHERE object_id = OBJECT_ID('scan_logs')
+                  AND COL_NAME(object_id, column_id) = 'notes'
+            """
+            try:
+                results = self.db.execute_query(query)
+                self._notes_fulltext = bool(results and results[0]['index_count'])
+            except Exception:
+                self._notes_fulltext = False
+        return self._notes_fulltext
+
     def get_report_main_job_only(
         self,
         start_date: str,
@@ -249,10 +800,10 @@ class ScanLogRepository(BaseRepository):
             SELECT sl.*
             FROM scan_logs sl
             WHERE sl.job_id = ?
-            AND CAST(sl.scan_date AS DATE) BETWEEN ? AND ?
+            AND sl.scan_date >= ? AND sl.scan_date < ?
             ORDER BY sl.scan_date DESC
         """
-        return self.db.execute_query(query, (job_id, start_date, end_date))
+        return self.db.execute_query(query, (job_id, *self._day_range(start_date, end_date)))
 
     def get_today_summary_count(
         self,
@@ -276,7 +827,8 @@ class ScanLogRepository(BaseRepository):
                 SELECT COUNT(*) as total_count
                 FROM scan_logs
                 WHERE job_id = ? AND sub_job_id = ?
-                AND CAST(scan_date AS DATE) = CAST(GETDATE() AS DATE)
+                AND scan_date >= CAST(GETDATE() AS DATE)
+                AND scan_date < DATEADD(day, 1, CAST(GETDATE() AS DATE))
             """
             params = [job_id, sub_job_id]
         else:
@@ -284,7 +836,8 @@ class ScanLogRepository(BaseRepository):
                 SELECT COUNT(*) as total_count
                 FROM scan_logs
                 WHERE job_id = ?
-                AND CAST(scan_date AS DATE) = CAST(GETDATE() AS DATE)
+                AND scan_date >= CAST(GETDATE() AS DATE)
+                AND scan_date < DATEADD(day, 1, CAST(GETDATE() AS DATE))
             """
             params = [job_id]
 
@@ -296,6 +849,34 @@ class ScanLogRepository(BaseRepository):
         results = self.db.execute_query(query, tuple(params))
         return results[0]['total_count'] if results else 0
 
+    def get_today_counts_by_sub_job(
+        self,
+        job_id: int,
+        notes_filter: Optional[str] = None
+    ) -> Dict[Optional[int], int]:
+        """
+        Get today's scan counts for every sub job of a job in one query
+
+        Args:
+            job_id: Job type ID
+            notes_filter: Optional notes filter (LIKE search)
+
+        Returns:
+            Dictionary of sub_job_id (None for scans without one) -> count
+        """
+        query = """
+            SELECT sub_job_id, COUNT(*) as total_count
+            FROM scan_logs
+            WHERE job_id = ?
+            AND scan_date >= CAST(GETDATE() AS DATE)
+            AND scan_date < DATEADD(day, 1, CAST(GETDATE() AS DATE))
+            AND (? IS NULL OR notes LIKE ?)
+            GROUP BY sub_job_id
+        """
+        notes_like = f"%{notes_filter}%" if notes_filter else None
+        results = self.db.execute_query(query, (job_id, notes_like, notes_like))
+        return {row['sub_job_id']: row['total_count'] for row in results}
+
     def get_count_by_job(
         self,
         job_id: int,
@@ -318,9 +899,9 @@ class ScanLogRepository(BaseRepository):
                 SELECT COUNT(*) as count
                 FROM scan_logs
                 WHERE job_id = ?
-                AND CAST(scan_date AS DATE) BETWEEN ? AND ?
+                AND scan_date >= ? AND scan_date < ?
             """
-            params = (job_id, start_date, end_date)
+            params = (job_id, *self._day_range(start_date, end_date))
         else:
             query = "SELECT COUNT(*) as count FROM scan_logs WHERE job_id = ?"
             params = (job_id,)
@@ -362,36 +943,67 @@ class ScanLogRepository(BaseRepository):
         except Exception:
             return False
 
-    def ensure_indexes_exist(self) -> bool:
+    # (name, key columns, included columns) - same names as wms_setup_db.sql
+    _INDEXES = (
+        ('IX_scan_logs_barcode', ('barcode',), ()),
+        ('IX_scan_logs_scan_date', ('scan_date',), ()),
+        ('IX_scan_logs_job_type', ('job_type',), ()),
+        ('IX_scan_logs_user_id', ('user_id',), ()),
+        ('IX_scan_logs_job_id', ('job_id',), ()),
+        ('IX_scan_logs_sub_job_id', ('sub_job_id',), ()),
+        # Covering index for report queries (date range + job filter, no key lookups)
+        ('IX_scan_logs_date_job', ('scan_date', 'job_id'), ('barcode', 'notes', 'user_id', 'sub_job_id')),
+        # Today's count per job/sub job: equality seek on both ids, range on scan_date
+        ('IX_scan_logs_job_date', ('job_id', 'sub_job_id', 'scan_date'), ()),
+    )
+
+    @staticmethod
+    def _create_index_sql(name: str, keys: Tuple[str, ...], include: Tuple[str, ...]) -> str:
         """
-        Create performance indexes on scan_logs table
+        Build an index creation that is skipped if an equivalent index exists
 
-        Returns:
-            True if indexes exist or were created successfully
+        An index counts as existing when it has the same name or exactly the
+        same key columns in the same order, so indexes created under another
+        name (e.g. by hand or by an older version) are not duplicated.
         """
-        indexes = [
-            "CREATE NONCLUSTERED INDEX idx_scan_logs_barcode ON scan_logs(barcode)",
-            "CREATE NONCLUSTERED INDEX idx_scan_logs_scan_date ON scan_logs(scan_date)",
-            "CREATE NONCLUSTERED INDEX idx_scan_logs_job_type ON scan_logs(job_type)",
-            "CREATE NONCLUSTERED INDEX idx_scan_logs_user_id ON scan_logs(user_id)",
-            "CREATE NONCLUSTERED INDEX idx_scan_logs_job_id ON scan_logs(job_id)",
-            "CREATE NONCLUSTERED INDEX idx_scan_logs_sub_job_id ON scan_logs(sub_job_id)"
-        ]
-
-        try:
-            for index_query in indexes:
-                # Check if index exists first
-                index_name = index_query.split()[2]  # Extract index name
-                check_query = f"""
+        key_list = ", ".join(keys)
+        create = f"CREATE NONCLUSTERED INDEX {name} ON scan_logs({key_list})"
+        if include:
+            create += f" INCLUDE ({', '.join(include)})"
+
+        key_columns = """
+                        SELECT COUNT(*) FROM sys.index_columns ic
+                        WHERE ic.object_id = i.object_id AND ic.index_id = i.index_id
+                          AND ic.key_ordinal > 0"""
+        matching = " OR ".join(
+            f"(ic.key_ordinal = {ordinal} AND COL_NAME(ic.object_id, ic.column_id) = '{column}')"
+            for ordinal, column in enumerate(keys, start=1)
+        )
+        return f"""
                 IF NOT EXISTS (
-                    SELECT * FROM sys.indexes
-                    WHERE name = '{index_name}' AND object_id = OBJECT_ID('scan_logs')
+                    SELECT 1 FROM sys.indexes i
+                    WHERE i.object_id = OBJECT_ID('scan_logs')
+                      AND (i.name = '{name}' OR (
+                        ({key_columns}) = {len(keys)}
+                        AND ({key_columns}
+                          AND ({matching})) = {len(keys)}
+                      ))
                 )
                 BEGIN
-                    {index_query}
+                    {create}
                 END
                 """
-                self.db.execute_non_query(check_query)
+
+    def ensure_indexes_exist(self) -> bool:
+        """
+        Create performance indexes on scan_logs table
+
+        Returns:
+            True if indexes exist or were created successfully
+        """
+        try:
+            for name, keys, include in self._INDEXES:
+                self.db.execute_non_query(self._create_index_sql(name, keys, include))
             return True
         except Exception:
             return False
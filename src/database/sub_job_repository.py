@@ -22,6 +22,8 @@ class SubJobRepository(BaseRepository):
     - Checking for duplicates
     """
 
+    read_mostly = True
+
     @property
     def table_name(self) -> str:
         """Table name for sub job types"""
@@ -60,7 +62,7 @@ class SubJobRepository(BaseRepository):
                 WHERE main_job_id = ?
                 ORDER BY sub_job_name
             """
-        return self.db.execute_query(query, (main_job_id,))
+        return self.cached_query(query, (main_job_id,))
 
     def find_by_name(
         self,
@@ -78,7 +80,7 @@ class SubJobRepository(BaseRepository):
             Sub job dictionary or None if not found
         """
         query = """
-            SELECT * FROM sub_job_types
+            SELECT id, main_job_id, sub_job_name FROM sub_job_types
             WHERE main_job_id = ? AND sub_job_name = ? AND is_active = 1
         """
         results = self.db.execute_query(query, (main_job_id, sub_job_name))
@@ -125,7 +127,7 @@ class SubJobRepository(BaseRepository):
             (main_job_id, sub_job_name, description, created_date, updated_date, is_active)
             VALUES (?, ?, ?, GETDATE(), GETDATE(), 1)
         """
-        return self.db.execute_non_query(query, (main_job_id, sub_job_name, description))
+        return self.execute_non_query(query, (main_job_id, sub_job_name, description))
 
     def soft_delete(self, sub_job_id: int) -> int:
         """
@@ -145,7 +147,7 @@ class SubJobRepository(BaseRepository):
             SET is_active = 0, updated_date = GETDATE()
             WHERE id = ?
         """
-        return self.db.execute_non_query(query, (sub_job_id,))
+        return self.execute_non_query(query, (sub_job_id,))
 
     def activate(self, sub_job_id: int) -> int:
         """
@@ -162,7 +164,7 @@ class SubJobRepository(BaseRepository):
             SET is_active = 1, updated_date = GETDATE()
             WHERE id = ?
         """
-        return self.db.execute_non_query(query, (sub_job_id,))
+        return self.execute_non_query(query, (sub_job_id,))
 
     def duplicate_exists(
         self,
@@ -181,21 +183,26 @@ class SubJobRepository(BaseRepository):
         Returns:
             True if duplicate exists
         """
+        # EXISTS stops at the first match instead of counting every row
         if exclude_id:
             query = """
-                SELECT COUNT(*) as count FROM sub_job_types
-                WHERE main_job_id = ? AND sub_job_name = ?
-                AND is_active = 1 AND id != ?
+                SELECT CASE WHEN EXISTS (
+                    SELECT 1 FROM sub_job_types
+                    WHERE main_job_id = ? AND sub_job_name = ?
+                    AND is_active = 1 AND id != ?
+                ) THEN 1 ELSE 0 END as found
             """
             results = self.db.execute_query(query, (main_job_id, sub_job_name, exclude_id))
         else:
             query = """
-                SELECT COUNT(*) as count FROM sub_job_types
-                WHERE main_job_id = ? AND sub_job_name = ? AND is_active = 1
+                SELECT CASE WHEN EXISTS (
+                    SELECT 1 FROM sub_job_types
+                    WHERE main_job_id = ? AND sub_job_name = ? AND is_active = 1
+                ) THEN 1 ELSE 0 END as found
             """
             results = self.db.execute_query(query, (main_job_id, sub_job_name))
 
-        return results[0]['count'] > 0 if results else False
+        return bool(results[0]['found']) if results else False
 
     def get_all_active(self) -> List[Dict[str, Any]]:
         """
@@ -210,7 +217,7 @@ class SubJobRepository(BaseRepository):
             WHERE is_active = 1
             ORDER BY sub_job_name
         """
-        return self.db.execute_query(query)
+        return self.cached_query(query)
 
     def update_sub_job(
         self,
@@ -234,7 +241,7 @@ class SubJobRepository(BaseRepository):
             SET sub_job_name = ?, description = ?, updated_date = GETDATE()
             WHERE id = ?
         """
-        return self.db.execute_non_query(query, (sub_job_name, description, sub_job_id))
+        return self.execute_non_query(query, (sub_job_name, description, sub_job_id))
 
     def get_active_count(self, main_job_id: Optional[int] = None) -> int:
         """
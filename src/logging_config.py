@@ -3,9 +3,11 @@ Logging Configuration for WMS Barcode Scanner
 Provides centralized logging setup with file rotation and formatted output
 """
 
+import atexit
 import logging
 import logging.handlers
 import os
+import queue
 from pathlib import Path
 from datetime import datetime
 
@@ -34,12 +36,16 @@ LOG_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
 MAX_BYTES = 10 * 1024 * 1024  # 10 MB
 BACKUP_COUNT = 5  # Keep 5 backup files
 
+# Background listener used when setup_logging(use_queue=True)
+_queue_listener = None
+
 
 def setup_logging(
     log_dir: str = DEFAULT_LOG_DIR,
     level: int = LEVEL_INFO,
     console_output: bool = True,
     file_output: bool = True,
+    use_queue: bool = False,
 ) -> logging.Logger:
     """
     Setup centralized logging configuration
@@ -49,10 +55,15 @@ def setup_logging(
         level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         console_output: Whether to output logs to console
         file_output: Whether to output logs to files
+        use_queue: Enqueue records and write them from a background thread,
+            so callers never block on console/file I/O
 
     Returns:
         logging.Logger: Configured root logger
     """
+    # Stop a listener left over from a previous setup
+    stop_queue_listener()
+
     # Create log directory if it doesn't exist
     if file_output:
         Path(log_dir).mkdir(parents=True, exist_ok=True)
@@ -94,9 +105,42 @@ def setup_logging(
         error_handler.setFormatter(formatter)
         root_logger.addHandler(error_handler)
 
+    if use_queue and root_logger.handlers:
+        _start_queue_listener(root_logger)
+
     return root_logger
 
 
+def _start_queue_listener(root_logger: logging.Logger):
+    """Move the root logger's handlers behind a QueueHandler/QueueListener pair"""
+    global _queue_listener
+
+    handlers = list(root_logger.handlers)
+    root_logger.handlers.clear()
+
+    log_queue = queue.SimpleQueue()
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+
+    _queue_listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    _queue_listener.start()
+
+
+def stop_queue_listener():
+    """Flush and stop the background log listener, if one is running"""
+    global _queue_listener
+
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        for handler in _queue_listener.handlers:
+            handler.close()
+        _queue_listener = None
+
+
+atexit.register(stop_queue_listener)
+
+
 def get_logger(name: str, level: int = None) -> logging.Logger:
     """
     Get a logger with the specified name
@@ -6,7 +6,6 @@ Contains business logic layer
 from .scan_service import ScanService
 from .dependency_service import DependencyService
 from .report_service import ReportService
-from .import_service import ImportService
 
 __all__ = [
     'ScanService',
@@ -14,3 +13,11 @@ __all__ = [
     'ReportService',
     'ImportService',
 ]
+
+
+def __getattr__(name):
+    # ImportService pulls in pandas; load it only when something asks for it
+    if name == 'ImportService':
+        from .import_service import ImportService
+        return ImportService
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
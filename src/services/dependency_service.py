@@ -228,20 +228,24 @@ class DependencyService:
             added_count = 0
             errors = []
 
-            for required_job_id in required_job_ids:
-                # Validate circular dependency
-                if not self.dependency_repo.validate_no_circular_dependency(
-                    job_id, required_job_id
-                ):
+            # Jobs that already require this job would create a cycle (one query for all)
+            dependents = set()
+            if required_job_ids:
+                dependents = set(self.dependency_repo.get_dependent_job_ids(job_id))
+            to_add = []
+            for required_job_id in dict.fromkeys(required_job_ids):
+                if required_job_id in dependents:
                     errors.append(f'Circular dependency detected with job {required_job_id}')
-                    continue
+                else:
+                    to_add.append(required_job_id)
 
-                # Add dependency
+            # Add all remaining dependencies in one batched INSERT
+            if to_add:
                 try:
-                    self.dependency_repo.add_dependency(job_id, required_job_id)
-                    added_count += 1
+                    self.dependency_repo.add_dependencies(job_id, to_add)
+                    added_count = len(to_add)
                 except Exception as e:
-                    errors.append(f'Error adding dependency {required_job_id}: {str(e)}')
+                    errors.append(f'Error adding dependencies {to_add}: {str(e)}')
 
             return {
                 'success': len(errors) == 0,
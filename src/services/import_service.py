@@ -257,6 +257,32 @@ class ImportService:
         imported_count = 0
         failed_count = 0
         errors = []
+        # แถวที่รอบันทึก: (row_number, params) ส่งทีละชุดด้วย executemany
+        pending = []
+        job_names: Dict[int, str] = {}
+
+        def flush_pending():
+            nonlocal imported_count, failed_count
+            if not pending:
+                return
+            try:
+                self.scan_log_repo.create_scans([params for _, params in pending])
+            except Exception:
+                # ทั้งชุดถูก rollback เพราะแถวเดียวที่ผิด (เช่น FK/ค่ายาวเกิน)
+                # บันทึกชุดนี้ใหม่ทีละแถว เพื่อให้แถวที่ถูกต้องยังเข้าได้และรายงานแถวที่ผิดจริง
+                for row_number, params in pending:
+                    try:
+                        self.scan_log_repo.create_scan(*params)
+                        imported_count += 1
+                    except Exception as e:
+                        failed_count += 1
+                        errors.append({
+                            'row_number': row_number,
+                            'error': f'ไม่สามารถบันทึกข้อมูลได้: {str(e)}'
+                        })
+            else:
+                imported_count += len(pending)
+            pending.clear()
 
         for row_result in validated_rows:
             # Skip invalid rows
@@ -277,30 +303,29 @@ class ImportService:
                 })
                 continue
 
-            # Get job type name if not provided
+            # Get job type name if not provided (looked up once per job)
             if not job_type_name:
-                job_info = self.job_type_repo.find_by_id(validated_data['main_job_id'])
-                current_job_type_name = job_info['job_name'] if job_info else 'Unknown'
+                main_job_id = validated_data['main_job_id']
+                if main_job_id not in job_names:
+                    job_info = self.job_type_repo.find_by_id(main_job_id)
+                    job_names[main_job_id] = job_info['job_name'] if job_info else 'Unknown'
+                current_job_type_name = job_names[main_job_id]
             else:
                 current_job_type_name = job_type_name
 
-            # Import the scan
-            try:
-                self.scan_log_repo.create_scan(
-                    barcode=validated_data['barcode'],
-                    job_type=current_job_type_name,
-                    user_id=user_id,
-                    job_id=validated_data['main_job_id'],
-                    sub_job_id=validated_data['sub_job_id'],
-                    notes=validated_data.get('notes', '')
-                )
-                imported_count += 1
-            except Exception as e:
-                failed_count += 1
-                errors.append({
-                    'row_number': row_result['row_number'],
-                    'error': f'ไม่สามารถบันทึกข้อมูลได้: {str(e)}'
-                })
+            # Queue the scan; a full batch goes to the database in one round-trip
+            pending.append((row_result['row_number'], (
+                validated_data['barcode'],
+                current_job_type_name,
+                user_id,
+                validated_data['main_job_id'],
+                validated_data['sub_job_id'],
+                validated_data.get('notes', '')
+            )))
+            if len(pending) >= constants.IMPORT_INSERT_BATCH_SIZE:
+                flush_pending()
+
+        flush_pending()
 
         total_processed = imported_count + failed_count
         success = failed_count == 0
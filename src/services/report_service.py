@@ -5,7 +5,10 @@ Report Service Module
 Handles business logic for report generation
 """
 
-from typing import Dict, Optional, Any, List
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterator, Optional, Any, List, Tuple
 from datetime import datetime
 from ..database.scan_log_repository import ScanLogRepository
 from ..database.job_type_repository import JobTypeRepository
@@ -44,6 +47,44 @@ class ReportService:
         self.scan_log_repo = scan_log_repo
         self.job_type_repo = job_type_repo
         self.sub_job_repo = sub_job_repo
+        # (start_date, end_date, job_id, sub_job_id, notes_filter) -> (timestamp, scans)
+        # ('first_page', report_date, job_id, sub_job_id, notes_filter, limit) -> (timestamp, (scans, statistics))
+        self._report_cache: "OrderedDict[Tuple, Tuple[float, Any]]" = OrderedDict()
+        # Reports are loaded on worker threads while the Tk thread may clear the cache
+        self._report_cache_lock = threading.Lock()
+        # Bumped on every clear - a load that started before the clear is not stored
+        self._report_cache_generation = 0
+
+    def clear_report_cache(self) -> None:
+        """Drop cached report rows so the next report is read from the database"""
+        with self._report_cache_lock:
+            self._report_cache_generation += 1
+            self._report_cache.clear()
+
+    def _cached_report(self, key: Tuple, load):
+        """
+        Return the cached value for key, or call load() and cache its result
+
+        Entries older than REPORT_CACHE_TTL_SECONDS are re-queried so newly
+        recorded scans show up on the next report.
+        """
+        now = time.monotonic()
+        with self._report_cache_lock:
+            cached = self._report_cache.get(key)
+            if cached is not None and now - cached[0] < constants.REPORT_CACHE_TTL_SECONDS:
+                self._report_cache.move_to_end(key)
+                return cached[1]
+            generation = self._report_cache_generation
+
+        value = load()
+
+        with self._report_cache_lock:
+            if generation == self._report_cache_generation:
+                self._report_cache[key] = (now, value)
+                self._report_cache.move_to_end(key)
+                if len(self._report_cache) > constants.REPORT_CACHE_SIZE:
+                    self._report_cache.popitem(last=False)
+        return value
 
     def generate_report(
         self,
@@ -84,32 +125,11 @@ class ReportService:
                 'data': {}
             }
 
-        # Step 3: Get report data
+        # Step 3: Get report data (notes filter applied, recent identical queries reused)
         try:
-            if sub_job_id is not None:
-                # Get report with specific sub job
-                scans = self.scan_log_repo.get_report_with_sub_job(
-                    start_date=start_date,
-                    end_date=end_date,
-                    job_id=job_id,
-                    sub_job_id=sub_job_id
-                )
-            else:
-                # Get report for all sub jobs of the main job
-                scans = self.scan_log_repo.get_report_with_sub_job(
-                    start_date=start_date,
-                    end_date=end_date,
-                    job_id=job_id
-                )
+            scans = self._fetch_scans(start_date, end_date, job_id, sub_job_id, notes_filter)
 
-            # Step 4: Apply notes filter if specified
-            if notes_filter:
-                scans = [
-                    scan for scan in scans
-                    if scan.get('notes') and notes_filter.lower() in scan['notes'].lower()
-                ]
-
-            # Step 5: Calculate statistics
+            # Step 4: Calculate statistics
             total_scans = len(scans)
             unique_barcodes = len(set(scan['barcode'] for scan in scans))
 
@@ -147,6 +167,158 @@ class ReportService:
                 'data': {}
             }
 
+    def generate_report_page(
+        self,
+        report_date: str,
+        job_id: int,
+        sub_job_id: Optional[int] = None,
+        notes_filter: Optional[str] = None,
+        limit: int = constants.REPORT_PAGE_SIZE
+    ) -> Dict[str, Any]:
+        """
+        Generate the first page of a report plus statistics for the whole report
+
+        Statistics are counted in the database in the same query, so only
+        `limit` rows are transferred; later pages come from get_report_page().
+        The first page is served from the report cache for identical filters.
+
+        Args:
+            report_date: Report date in YYYY-MM-DD format
+            job_id: Job type ID to filter by
+            sub_job_id: Optional sub job type ID to filter by
+            notes_filter: Optional notes text to filter by
+            limit: Number of rows in the first page
+
+        Returns:
+            Same structure as generate_report, with data['scans'] holding
+            only the first page
+        """
+        # Step 1: Validate inputs
+        validation_result = self._validate_inputs(report_date, job_id, sub_job_id)
+        if not validation_result['success']:
+            return validation_result
+
+        # Step 2: Check date format
+        try:
+            datetime.strptime(report_date, constants.DATE_FORMAT)
+        except ValueError:
+            return {
+                'success': False,
+                'message': constants.ERROR_INVALID_DATE_FORMAT,
+                'data': {}
+            }
+
+        # Step 3: Fetch the first page together with whole-report statistics
+        try:
+            key = ('first_page', report_date, job_id, sub_job_id, notes_filter, limit)
+            scans, statistics = self._cached_report(
+                key,
+                lambda: self.scan_log_repo.get_report_first_page(
+                    start_date=report_date,
+                    end_date=report_date,
+                    job_id=job_id,
+                    sub_job_id=sub_job_id,
+                    notes_filter=notes_filter,
+                    limit=limit
+                )
+            )
+            # Callers may extend the page list; keep the cached copy intact
+            scans = list(scans)
+            statistics = dict(statistics)
+
+            job_info = self.job_type_repo.find_by_id(job_id)
+            job_name = job_info['job_name'] if job_info else 'Unknown'
+
+            sub_job_name = None
+            if sub_job_id is not None:
+                sub_job_info = self.sub_job_repo.get_details(sub_job_id)
+                sub_job_name = sub_job_info['sub_job_name'] if sub_job_info else 'Unknown'
+
+            return {
+                'success': True,
+                'message': constants.INFO_DATA_FOUND.format(statistics['total_scans']),
+                'data': {
+                    'report_date': report_date,
+                    'job_id': job_id,
+                    'job_name': job_name,
+                    'sub_job_id': sub_job_id,
+                    'sub_job_name': sub_job_name,
+                    'notes_filter': notes_filter,
+                    'scans': scans,
+                    'statistics': statistics
+                }
+            }
+
+        except Exception as e:
+            return {
+                'success': False,
+                'message': constants.ERROR_CREATE_REPORT.format(str(e)),
+                'data': {}
+            }
+
+    def get_report_page(
+        self,
+        report_date: str,
+        job_id: int,
+        sub_job_id: Optional[int] = None,
+        notes_filter: Optional[str] = None,
+        offset: int = 0,
+        limit: int = constants.REPORT_PAGE_SIZE
+    ) -> List[Dict[str, Any]]:
+        """
+        Get one page of report rows for filters already validated by generate_report_page
+
+        Args:
+            report_date: Report date in YYYY-MM-DD format
+            job_id: Job type ID to filter by
+            sub_job_id: Optional sub job type ID to filter by
+            notes_filter: Optional notes text to filter by
+            offset: Number of rows to skip
+            limit: Maximum number of rows to return
+
+        Returns:
+            List of report rows, newest first
+        """
+        return self.scan_log_repo.get_report_page(
+            start_date=report_date,
+            end_date=report_date,
+            job_id=job_id,
+            sub_job_id=sub_job_id,
+            notes_filter=notes_filter,
+            offset=offset,
+            limit=limit
+        )
+
+    # Column order of iter_report_rows results
+    REPORT_ROW_COLUMNS = ScanLogRepository.REPORT_ROW_COLUMNS
+
+    def iter_report_rows(
+        self,
+        report_date: str,
+        job_id: int,
+        sub_job_id: Optional[int] = None,
+        notes_filter: Optional[str] = None
+    ) -> Iterator[tuple]:
+        """
+        Stream every row of a report (for export) without building a list
+
+        Args:
+            report_date: Report date in YYYY-MM-DD format
+            job_id: Job type ID to filter by
+            sub_job_id: Optional sub job type ID to filter by
+            notes_filter: Optional notes text to filter by
+
+        Returns:
+            Iterator of rows in REPORT_ROW_COLUMNS order
+        """
+        return self.scan_log_repo.iter_report_rows(
+            start_date=report_date,
+            end_date=report_date,
+            job_id=job_id,
+            sub_job_id=sub_job_id,
+            notes_filter=notes_filter
+        )
+
     def generate_date_range_report(
         self,
         start_date: str,
@@ -193,26 +365,7 @@ class ReportService:
 
         # Step 3: Get report data
         try:
-            if sub_job_id is not None:
-                scans = self.scan_log_repo.get_report_with_sub_job(
-                    start_date=start_date,
-                    end_date=end_date,
-                    job_id=job_id,
-                    sub_job_id=sub_job_id
-                )
-            else:
-                scans = self.scan_log_repo.get_report_with_sub_job(
-                    start_date=start_date,
-                    end_date=end_date,
-                    job_id=job_id
-                )
-
-            # Apply notes filter if specified
-            if notes_filter:
-                scans = [
-                    scan for scan in scans
-                    if scan.get('notes') and notes_filter.lower() in scan['notes'].lower()
-                ]
+            scans = self._fetch_scans(start_date, end_date, job_id, sub_job_id, notes_filter)
 
             # Calculate statistics
             total_scans = len(scans)
@@ -255,6 +408,68 @@ class ReportService:
 
     # Private helper methods
 
+    def _fetch_scans(
+        self,
+        start_date: str,
+        end_date: str,
+        job_id: int,
+        sub_job_id: Optional[int] = None,
+        notes_filter: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get report scans for the given filters, served from the report cache
+
+        Args:
+            start_date: Start date in YYYY-MM-DD format
+            end_date: End date in YYYY-MM-DD format
+            job_id: Job type ID to filter by
+            sub_job_id: Optional sub job type ID to filter by
+            notes_filter: Optional notes text to filter by
+
+        Returns:
+            List of scan dictionaries (a fresh list on every call)
+        """
+        key = (start_date, end_date, job_id, sub_job_id, notes_filter)
+        # Callers get their own list; the cached one is never handed out
+        return list(self._cached_report(
+            key,
+            lambda: self._query_scans(start_date, end_date, job_id, sub_job_id, notes_filter)
+        ))
+
+    def _query_scans(
+        self,
+        start_date: str,
+        end_date: str,
+        job_id: int,
+        sub_job_id: Optional[int],
+        notes_filter: Optional[str]
+    ) -> List[Dict[str, Any]]:
+        """Read report scans from the database (see _fetch_scans)"""
+        if sub_job_id is not None:
+            # Get report with specific sub job
+            scans = self.scan_log_repo.get_report_with_sub_job(
+                start_date=start_date,
+                end_date=end_date,
+                job_id=job_id,
+                sub_job_id=sub_job_id
+            )
+        else:
+            # Get report for all sub jobs of the main job
+            scans = self.scan_log_repo.get_report_with_sub_job(
+                start_date=start_date,
+                end_date=end_date,
+                job_id=job_id
+            )
+
+        # Apply notes filter if specified
+        if notes_filter:
+            needle = notes_filter.lower()
+            scans = [
+                scan for scan in scans
+                if scan.get('notes') and needle in scan['notes'].lower()
+            ]
+        return scans
+
     def _validate_inputs(
         self,
         date_str: str,
@@ -5,7 +5,11 @@ Scan Service Module
 Handles business logic for barcode scanning operations
 """
 
-from typing import Dict, Optional, Any
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import Dict, Optional, Any, Tuple
 from ..database.scan_log_repository import ScanLogRepository
 from ..database.sub_job_repository import SubJobRepository
 from ..database.dependency_repository import DependencyRepository
@@ -43,6 +47,62 @@ class ScanService:
         self.scan_log_repo = scan_log_repo
         self.sub_job_repo = sub_job_repo
         self.dependency_repo = dependency_repo
+        # (job_id, notes_filter, day ordinal) -> (timestamp, {sub_job_id: count})
+        self._today_count_cache: "OrderedDict[Tuple, Tuple[float, Dict[Optional[int], int]]]" = OrderedDict()
+        # web ใช้ ScanService ตัวเดียวจากหลาย thread - ทุกการเข้าถึง cache ต้องถือ lock นี้
+        self._today_count_lock = threading.Lock()
+        # เพิ่มทุกครั้งที่ล้าง cache - ยอดที่นับก่อนการสแกนใหม่จะไม่ถูกเก็บ
+        self._today_count_generation = 0
+
+    def get_today_count(
+        self,
+        job_id: int,
+        sub_job_id: Optional[int] = None,
+        notes_filter: Optional[str] = None
+    ) -> int:
+        """
+        Count today's scans for a job, served from a short-lived cache
+
+        One query fetches the counts of every sub job of the job, so switching
+        sub jobs within TODAY_COUNT_CACHE_TTL_SECONDS needs no new query.
+        A successful scan clears the cache.
+
+        Args:
+            job_id: Main job ID
+            sub_job_id: Optional sub job ID (None counts every sub job)
+            notes_filter: Optional text the notes must contain
+
+        Returns:
+            Number of scans recorded today
+        """
+        key = (job_id, notes_filter or None, date.today().toordinal())
+        now = time.monotonic()
+
+        with self._today_count_lock:
+            cached = self._today_count_cache.get(key)
+            if cached is not None and now - cached[0] < constants.TODAY_COUNT_CACHE_TTL_SECONDS:
+                self._today_count_cache.move_to_end(key)
+                counts = cached[1]
+            else:
+                counts = None
+                generation = self._today_count_generation
+
+        if counts is None:
+            counts = self.scan_log_repo.get_today_counts_by_sub_job(
+                job_id=job_id,
+                notes_filter=notes_filter or None
+            )
+
+            with self._today_count_lock:
+                if generation == self._today_count_generation:
+                    self._today_count_cache[key] = (now, counts)
+                    self._today_count_cache.move_to_end(key)
+                    if len(self._today_count_cache) > constants.TODAY_COUNT_CACHE_SIZE:
+                        self._today_count_cache.popitem(last=False)
+
+        if sub_job_id is None:
+            return sum(counts.values())
+        return counts.get(sub_job_id, 0)
 
     def process_scan(
         self,
@@ -51,7 +111,8 @@ class ScanService:
         job_id: int,
         sub_job_type_name: str,
         user_id: str,
-        notes: str = ""
+        notes: str = "",
+        sub_job_id: Optional[int] = None
     ) -> Dict[str, Any]:
         """
         Process a barcode scan with full validation and dependency checking
@@ -63,6 +124,8 @@ class ScanService:
             sub_job_type_name: Name of the sub job type
             user_id: User performing the scan
             notes: Optional notes for the scan
+            sub_job_id: ID of the sub job when the caller already resolved it
+                from sub_job_type_name (skips the lookup query)
 
         Returns:
             Dictionary with:
@@ -77,48 +140,39 @@ class ScanService:
         if not validation_result['success']:
             return validation_result
 
-        # Step 2: Get sub job ID
-        sub_job_data = self.sub_job_repo.find_by_name(job_id, sub_job_type_name)
-        if not sub_job_data:
-            return {
-                'success': False,
-                'message': constants.ERROR_INVALID_SUB_JOB,
-                'data': {}
-            }
-
-        sub_job_id = sub_job_data['id']
+        # Step 2: Get sub job ID (unless the caller already has it)
+        if sub_job_id is None:
+            sub_job_data = self.sub_job_repo.find_by_name(job_id, sub_job_type_name)
+            if not sub_job_data:
+                return {
+                    'success': False,
+                    'message': constants.ERROR_INVALID_SUB_JOB,
+                    'data': {}
+                }
 
-        # Step 3: Check for duplicates
-        duplicate_result = self._check_duplicate(barcode, job_id, sub_job_id)
-        if not duplicate_result['success']:
-            return duplicate_result
+            sub_job_id = sub_job_data['id']
 
-        # Step 4: Check dependencies
+        # Step 3: Check dependencies
         dependency_result = self._check_dependencies(barcode, job_id)
         if not dependency_result['success']:
+            # A duplicate is reported before missing dependencies (e.g. a rescan
+            # whose prerequisite has since been removed) - only checked on this path
+            existing = self._find_duplicate(barcode, job_id, sub_job_id)
+            if existing:
+                return self._duplicate_response(existing)
             return dependency_result
 
-        # Step 5: Save the scan
+        # Step 4: Save the scan unless it is a duplicate (one atomic statement)
         try:
-            self.scan_log_repo.create_scan(
+            inserted = self.scan_log_repo.create_scan_if_new(
                 barcode=barcode,
                 job_type=job_type_name,
                 user_id=user_id,
                 job_id=job_id,
                 sub_job_id=sub_job_id,
-                notes=notes
+                notes=notes,
+                hours=constants.DUPLICATE_CHECK_HOURS_FULL_HISTORY
             )
-
-            return {
-                'success': True,
-                'message': constants.SUCCESS_SCAN,
-                'data': {
-                    'barcode': barcode,
-                    'job_type': job_type_name,
-                    'sub_job_type': sub_job_type_name,
-                    'notes': notes
-                }
-            }
         except Exception as e:
             return {
                 'success': False,
@@ -126,6 +180,25 @@ class ScanService:
                 'data': {}
             }
 
+        if not inserted:
+            return self._duplicate_result(barcode, job_id, sub_job_id)
+
+        # Counts cached before this scan are now stale
+        with self._today_count_lock:
+            self._today_count_generation += 1
+            self._today_count_cache.clear()
+
+        return {
+            'success': True,
+            'message': constants.SUCCESS_SCAN,
+            'data': {
+                'barcode': barcode,
+                'job_type': job_type_name,
+                'sub_job_type': sub_job_type_name,
+                'notes': notes
+            }
+        }
+
     def _validate_input(
         self,
         barcode: str,
@@ -170,22 +243,25 @@ class ScanService:
             'data': {}
         }
 
-    def _check_duplicate(
+    def _find_duplicate(
         self,
         barcode: str,
         job_id: int,
-        sub_job_id: int
-    ) -> Dict[str, Any]:
+        sub_job_id: Optional[int]
+    ) -> Optional[Dict[str, Any]]:
         """
-        Check for duplicate scans
+        Get the latest scan of the barcode for the job if it makes this scan a duplicate
+
+        Same rule as ScanLogRepository.create_scan_if_new: only the latest scan
+        counts, and it must have the same sub job.
 
         Args:
-            barcode: Barcode to check
+            barcode: Barcode that was scanned
             job_id: Main job ID
             sub_job_id: Sub job ID
 
         Returns:
-            Result dictionary with duplicate_info if found
+            The duplicate scan record, or None (also when the lookup fails)
         """
         try:
             existing = self.scan_log_repo.check_duplicate(
@@ -193,28 +269,45 @@ class ScanService:
                 job_id=job_id,
                 hours=constants.DUPLICATE_CHECK_HOURS_FULL_HISTORY
             )
+        except Exception:
+            return None
 
-            # Check if the existing scan has the same sub_job_id
-            if existing and existing.get('sub_job_id') == sub_job_id:
-                return {
-                    'success': False,
-                    'message': constants.ERROR_DUPLICATE_BARCODE,
-                    'data': {
-                        'duplicate_info': existing
-                    }
-                }
+        if existing and existing.get('sub_job_id') == sub_job_id:
+            return existing
+        return None
 
-            return {
-                'success': True,
-                'message': 'No duplicate found',
-                'data': {}
-            }
-        except Exception as e:
-            return {
-                'success': False,
-                'message': constants.ERROR_CHECK_DUPLICATE.format(str(e)),
-                'data': {}
+    def _duplicate_result(
+        self,
+        barcode: str,
+        job_id: int,
+        sub_job_id: Optional[int]
+    ) -> Dict[str, Any]:
+        """
+        Build the result for a scan that was rejected as a duplicate
+
+        Only runs after the INSERT found an existing scan, to show the user
+        the previous record.
+
+        Args:
+            barcode: Barcode that was scanned
+            job_id: Main job ID
+            sub_job_id: Sub job ID
+
+        Returns:
+            Result dictionary with duplicate_info
+        """
+        return self._duplicate_response(self._find_duplicate(barcode, job_id, sub_job_id) or {})
+
+    @staticmethod
+    def _duplicate_response(existing: Dict[str, Any]) -> Dict[str, Any]:
+        """Result dictionary for a duplicate scan"""
+        return {
+            'success': False,
+            'message': constants.ERROR_DUPLICATE_BARCODE,
+            'data': {
+                'duplicate_info': existing
             }
+        }
 
     def _check_dependencies(
         self,
@@ -232,34 +325,17 @@ class ScanService:
             Result dictionary with missing_dependencies if any
         """
         try:
-            required_jobs = self.dependency_repo.get_required_jobs(job_id)
-
-            if not required_jobs:
-                # No dependencies, can scan
-                return {
-                    'success': True,
-                    'message': 'No dependencies',
-                    'data': {}
-                }
-
-            missing_dependencies = []
-
-            # Check if all required jobs have been scanned for this barcode
-            for required_job in required_jobs:
-                required_job_id = required_job['required_job_id']
-                required_job_name = required_job['job_name']
-
-                duplicate = self.scan_log_repo.check_duplicate(
-                    barcode=barcode,
-                    job_id=required_job_id,
-                    hours=constants.DUPLICATE_CHECK_HOURS_FULL_HISTORY
-                )
+            # One query returns only the required jobs this barcode still lacks
+            missing_jobs = self.dependency_repo.get_missing_required_jobs(
+                job_id=job_id,
+                barcode=barcode,
+                hours=constants.DUPLICATE_CHECK_HOURS_FULL_HISTORY
+            )
 
-                if duplicate is None:
-                    missing_dependencies.append({
-                        'job_id': required_job_id,
-                        'job_name': required_job_name
-                    })
+            missing_dependencies = [
+                {'job_id': row['required_job_id'], 'job_name': row['job_name']}
+                for row in missing_jobs
+            ]
 
             if missing_dependencies:
                 # Build error message
@@ -8,6 +8,7 @@ Dialog for editing scan record information
 import tkinter as tk
 from tkinter import ttk, messagebox
 from typing import Dict, Any, Callable, Optional, List, Tuple
+from ... import constants
 
 
 class EditScanDialog:
@@ -65,6 +66,8 @@ class EditScanDialog:
 
         # Sub job data cache
         self.sub_job_types_data = {}
+        # ชื่องานย่อยทั้งหมด (combobox แสดงแค่ COMBOBOX_MAX_ITEMS รายการ)
+        self._all_sub_job_names: List[str] = []
 
         # Build UI
         self.build_ui()
@@ -126,13 +129,14 @@ class EditScanDialog:
         sub_job_frame = ttk.Frame(main_frame)
         sub_job_frame.pack(fill=tk.X, pady=5)
         ttk.Label(sub_job_frame, text="ประเภทงานย่อย:", width=15).pack(side=tk.LEFT)
+        # Editable so the user can type to filter long sub job lists
         self.sub_job_combo = ttk.Combobox(
             sub_job_frame,
             textvariable=self.sub_job_var,
-            state="readonly",
             width=25
         )
         self.sub_job_combo.pack(side=tk.LEFT, padx=10)
+        self.sub_job_combo.bind('<KeyRelease>', self.filter_sub_jobs)
 
         # Notes
         notes_frame = ttk.Frame(main_frame)
@@ -212,17 +216,27 @@ class EditScanDialog:
             try:
                 # Load sub jobs for selected main job
                 results = self.sub_job_repo.get_by_main_job(main_job_id, active_only=True)
-                sub_job_names = [row['sub_job_name'] for row in results]
-                self.sub_job_combo['values'] = sub_job_names
+                self._all_sub_job_names = [row['sub_job_name'] for row in results]
+                self.sub_job_combo['values'] = self._all_sub_job_names[:constants.COMBOBOX_MAX_ITEMS]
 
                 # Cache sub job data for save operation
                 self.sub_job_types_data = {row['sub_job_name']: row['id'] for row in results}
 
             except Exception as e:
                 print(f"Error loading sub jobs in edit dialog: {str(e)}")
+                self._all_sub_job_names = []
                 self.sub_job_combo['values'] = []
                 self.sub_job_types_data = {}
 
+    def filter_sub_jobs(self, event=None):
+        """Show the sub jobs containing the typed text (capped at COMBOBOX_MAX_ITEMS)"""
+        typed = self.sub_job_var.get().strip().lower()
+        if typed:
+            matches = [name for name in self._all_sub_job_names if typed in name.lower()]
+        else:
+            matches = self._all_sub_job_names
+        self.sub_job_combo['values'] = matches[:constants.COMBOBOX_MAX_ITEMS]
+
     def save_changes(self):
         """Save changes to database"""
         new_barcode = self.barcode_entry.get().strip()
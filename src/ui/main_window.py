@@ -8,6 +8,7 @@ Main application file with multi-tab interface
 import tkinter as tk
 from tkinter import ttk, messagebox
 import sys
+import traceback
 from typing import Dict, Optional, Any
 
 # Import constants
@@ -15,6 +16,7 @@ from .. import constants
 
 # Import database manager and repositories
 from ..database.database_manager import DatabaseManager
+from ..exceptions import DatabaseException
 from ..database import (
     JobTypeRepository,
     SubJobRepository,
@@ -57,6 +59,8 @@ class WMSScannerApp:
         self.root.title("WMS EP Asia Group Co., Ltd.")
         self.root.geometry(constants.WINDOW_MAIN_SIZE)
         self.root.resizable(False, False)
+        # ชั้นฐานข้อมูลไม่แสดง dialog เอง - ข้อผิดพลาดที่หลุดจาก callback แสดงที่นี่บน Tk thread
+        self.root.report_callback_exception = self.report_callback_exception
 
         # Initialize database manager with connection info
         self.db = DatabaseManager(connection_info)
@@ -96,6 +100,13 @@ class WMSScannerApp:
         # Initialize UI with component-based tabs
         self.setup_ui()
 
+    def report_callback_exception(self, exc_type, exc_value, exc_traceback):
+        """แสดงข้อผิดพลาดจากฐานข้อมูลที่ไม่ได้ถูกจัดการใน callback เป็น dialog"""
+        if isinstance(exc_value, DatabaseException):
+            messagebox.showerror("ข้อผิดพลาด", str(exc_value))
+            return
+        traceback.print_exception(exc_type, exc_value, exc_traceback)
+
     def setup_ui(self):
         """Setup the main UI with component-based tabs"""
         # Create notebook (tabs)
@@ -197,6 +208,12 @@ class WMSScannerApp:
         except Exception as e:
             print(f"Error in on_tab_changed: {str(e)}")
 
+    def cleanup(self):
+        """Cancel pending tab work and stop the tabs' worker threads"""
+        for tab in (self.scanning_tab, self.history_tab, self.reports_tab, self.import_tab,
+                    self.settings_tab, self.sub_job_settings_tab):
+            tab.cleanup()
+
     # Callback methods for inter-component communication
     def on_scan_completed(self):
         """Called when a scan is completed successfully"""
@@ -220,6 +237,9 @@ class WMSScannerApp:
         # Refresh job types in reports tab
         if hasattr(self, 'reports_tab'):
             self.reports_tab.refresh_job_types()
+        # Refresh job type filter in history tab
+        if hasattr(self, 'history_tab'):
+            self.history_tab.load_job_types()
         # Refresh main job list in sub job settings tab
         if hasattr(self, 'sub_job_settings_tab'):
             self.sub_job_settings_tab.refresh_main_job_list()
@@ -230,6 +250,9 @@ class WMSScannerApp:
         if hasattr(self, 'scanning_tab'):
             # Trigger refresh by simulating job type change
             self.scanning_tab.on_job_type_change()
+        # Drop cached sub job lists in reports tab
+        if hasattr(self, 'reports_tab'):
+            self.reports_tab.invalidate_report_caches()
 
 
 def main():
@@ -244,6 +267,10 @@ def main():
     if login_window.connection_info:
         app = WMSScannerApp(root, login_window.connection_info)
         root.mainloop()
+        app.cleanup()
+        # ปิด connection ถาวรของคำสั่งที่เตรียมไว้และ connection ที่ว่างใน pool
+        app.db.close_prepared()
+        app.db.close_connections()
     else:
         root.destroy()
 
@@ -6,15 +6,37 @@ UI component for scan history
 """
 
 import tkinter as tk
+from collections import Counter, namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor
+from sys import intern
 from tkinter import ttk, messagebox, filedialog
 from typing import Dict, Any, Callable, Optional
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from ..tabs.base_tab import BaseTab
+from ... import constants
+
+
+# ข้อมูลหนึ่งแถวในตารางประวัติ (ลำดับเดียวกับคอลัมน์ของตาราง)
+HistoryRow = namedtuple(
+    'HistoryRow',
+    ['id', 'scan_date', 'barcode', 'job_type', 'sub_job_name', 'user_id', 'status', 'notes']
+)
 
 
 class HistoryTab(BaseTab):
     """แท็บประวัติการสแกน"""
 
+    # หัวคอลัมน์ -> sort key ของ ScanLogRepository.search_history
+    SORT_KEYS = {
+        "ID": 'id',
+        "วันที่สแกน": 'scan_date',
+        "Barcode": 'barcode',
+        "Job Type": 'job_type',
+        "Sub Job Type": 'sub_job_name',
+        "ผู้สแกน": 'user_id',
+        "หมายเหตุ": 'notes',
+    }
+
     def __init__(
         self,
         parent: tk.Widget,
@@ -24,6 +46,21 @@ class HistoryTab(BaseTab):
         on_history_updated: Optional[Callable] = None
     ):
         self.on_history_updated = on_history_updated
+        # โหลดผลการค้นหาทีละหน้า (ปรับขนาดหน้าได้)
+        self.page_size = constants.HISTORY_PAGE_SIZE
+        self._search_filters: Dict[str, Any] = {}
+        self._offset = 0
+        self._total_count = 0
+        # ข้อมูลจริง (int/datetime/str) ของแต่ละแถวที่โหลดแล้วตาม iid
+        self._row_data: Dict[str, HistoryRow] = {}
+        # การเรียงลำดับทำที่ SQL Server (ใช้ index) ไม่ใช่ใน Python
+        self._order_by = 'scan_date'
+        self._order_desc = True
+        # Query ฐานข้อมูลใน worker thread เพื่อไม่ให้ UI ค้าง
+        self._executor = ThreadPoolExecutor(max_workers=2)
+        self._pending_future: Optional[Future] = None
+        self._pending_after: Optional[str] = None
+        self._job_type_values: tuple = ()
         super().__init__(parent, db_manager, repositories, services)
         self.refresh_history()
 
@@ -43,15 +80,18 @@ class HistoryTab(BaseTab):
         
         # วันที่เริ่มต้น
         ttk.Label(filter_frame, text="วันที่เริ่มต้น:").grid(row=0, column=0, sticky=tk.W, padx=5, pady=5)
-        self.start_date_var = tk.StringVar(value=(datetime.now() - timedelta(days=7)).strftime("%Y-%m-%d"))
+        start_date, end_date = self._default_date_range()
+        self.start_date_var = tk.StringVar(value=start_date)
         start_date_entry = ttk.Entry(filter_frame, textvariable=self.start_date_var, width=15)
         start_date_entry.grid(row=0, column=1, sticky=tk.W, padx=5, pady=5)
+        start_date_entry.bind("<Return>", lambda e: self._debounced_search())
         
         # วันที่สิ้นสุด
         ttk.Label(filter_frame, text="วันที่สิ้นสุด:").grid(row=0, column=2, sticky=tk.W, padx=5, pady=5)
-        self.end_date_var = tk.StringVar(value=datetime.now().strftime("%Y-%m-%d"))
+        self.end_date_var = tk.StringVar(value=end_date)
         end_date_entry = ttk.Entry(filter_frame, textvariable=self.end_date_var, width=15)
         end_date_entry.grid(row=0, column=3, sticky=tk.W, padx=5, pady=5)
+        end_date_entry.bind("<Return>", lambda e: self._debounced_search())
         
         # Job Type
         ttk.Label(filter_frame, text="Job Type:").grid(row=1, column=0, sticky=tk.W, padx=5, pady=5)
@@ -59,15 +99,18 @@ class HistoryTab(BaseTab):
         self.job_type_combo = ttk.Combobox(filter_frame, textvariable=self.job_type_var, 
                                           state="readonly", width=20)
         self.job_type_combo.grid(row=1, column=1, sticky=tk.W, padx=5, pady=5)
+        self.job_type_combo.bind("<<ComboboxSelected>>", lambda e: self._debounced_search())
         
         # Barcode
         ttk.Label(filter_frame, text="Barcode:").grid(row=1, column=2, sticky=tk.W, padx=5, pady=5)
         self.barcode_var = tk.StringVar()
         barcode_entry = ttk.Entry(filter_frame, textvariable=self.barcode_var, width=20)
         barcode_entry.grid(row=1, column=3, sticky=tk.W, padx=5, pady=5)
+        barcode_entry.bind("<Return>", lambda e: self._debounced_search())
         
         # ปุ่มค้นหา
-        ttk.Button(filter_frame, text="ค้นหา", command=self.search_history).grid(row=1, column=4, padx=5, pady=5)
+        self.search_button = ttk.Button(filter_frame, text="ค้นหา", command=self.search_history)
+        self.search_button.grid(row=1, column=4, padx=5, pady=5)
         ttk.Button(filter_frame, text="ล้างตัวกรอง", command=self.clear_filters).grid(row=1, column=5, padx=5, pady=5)
         
         # Frame สำหรับตารางประวัติ
@@ -79,7 +122,7 @@ class HistoryTab(BaseTab):
         self.history_tree = ttk.Treeview(history_frame, columns=columns, show="headings", height=15)
         
         for col in columns:
-            self.history_tree.heading(col, text=col)
+            self.history_tree.heading(col, text=col, command=lambda c=col: self.sort_column(c))
             self.history_tree.column(col, width=120)
         
         self.history_tree.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
@@ -87,17 +130,23 @@ class HistoryTab(BaseTab):
         # Scrollbar สำหรับ Treeview
         scrollbar = ttk.Scrollbar(history_frame, orient=tk.VERTICAL, command=self.history_tree.yview)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.history_tree.configure(yscrollcommand=scrollbar.set)
+        self.history_scrollbar = scrollbar
+        self.history_tree.configure(yscrollcommand=self._on_tree_scroll)
         
         # Context menu สำหรับตาราง
         self.context_menu = tk.Menu(self.frame, tearoff=0)
         self.context_menu.add_command(label="แก้ไข", command=self.edit_record)
         self.context_menu.add_command(label="ลบ", command=self.delete_record)
+        self.context_menu.add_command(label="คัดลอก Barcode", command=self.copy_barcode)
         self.context_menu.add_separator()
         self.context_menu.add_command(label="ส่งออก", command=self.export_history)
         
         self.history_tree.bind("<Button-3>", self.show_context_menu)
         
+        # ข้อความสถานะชั่วคราว (เช่น หลังคัดลอก Barcode)
+        self.info_label = ttk.Label(history_frame, text="")
+        self.info_label.pack(anchor=tk.W, padx=5)
+        
         # Frame สำหรับปุ่ม
         button_frame = ttk.Frame(main_frame)
         button_frame.pack(pady=10)
@@ -115,71 +164,234 @@ class HistoryTab(BaseTab):
             # Use JobTypeRepository
             results = self.job_type_repo.get_all_job_types()
 
-            job_types = ["ทั้งหมด"] + [row['name'] for row in results]
+            job_types = tuple(["ทั้งหมด"] + [intern(row['job_name']) for row in results])
+
+            # ไม่ตั้งค่า combobox ใหม่ถ้ารายการไม่เปลี่ยน (Tk ต้อง reconfigure widget ทุกครั้ง)
+            if job_types == self._job_type_values:
+                return
+            self._job_type_values = job_types
             self.job_type_combo['values'] = job_types
-            self.job_type_combo.set("ทั้งหมด")
+
+            if self.job_type_var.get() not in job_types:
+                self.job_type_combo.set("ทั้งหมด")
 
         except Exception as e:
             messagebox.showerror("ผิดพลาด", f"ไม่สามารถโหลด Job Types: {str(e)}")
     
+    def _debounced_search(self):
+        """รวมการสั่งค้นหาที่เกิดติดกันเร็ว ๆ ให้เหลือครั้งเดียว"""
+        if self._pending_after is not None:
+            self.frame.after_cancel(self._pending_after)
+        self._pending_after = self.frame.after(constants.SEARCH_DEBOUNCE_MS, self._run_debounced_search)
+
+    def _run_debounced_search(self):
+        """ค้นหาหลังจากพ้นช่วง debounce"""
+        self._pending_after = None
+        self.search_history()
+
     def search_history(self):
         """ค้นหาประวัติ"""
-        try:
-            # Get search filters
-            start_date = self.start_date_var.get() or None
-            end_date = self.end_date_var.get() or None
-            job_type = self.job_type_var.get()
-            barcode = self.barcode_var.get().strip() or None
-
-            # Convert job type name to ID if not "ทั้งหมด"
-            job_type_id = None
-            if job_type and job_type != "ทั้งหมด":
-                job_obj = self.job_type_repo.find_by_name(job_type)
-                if job_obj:
-                    job_type_id = job_obj['id']
-
-            # Use ScanLogRepository's search functionality
-            results = self.scan_log_repo.search(
-                start_date=start_date,
-                end_date=end_date,
-                job_type_id=job_type_id,
-                barcode=barcode
-            )
+        # Get search filters
+        job_type = self.job_type_var.get()
+        filters = {
+            'barcode': self.barcode_var.get().strip() or None,
+            'job_id': None,
+            'start_date': self.start_date_var.get() or None,
+            'end_date': self.end_date_var.get() or None
+        }
+
+        self._run_in_background(
+            self._query_first_page, self._show_first_page,
+            "เกิดข้อผิดพลาดในการค้นหา",
+            job_type, filters, self._order_by, self._order_desc
+        )
+
+    def _query_first_page(self, job_type: str, filters: Dict[str, Any],
+                          order_by: str, descending: bool) -> tuple:
+        """(worker thread) นับจำนวนทั้งหมดและดึงหน้าแรก"""
+        # Convert job type name to ID if not "ทั้งหมด"
+        if job_type and job_type != "ทั้งหมด":
+            job_obj = self.job_type_repo.find_by_name(job_type)
+            if job_obj:
+                filters['job_id'] = job_obj['id']
+
+        total_count = self.scan_log_repo.count_history(**filters)
+        results = self._query_page(filters, 0, order_by, descending)
+        return filters, total_count, results
+
+    def _query_page(self, filters: Dict[str, Any], offset: int,
+                    order_by: str, descending: bool) -> list:
+        """(worker thread) ดึงผลการค้นหาหนึ่งหน้าจากฐานข้อมูล"""
+        return self.scan_log_repo.search_history_rows(
+            limit=self.page_size,
+            offset=offset,
+            order_by=order_by,
+            descending=descending,
+            **filters
+        )
+
+    def _show_first_page(self, result: tuple):
+        """แสดงหน้าแรกของผลการค้นหาใหม่"""
+        self._search_filters, self._total_count, results = result
+        self._show_page(results)
+
+    def _show_page(self, results: list):
+        """แทนที่ตารางด้วยหน้าแรก"""
+        self._offset = 0
+        self._advance_offset(results)
+        self.display_history(results)
 
-            self.display_history(results)
+    def _append_page(self, results: list):
+        """เพิ่มหน้าถัดไปต่อท้ายตาราง"""
+        self._advance_offset(results)
+        self.append_history(results)
 
+    def _advance_offset(self, results: list):
+        """เลื่อนตำแหน่งหน้าถัดไปตามจำนวนแถวที่ได้"""
+        self._offset += len(results)
+        if len(results) < self.page_size:
+            # ข้อมูลหมดแล้ว (อาจน้อยกว่าที่นับไว้ถ้ามีการลบระหว่างโหลด)
+            self._total_count = self._offset
+
+    def _load_next_page(self):
+        """โหลดหน้าถัดไปต่อท้ายตาราง"""
+        if self._pending_future is not None or self._offset >= self._total_count:
+            return
+        self._run_in_background(
+            self._query_page, self._append_page,
+            "เกิดข้อผิดพลาดในการโหลดข้อมูลเพิ่ม",
+            self._search_filters, self._offset, self._order_by, self._order_desc
+        )
+
+    def _on_tree_scroll(self, first: str, last: str):
+        """อัปเดต scrollbar และโหลดหน้าถัดไปเมื่อเลื่อนใกล้ท้ายตาราง"""
+        self.history_scrollbar.set(first, last)
+        if float(last) >= 0.95 and self._offset < self._total_count:
+            self._load_next_page()
+
+    def _run_in_background(self, func: Callable, on_done: Callable, error_message: str, *args):
+        """
+        รัน query ใน worker thread แล้วส่งผลกลับมาที่ Tk main thread
+
+        งานที่ค้างอยู่ก่อนหน้าจะถูกยกเลิก/ทิ้งผลลัพธ์ เพื่อไม่ให้ผลเก่าทับผลใหม่
+        """
+        if self._pending_future is not None:
+            self._pending_future.cancel()
+
+        future = self._executor.submit(func, *args)
+        self._pending_future = future
+        self.search_button.state(['disabled'])
+        self.frame.after(30, self._poll_result, future, on_done, error_message)
+
+    def _poll_result(self, future: Future, on_done: Callable, error_message: str):
+        """ตรวจผลของ worker เป็นระยะ (ทำงานบน Tk main thread)"""
+        if future is not self._pending_future:
+            return  # ถูกแทนที่ด้วยการค้นหาใหม่แล้ว
+        if not future.done():
+            self.frame.after(30, self._poll_result, future, on_done, error_message)
+            return
+
+        self._pending_future = None
+        self.search_button.state(['!disabled'])
+        try:
+            result = future.result()
         except Exception as e:
-            messagebox.showerror("ผิดพลาด", f"เกิดข้อผิดพลาดในการค้นหา: {str(e)}")
-    
+            messagebox.showerror("ผิดพลาด", f"{error_message}: {str(e)}")
+            return
+        on_done(result)
+
     def refresh_history(self):
         """รีเฟรชประวัติ"""
         self.search_history()
     
     def clear_filters(self):
         """ล้างตัวกรอง"""
-        self.start_date_var.set((datetime.now() - timedelta(days=7)).strftime("%Y-%m-%d"))
-        self.end_date_var.set(datetime.now().strftime("%Y-%m-%d"))
+        start_date, end_date = self._default_date_range()
+        self.start_date_var.set(start_date)
+        self.end_date_var.set(end_date)
         self.job_type_var.set("ทั้งหมด")
         self.barcode_var.set("")
         self.refresh_history()
     
+    @staticmethod
+    def _default_date_range() -> tuple:
+        """ช่วงวันที่เริ่มต้นของตัวกรอง (7 วันล่าสุด) อ่านวันที่ปัจจุบันครั้งเดียว"""
+        today = date.today()
+        return (today - timedelta(days=7)).isoformat(), today.isoformat()
+    
+    def cleanup(self):
+        """ยกเลิกงานที่ค้างอยู่และปิด worker thread"""
+        if self._pending_future is not None:
+            self._pending_future.cancel()
+            self._pending_future = None
+        self._executor.shutdown(wait=False)
+
     def display_history(self, results: list):
         """แสดงประวัติในตาราง"""
-        # ล้างข้อมูลเก่า
-        for item in self.history_tree.get_children():
-            self.history_tree.delete(item)
-        
-        for row in results:
-            scan_date = row['scan_date'].strftime("%Y-%m-%d %H:%M:%S") if row['scan_date'] else ""
-            sub_job_type = row['sub_job_type_name'] or ""
-            status = "สำเร็จ" if row['status'] == 'Active' else row['status']
-            notes = row['notes'] or ""
-            
-            self.history_tree.insert("", tk.END, values=(
-                row['id'], scan_date, row['barcode'], row['job_type_name'], 
-                sub_job_type, row['scanned_by'], status, notes
-            ))
-    
+        # ล้างข้อมูลเก่าในครั้งเดียว
+        children = self.history_tree.get_children()
+        if children:
+            self.history_tree.delete(*children)
+        self._row_data.clear()
+
+        self.append_history(results)
+
+    def append_history(self, results: list):
+        """เพิ่มแถวประวัติต่อท้ายตาราง"""
+        row_data = self._row_data
+        # isoformat ทำงานใน C โดยไม่ต้อง parse format string ทุกแถวแบบ strftime
+        isoformat = datetime.isoformat
+        rows = []
+        status = constants.STATUS_SUCCESS
+        # แถวเรียงตาม ScanLogRepository.HISTORY_ROW_COLUMNS
+        for record_id, scan_date, barcode, job_type, sub_job_name, user_id, notes in results:
+            iid = str(record_id)
+            # แถวอาจซ้ำข้ามหน้าได้ถ้ามีการสแกนใหม่ระหว่างโหลด
+            if iid in row_data:
+                continue
+            # ชื่องาน/ผู้ใช้ซ้ำกันเกือบทุกแถว - intern ให้ใช้ string ร่วมกัน
+            typed = HistoryRow(
+                record_id, scan_date, barcode, intern(job_type or ""),
+                intern(sub_job_name or ""), intern(str(user_id or "")),
+                status, notes or ""
+            )
+            row_data[iid] = typed
+            display_date = isoformat(scan_date, sep=' ', timespec='seconds') if scan_date else ""
+            rows.append((iid, typed._replace(scan_date=display_date)))
+
+        if not rows:
+            return
+
+        # ซ่อนตารางระหว่างเพิ่มข้อมูลเพื่อให้ Tk คำนวณ layout และวาดใหม่ครั้งเดียว
+        tree = self.history_tree
+        tree.pack_forget()
+        try:
+            insert = tree.insert
+            end = tk.END
+            for iid, values in rows:
+                insert("", end, iid=iid, values=values)
+        finally:
+            tree.pack(fill=tk.BOTH, expand=True, padx=5, pady=5, before=self.history_scrollbar)
+
+    def sort_column(self, col: str):
+        """เรียงข้อมูลตามคอลัมน์ที่ฐานข้อมูล (กดซ้ำเพื่อสลับทิศทาง)"""
+        order_by = self.SORT_KEYS.get(col)
+        if order_by is None:
+            return
+
+        if order_by == self._order_by:
+            self._order_desc = not self._order_desc
+        else:
+            self._order_by = order_by
+            self._order_desc = False
+
+        # โหลดหน้าแรกใหม่ด้วยตัวกรองเดิม (จำนวนทั้งหมดไม่เปลี่ยน)
+        self._run_in_background(
+            self._query_page, self._show_page,
+            "เกิดข้อผิดพลาดในการเรียงข้อมูล",
+            self._search_filters, 0, self._order_by, self._order_desc
+        )
+
     def show_context_menu(self, event):
         """แสดง context menu"""
         try:
@@ -194,15 +406,15 @@ class HistoryTab(BaseTab):
             messagebox.showwarning("คำเตือน", "กรุณาเลือกรายการที่ต้องการแก้ไข")
             return
         
-        # ดึงข้อมูลที่เลือก
-        item = self.history_tree.item(selected[0])
-        record_id = item['values'][0]
+        # ดึงข้อมูลที่เลือกจาก cache ของแถว (iid = scan_logs.id)
+        row = self._row_data[selected[0]]
         
         # สร้าง dialog สำหรับแก้ไข
-        self.show_edit_dialog(record_id, item['values'])
+        self.show_edit_dialog(row)
     
-    def show_edit_dialog(self, record_id: int, current_values: tuple):
+    def show_edit_dialog(self, row: HistoryRow):
         """แสดง dialog สำหรับแก้ไข"""
+        record_id = row.id
         dialog = tk.Toplevel(self.frame)
         dialog.title("แก้ไขรายการสแกน")
         dialog.geometry("400x300")
@@ -212,12 +424,12 @@ class HistoryTab(BaseTab):
         # สร้าง UI สำหรับ dialog
         ttk.Label(dialog, text="Barcode:").pack(pady=5)
         barcode_entry = ttk.Entry(dialog, width=40)
-        barcode_entry.insert(0, current_values[2])
+        barcode_entry.insert(0, row.barcode)
         barcode_entry.pack(pady=5)
         
         ttk.Label(dialog, text="หมายเหตุ:").pack(pady=5)
         notes_entry = ttk.Entry(dialog, width=40)
-        notes_entry.insert(0, current_values[7])
+        notes_entry.insert(0, row.notes)
         notes_entry.pack(pady=5)
         
         def save_changes():
@@ -242,6 +454,20 @@ class HistoryTab(BaseTab):
         ttk.Button(dialog, text="บันทึก", command=save_changes).pack(pady=10)
         ttk.Button(dialog, text="ยกเลิก", command=dialog.destroy).pack(pady=5)
     
+    def copy_barcode(self):
+        """คัดลอก Barcode ของรายการที่เลือกไปยัง clipboard"""
+        selected = self.history_tree.selection()
+        if not selected:
+            return
+        
+        barcode = self._row_data[selected[0]].barcode
+        self.frame.clipboard_clear()
+        self.frame.clipboard_append(barcode)
+        
+        # แจ้งผลผ่าน label แทน messagebox เพื่อไม่ให้การคัดลอกต้องรอปิด dialog
+        self.info_label.config(text=f"คัดลอกบาร์โค้ด {barcode} แล้ว")
+        self.frame.after(1500, lambda: self.info_label.config(text=""))
+    
     def delete_record(self):
         """ลบรายการ"""
         selected = self.history_tree.selection()
@@ -249,9 +475,9 @@ class HistoryTab(BaseTab):
             messagebox.showwarning("คำเตือน", "กรุณาเลือกรายการที่ต้องการลบ")
             return
         
-        item = self.history_tree.item(selected[0])
-        record_id = item['values'][0]
-        barcode = item['values'][2]
+        row = self._row_data[selected[0]]
+        record_id = row.id
+        barcode = row.barcode
         
         if messagebox.askyesno("ยืนยัน", f"คุณต้องการลบรายการ Barcode: {barcode} หรือไม่?"):
             try:
@@ -265,44 +491,56 @@ class HistoryTab(BaseTab):
                 messagebox.showerror("ผิดพลาด", f"ไม่สามารถลบรายการ: {str(e)}")
     
     def export_history(self):
-        """ส่งออกประวัติ"""
-        try:
-            # ดึงข้อมูลทั้งหมดที่แสดงอยู่
-            data = []
-            for item in self.history_tree.get_children():
-                values = self.history_tree.item(item)['values']
-                data.append({
-                    'ID': values[0],
-                    'วันที่สแกน': values[1],
-                    'Barcode': values[2],
-                    'Job Type': values[3],
-                    'Sub Job Type': values[4],
-                    'ผู้สแกน': values[5],
-                    'สถานะ': values[6],
-                    'หมายเหตุ': values[7]
-                })
-            
-            if not data:
-                messagebox.showwarning("คำเตือน", "ไม่มีข้อมูลให้ส่งออก")
-                return
-            
-            # เลือกตำแหน่งบันทึกไฟล์
-            file_path = filedialog.asksaveasfilename(
-                title="บันทึกไฟล์ Excel",
-                defaultextension=".xlsx",
-                filetypes=[("Excel files", "*.xlsx")]
+        """ส่งออกประวัติ (ทุกแถวที่ตรงกับการค้นหาปัจจุบัน ไม่ใช่เฉพาะหน้าที่โหลดแล้ว)"""
+        if not self._row_data:
+            messagebox.showwarning("คำเตือน", "ไม่มีข้อมูลให้ส่งออก")
+            return
+
+        # เลือกตำแหน่งบันทึกไฟล์
+        file_path = filedialog.asksaveasfilename(
+            title="บันทึกไฟล์ Excel",
+            defaultextension=".xlsx",
+            filetypes=[("Excel files", "*.xlsx")]
+        )
+
+        if file_path:
+            # ดึงข้อมูลทั้งหมดจากฐานข้อมูลและเขียนไฟล์ใน worker thread
+            self._run_in_background(
+                self._write_history_file, self._on_export_done,
+                "เกิดข้อผิดพลาดในการส่งออก",
+                file_path, tuple(self.history_tree['columns']),
+                dict(self._search_filters), self._order_by, self._order_desc
             )
-            
-            if file_path:
-                # Use pandas to export to Excel
-                import pandas as pd
-                df = pd.DataFrame(data)
-                df.to_excel(file_path, index=False, sheet_name="ประวัติการสแกน")
-                messagebox.showinfo("สำเร็จ", f"ส่งออกไฟล์เรียบร้อยแล้วที่: {file_path}")
-                    
-        except Exception as e:
-            messagebox.showerror("ผิดพลาด", f"เกิดข้อผิดพลาดในการส่งออก: {str(e)}")
-    
+
+    def _write_history_file(self, file_path: str, columns: tuple, filters: Dict[str, Any],
+                            order_by: str, descending: bool) -> str:
+        """(worker thread) เขียนทุกแถวที่ตรงกับตัวกรองลงไฟล์ Excel"""
+        # แถวเรียงตาม ScanLogRepository.HISTORY_ROW_COLUMNS - อ่านจาก cursor ทีละชุด
+        isoformat = datetime.isoformat
+        status = constants.STATUS_SUCCESS
+        records = (
+            (
+                record_id,
+                isoformat(scan_date, sep=' ', timespec='seconds') if scan_date else "",
+                barcode, job_type or "", sub_job_name or "", str(user_id or ""),
+                status, notes or ""
+            )
+            for record_id, scan_date, barcode, job_type, sub_job_name, user_id, notes
+            in self.scan_log_repo.iter_history_rows(
+                order_by=order_by, descending=descending, **filters
+            )
+        )
+
+        # Use pandas to export to Excel
+        import pandas as pd
+        df = pd.DataFrame.from_records(records, columns=columns)
+        df.to_excel(file_path, index=False, sheet_name="ประวัติการสแกน")
+        return file_path
+
+    def _on_export_done(self, file_path: str):
+        """แจ้งผลการส่งออก (Tk main thread)"""
+        messagebox.showinfo("สำเร็จ", f"ส่งออกไฟล์เรียบร้อยแล้วที่: {file_path}")
+
     def show_statistics(self):
         """แสดงสถิติ"""
         try:
@@ -310,7 +548,6 @@ class HistoryTab(BaseTab):
             scans = self.scan_log_repo.get_recent_scans(limit=10000, include_job_info=True)
 
             # Calculate statistics
-            from collections import Counter
             job_counts = Counter(scan['job_type_name'] for scan in scans)
 
             # Convert to results format
@@ -338,10 +575,10 @@ class HistoryTab(BaseTab):
             stats_tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
             
             # เพิ่มข้อมูลสถิติ
+            insert = stats_tree.insert
+            end = tk.END
             for row in results:
-                stats_tree.insert("", tk.END, values=(
-                    row['job_type'], row['job_count']
-                ))
+                insert("", end, values=(row['job_type'], row['job_count']))
             
             ttk.Button(dialog, text="ปิด", command=dialog.destroy).pack(pady=10)
             
@@ -8,7 +8,6 @@ UI component for data import
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from typing import Dict, Any, Callable, List, Optional
-import pandas as pd
 from ..tabs.base_tab import BaseTab
 
 
@@ -96,7 +95,8 @@ class ImportTab(BaseTab):
     def load_file(self, file_path: str):
         """โหลดไฟล์"""
         try:
-            # Read Excel or CSV file using pandas
+            # Read Excel or CSV file using pandas (imported on first use - keeps app startup fast)
+            import pandas as pd
             if file_path.endswith('.csv'):
                 self.import_data = pd.read_csv(file_path)
             else:
@@ -113,12 +113,15 @@ class ImportTab(BaseTab):
     def display_preview(self):
         """แสดงตัวอย่างข้อมูล"""
         # ล้างข้อมูลเก่า
-        for item in self.preview_tree.get_children():
-            self.preview_tree.delete(item)
+        children = self.preview_tree.get_children()
+        if children:
+            self.preview_tree.delete(*children)
         
         if self.import_data is None or self.import_data.empty:
             return
         
+        import pandas as pd
+
         # แสดงข้อมูล 20 แถวแรก
         preview_data = self.import_data.head(20)
         
@@ -146,6 +149,7 @@ class ImportTab(BaseTab):
                 template_info = self.import_service.generate_template_data()
 
                 # Create DataFrame with sample data
+                import pandas as pd
                 df = pd.DataFrame(template_info['sample_data'], columns=template_info['columns'])
 
                 # Save to Excel
@@ -193,10 +197,9 @@ class ImportTab(BaseTab):
     
     def update_preview_status(self, status: str):
         """อัปเดตสถานะใน preview"""
+        # แก้เฉพาะคอลัมน์สถานะ - ไม่ต้องอ่าน values ทั้งแถวกลับจาก Tk แล้วเขียนใหม่
         for item in self.preview_tree.get_children():
-            values = list(self.preview_tree.item(item)['values'])
-            values[-1] = status
-            self.preview_tree.item(item, values=values)
+            self.preview_tree.set(item, "สถานะ", status)
     
     def import_data_to_db(self):
         """นำเข้าข้อมูลลงฐานข้อมูล"""
@@ -237,5 +240,6 @@ class ImportTab(BaseTab):
             self.file_label.config(text="ยังไม่ได้เลือกไฟล์")
             
             # ล้าง preview
-            for item in self.preview_tree.get_children():
-                self.preview_tree.delete(item) 
\ No newline at end of file
+            children = self.preview_tree.get_children()
+            if children:
+                self.preview_tree.delete(*children)
\ No newline at end of file
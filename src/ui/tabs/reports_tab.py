@@ -5,17 +5,35 @@ Reports Tab Component
 UI component for generating and exporting reports
 """
 
+import traceback
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-from typing import Dict, Any, Callable, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Any, Callable, Iterable, Iterator, List, Optional
 from datetime import datetime, date
-import pandas as pd
 from ..tabs.base_tab import BaseTab
 
+# xlsxwriter is optional - faster writer with cheap column widths, falls back to openpyxl
+try:
+    import xlsxwriter
+except ImportError:
+    xlsxwriter = None
+from ... import constants
+
 
 class ReportsTab(BaseTab):
     """แท็บรายงาน"""
 
+    # Report columns in display/export order -> Thai headings
+    REPORT_COLUMN_NAMES = {
+        'barcode': 'บาร์โค้ด',
+        'scan_date': 'วันที่/เวลา',
+        'job_type_name': 'งานหลัก',
+        'sub_job_type_name': 'งานรอง',
+        'user_id': 'ผู้ใช้',
+        'notes': 'หมายเหตุ'
+    }
+
     def __init__(
         self,
         parent: tk.Widget,
@@ -27,8 +45,24 @@ class ReportsTab(BaseTab):
         self.on_report_generated = on_report_generated
         self.current_report_data = []
         self.current_report_summary = {}
+        # Virtualized table: only the visible window of _view_rows lives in the Treeview
+        self._view_rows = []
+        self._view_top = 0
+        # Paging state: rows are fetched _page_size at a time as the table is scrolled
+        self._page_size = constants.REPORT_PAGE_SIZE
+        self._current_offset = 0
+        self._report_total = 0
+        self._report_filters = None
+        # Queries and Excel writing run on a worker thread so the Tk loop stays responsive
+        self._executor = ThreadPoolExecutor(max_workers=2)
+        self._pending_future: Optional[Future] = None
         self.report_job_types_data = {}
         self.report_sub_job_types_data = {}
+        # main job id (None = all) -> (combobox values, label -> sub job id)
+        self._sub_job_cache: Dict[Optional[int], tuple] = {}
+        # Last values pushed to the comboboxes - Tk is only touched when these change
+        self._job_type_values: tuple = ()
+        self._last_sub_refresh: Optional[tuple] = None
         super().__init__(parent, db_manager, repositories, services)
         self.refresh_job_types()
 
@@ -88,12 +122,19 @@ class ReportsTab(BaseTab):
         self.report_note_filter_var = tk.StringVar()
         note_filter_entry = ttk.Entry(note_filter_frame, textvariable=self.report_note_filter_var, width=40)
         note_filter_entry.pack(side=tk.LEFT, padx=10)
+        ttk.Label(
+            note_filter_frame,
+            text="(ค้นหาข้อความที่อยู่ในหมายเหตุ - ลงท้ายด้วย * เพื่อค้นหาคำที่ขึ้นต้นด้วยข้อความนี้)",
+            foreground="gray"
+        ).pack(side=tk.LEFT)
 
         # Run buttons
         button_frame = ttk.Frame(filter_frame)
         button_frame.pack(fill=tk.X, pady=10)
-        ttk.Button(button_frame, text="ดูรายงาน", command=self.run_report).pack(side=tk.LEFT, padx=5)
-        ttk.Button(button_frame, text="ส่งออก Excel", command=self.export_report).pack(side=tk.LEFT, padx=5)
+        self.run_button = ttk.Button(button_frame, text="ดูรายงาน", command=self.run_report)
+        self.run_button.pack(side=tk.LEFT, padx=5)
+        self.export_button = ttk.Button(button_frame, text="ส่งออก Excel", command=self.export_report)
+        self.export_button.pack(side=tk.LEFT, padx=5)
         ttk.Button(button_frame, text="ล้างข้อมูล", command=self.clear_report).pack(side=tk.LEFT, padx=5)
 
         # Results table
@@ -107,10 +148,16 @@ class ReportsTab(BaseTab):
         # Dynamic treeview (columns will be set when data loads)
         self.report_tree = ttk.Treeview(table_frame, show='headings', height=20)
 
-        # Scrollbars
-        v_scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self.report_tree.yview)
+        # Scrollbars - the vertical one drives the virtual window instead of the tree's own yview
+        v_scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self._on_report_vscroll)
         h_scrollbar = ttk.Scrollbar(table_frame, orient=tk.HORIZONTAL, command=self.report_tree.xview)
-        self.report_tree.configure(yscrollcommand=v_scrollbar.set, xscrollcommand=h_scrollbar.set)
+        self.report_tree.configure(xscrollcommand=h_scrollbar.set)
+        self.report_v_scrollbar = v_scrollbar
+
+        # Mouse wheel scrolls the virtual window (Windows/macOS and X11 events)
+        self.report_tree.bind("<MouseWheel>", self._on_report_mousewheel)
+        self.report_tree.bind("<Button-4>", lambda e: self._scroll_report(-3))
+        self.report_tree.bind("<Button-5>", lambda e: self._scroll_report(3))
 
         # Pack
         self.report_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
@@ -119,12 +166,16 @@ class ReportsTab(BaseTab):
 
     def refresh_job_types(self):
         """Refresh job types for report selection"""
+        # Called when master data changes - cached sub job lists may be stale
+        self.invalidate_report_caches()
         try:
             # Use JobTypeRepository to get all job types
             results = self.job_type_repo.get_all_job_types()
 
-            job_types = ["ทั้งหมด"] + [f"{row['id']} - {row['name']}" for row in results]
-            self.report_job_type_combo['values'] = job_types
+            job_types = ("ทั้งหมด",) + tuple(f"{row['id']} - {row['name']}" for row in results)
+            if job_types != self._job_type_values:
+                self.report_job_type_combo['values'] = job_types
+                self._job_type_values = job_types
 
             # Store job types data for easier access
             self.report_job_types_data = {f"{row['id']} - {row['name']}": row['id'] for row in results}
@@ -133,43 +184,59 @@ class ReportsTab(BaseTab):
         except Exception as e:
             messagebox.showerror("ข้อผิดพลาด", f"ไม่สามารถโหลดรายการงานหลักได้: {str(e)}")
 
-    def on_job_type_change(self, event=None):
-        """Handle job type change in report"""
-        selected_job_type = self.report_job_type_var.get()
-        job_type_id = self.report_job_types_data.get(selected_job_type)
-
-        # Clear sub job type selection
-        self.report_sub_job_type_var.set("")
-        self.report_sub_job_type_combo['values'] = []
-
-        if job_type_id:
-            try:
+    def invalidate_report_caches(self):
+        """Forget cached sub job lists (call after job types or sub jobs change)"""
+        self._sub_job_cache.clear()
+        self._last_sub_refresh = None
+
+    def _load_sub_job_choices(self, job_type_id: Optional[int]) -> tuple:
+        """
+        Get (combobox values, label -> id) for a main job's sub jobs, or all
+        active sub jobs when job_type_id is None. Results are cached per job.
+        """
+        cached = self._sub_job_cache.get(job_type_id)
+        if cached is None:
+            if job_type_id:
                 # Use SubJobRepository to get sub jobs for selected job type
                 results = self.sub_job_repo.get_by_main_job(job_type_id, active_only=True)
-
-                sub_job_types = ["ทั้งหมด"] + [f"{row['id']} - {row['name']}" for row in results]
-                self.report_sub_job_type_combo['values'] = sub_job_types
-
-                # Store sub job types data
-                self.report_sub_job_types_data = {f"{row['id']} - {row['name']}": row['id'] for row in results}
-                self.report_sub_job_types_data["ทั้งหมด"] = None
-
-            except Exception as e:
-                messagebox.showerror("ข้อผิดพลาด", f"ไม่สามารถโหลดรายการงานรองได้: {str(e)}")
-        else:
-            # If "ทั้งหมด" is selected, load all sub job types
-            try:
+            else:
                 # Use SubJobRepository to get all active sub jobs
                 results = self.sub_job_repo.get_all_active()
 
-                sub_job_types = ["ทั้งหมด"] + [f"{row['id']} - {row['name']}" for row in results]
-                self.report_sub_job_type_combo['values'] = sub_job_types
+            sub_job_types_data = {f"{row['id']} - {row['name']}": row['id'] for row in results}
+            values = ["ทั้งหมด"] + list(sub_job_types_data)
+            sub_job_types_data["ทั้งหมด"] = None
+            cached = (values, sub_job_types_data)
+            self._sub_job_cache[job_type_id] = cached
+        return cached
 
-                self.report_sub_job_types_data = {f"{row['id']} - {row['name']}": row['id'] for row in results}
-                self.report_sub_job_types_data["ทั้งหมด"] = None
+    def on_job_type_change(self, event=None):
+        """Handle job type change in report"""
+        selected_job_type = self.report_job_type_var.get()
+        job_type_id = self.report_job_types_data.get(selected_job_type)
 
-            except Exception as e:
+        try:
+            values, sub_job_types_data = self._load_sub_job_choices(job_type_id)
+        except Exception as e:
+            self._last_sub_refresh = None
+            self.report_sub_job_type_var.set("")
+            self.report_sub_job_type_combo['values'] = []
+            if job_type_id:
+                messagebox.showerror("ข้อผิดพลาด", f"ไม่สามารถโหลดรายการงานรองได้: {str(e)}")
+            else:
                 self.report_sub_job_types_data = {"ทั้งหมด": None}
+            return
+
+        # Same main job re-selected with the same sub jobs - keep the current choice
+        refresh_key = (job_type_id, values)
+        if refresh_key == self._last_sub_refresh:
+            return
+        self._last_sub_refresh = refresh_key
+
+        # Clear sub job type selection
+        self.report_sub_job_type_var.set("")
+        self.report_sub_job_type_combo['values'] = values
+        self.report_sub_job_types_data = sub_job_types_data
 
     def run_report(self):
         """Generate report using ReportService"""
@@ -188,78 +255,119 @@ class ReportsTab(BaseTab):
             messagebox.showwarning("คำเตือน", "กรุณาเลือกงานหลัก")
             return
 
-        try:
-            # Get actual IDs
-            job_type_id = self.report_job_types_data.get(selected_job_type)
-            if job_type_id is None and selected_job_type != "ทั้งหมด":
-                messagebox.showerror("ข้อผิดพลาด", "ไม่พบงานหลักที่เลือก")
-                return
-
-            sub_job_type_id = None
-            if selected_sub_job_type and hasattr(self, 'report_sub_job_types_data'):
-                sub_job_type_id = self.report_sub_job_types_data.get(selected_sub_job_type)
-
-            # Use ReportService to generate report (handles all business logic and SQL)
-            result = self.report_service.generate_report(
-                report_date=report_date,
-                job_id=job_type_id,
-                sub_job_id=sub_job_type_id,
-                notes_filter=note_filter if note_filter else None
-            )
+        # Get actual IDs
+        job_type_id = self.report_job_types_data.get(selected_job_type)
+        if job_type_id is None and selected_job_type != "ทั้งหมด":
+            messagebox.showerror("ข้อผิดพลาด", "ไม่พบงานหลักที่เลือก")
+            return
 
-            # Handle the result
-            if not result['success']:
-                messagebox.showerror("ข้อผิดพลาด", result['message'])
-                self.clear_table()
-                return
-
-            # Get report data from result
-            report_data = result['data']
-            results = report_data['scans']
-            statistics = report_data['statistics']
-
-            # Store data for export
-            self.current_report_data = results
-            self.current_report_summary = {
-                'report_date': report_date,
-                'job_type_name': selected_job_type,
-                'sub_job_type_name': selected_sub_job_type or 'ทั้งหมด',
-                'note_filter': note_filter if note_filter else None,
-                'total_count': statistics['total_scans'],
-                'unique_barcodes': statistics['unique_barcodes'],
-                'generated_at': datetime.now().isoformat()
-            }
-
-            if not results:
-                messagebox.showinfo("ผลลัพธ์", "ไม่พบข้อมูลในวันที่ที่เลือก")
-                self.clear_table()
-                return
-
-            # Display results
-            self.display_report(results)
-
-            messagebox.showinfo(
-                "สำเร็จ",
-                f"รันรายงานสำเร็จ พบข้อมูล {statistics['total_scans']} รายการ "
-                f"(บาร์โค้ดที่ไม่ซ้ำ: {statistics['unique_barcodes']})"
-            )
+        sub_job_type_id = None
+        if selected_sub_job_type and hasattr(self, 'report_sub_job_types_data'):
+            sub_job_type_id = self.report_sub_job_types_data.get(selected_sub_job_type)
+
+        # Use ReportService to count the report and fetch its first page (on the worker)
+        filters = (report_date, job_type_id, sub_job_type_id, note_filter or None)
+        labels = (selected_job_type, selected_sub_job_type)
+        self._run_in_background(
+            self._query_report, self._on_report_done, "ไม่สามารถรันรายงานได้",
+            filters, labels
+        )
 
-            # Call callback
-            if self.on_report_generated:
-                self.on_report_generated()
+    def _query_report(self, filters: tuple, labels: tuple) -> tuple:
+        """Worker: generate the first report page"""
+        result = self.report_service.generate_report_page(*filters, limit=self._page_size)
+        return result, filters, labels
 
+    def _on_report_done(self, outcome: tuple):
+        """Main thread: show the first report page"""
+        result, filters, (selected_job_type, selected_sub_job_type) = outcome
+        report_date, _, _, note_filter = filters
+
+        # Handle the result
+        if not result['success']:
+            messagebox.showerror("ข้อผิดพลาด", result['message'])
+            self.clear_table()
+            return
+
+        # Get report data from result
+        report_data = result['data']
+        results = report_data['scans']
+        statistics = report_data['statistics']
+
+        # Store data for export; later pages are appended as the table scrolls
+        self._report_filters = filters
+        self.current_report_data = self._to_display_rows(results)
+        self._current_offset = len(results)
+        self._report_total = statistics['total_scans']
+        self.current_report_summary = {
+            'report_date': report_date,
+            'job_type_name': selected_job_type,
+            'sub_job_type_name': selected_sub_job_type or 'ทั้งหมด',
+            'note_filter': note_filter,
+            'total_count': statistics['total_scans'],
+            'unique_barcodes': statistics['unique_barcodes'],
+            'generated_at': datetime.now().isoformat()
+        }
+
+        if not results:
+            messagebox.showinfo("ผลลัพธ์", "ไม่พบข้อมูลในวันที่ที่เลือก")
+            self.clear_table()
+            return
+
+        # Display results
+        self.display_report(self.current_report_data)
+
+        messagebox.showinfo(
+            "สำเร็จ",
+            f"รันรายงานสำเร็จ พบข้อมูล {statistics['total_scans']} รายการ "
+            f"(บาร์โค้ดที่ไม่ซ้ำ: {statistics['unique_barcodes']})"
+        )
+
+        # Call callback
+        if self.on_report_generated:
+            self.on_report_generated()
+
+    def _run_in_background(self, func: Callable, on_done: Callable, error_message: str, *args):
+        """
+        Run func(*args) on the worker thread and pass its result to on_done on the Tk thread
+
+        A newer request replaces the pending one; the stale result is dropped.
+        """
+        if self._pending_future is not None:
+            self._pending_future.cancel()
+
+        future = self._executor.submit(func, *args)
+        self._pending_future = future
+        self.run_button.state(['disabled'])
+        self.export_button.state(['disabled'])
+        self.frame.after(30, self._poll_result, future, on_done, error_message)
+
+    def _poll_result(self, future: Future, on_done: Callable, error_message: str):
+        """Check the worker periodically (runs on the Tk main thread)"""
+        if future is not self._pending_future:
+            return  # Superseded by a newer request
+        if not future.done():
+            self.frame.after(30, self._poll_result, future, on_done, error_message)
+            return
+
+        self._pending_future = None
+        self.run_button.state(['!disabled'])
+        self.export_button.state(['!disabled'])
+        try:
+            result = future.result()
         except Exception as e:
-            import traceback
-            traceback.print_exc()
-            messagebox.showerror("ข้อผิดพลาด", f"ไม่สามารถรันรายงานได้: {str(e)}")
+            traceback.print_exception(type(e), e, e.__traceback__)
+            messagebox.showerror("ข้อผิดพลาด", f"{error_message}: {str(e)}")
+            return
+        on_done(result)
 
-    def display_report(self, results: list):
-        """Display report results in table"""
+    def display_report(self, results: List[tuple]):
+        """Display report rows (tuples from _to_display_rows) in table"""
         # Clear existing data
         self.clear_table()
 
         # Setup columns
-        columns = ['barcode', 'scan_date', 'job_type_name', 'sub_job_type_name', 'user_id', 'notes']
+        columns = list(self.REPORT_COLUMN_NAMES)
         self.report_tree['columns'] = columns
         self.report_tree['show'] = 'headings'
 
@@ -273,35 +381,110 @@ class ReportsTab(BaseTab):
             'notes': 200
         }
 
-        column_names = {
-            'barcode': 'บาร์โค้ด',
-            'scan_date': 'วันที่/เวลา',
-            'job_type_name': 'งานหลัก',
-            'sub_job_type_name': 'งานรอง',
-            'user_id': 'ผู้ใช้',
-            'notes': 'หมายเหตุ'
-        }
-
         for col in columns:
-            self.report_tree.heading(col, text=column_names.get(col, col))
+            self.report_tree.heading(col, text=self.REPORT_COLUMN_NAMES[col])
             self.report_tree.column(col, width=column_widths.get(col, 120))
 
-        # Populate data
-        for row in results:
-            values = []
-            for col in columns:
-                value = row.get(col, "")
-                if col == 'scan_date' and value:
-                    # Format datetime
-                    if isinstance(value, datetime):
-                        value = value.strftime("%Y-%m-%d %H:%M:%S")
-                values.append(str(value) if value is not None else "")
-            self.report_tree.insert('', tk.END, values=values)
+        self._view_rows = results
+        self._render_report_window(0)
+
+    @classmethod
+    def _to_display_rows(cls, rows: list) -> List[tuple]:
+        """
+        Convert fetched report rows to display tuples in REPORT_COLUMN_NAMES order
+
+        Done once per page, so scrolling inserts ready-made tuples instead of
+        looking up and formatting every cell again.
+        """
+        columns = list(cls.REPORT_COLUMN_NAMES)
+        format_cell = cls._format_cell
+        return [tuple(format_cell(row.get(col)) for col in columns) for row in rows]
+
+    def _report_window_size(self) -> int:
+        """Number of rows the Treeview shows at once"""
+        return int(self.report_tree['height'])
+
+    def _render_report_window(self, top: int):
+        """Show rows [top, top + window) of the report and sync the scrollbar"""
+        window = self._report_window_size()
+        if top + window >= len(self._view_rows) and self._view_rows is self.current_report_data:
+            self._load_next_page()
+        total = len(self._view_rows)
+        top = max(0, min(top, total - window))
+        self._view_top = top
+
+        tree = self.report_tree
+        children = tree.get_children()
+        if children:
+            tree.delete(*children)
+
+        insert = tree.insert
+        end = tk.END
+        for values in self._view_rows[top:top + window]:
+            insert('', end, values=values)
+
+        if total:
+            self.report_v_scrollbar.set(top / total, min(top + window, total) / total)
+        else:
+            self.report_v_scrollbar.set(0, 1)
+
+    def _load_next_page(self):
+        """Fetch the next page of report rows on the worker if the report has more"""
+        if (self._pending_future is not None or not self._report_filters
+                or self._current_offset >= self._report_total):
+            return
+        self._run_in_background(
+            self.report_service.get_report_page, self._append_report_page,
+            "ไม่สามารถโหลดข้อมูลรายงานเพิ่มได้",
+            *self._report_filters, self._current_offset, self._page_size
+        )
+
+    def _append_report_page(self, rows: list):
+        """Main thread: append a fetched page and refresh the visible window"""
+        if not rows:
+            # Report shrank since it was counted - stop paging
+            self._report_total = self._current_offset
+            return
+        self.current_report_data.extend(self._to_display_rows(rows))
+        self._current_offset += len(rows)
+        self._render_report_window(self._view_top)
+
+    def _on_report_vscroll(self, *args):
+        """Scrollbar command: translate moveto/scroll requests into a window position"""
+        if not args:
+            return
+        if args[0] == 'moveto':
+            self._render_report_window(int(float(args[1]) * len(self._view_rows)))
+        elif args[0] == 'scroll':
+            step = int(args[1])
+            if len(args) > 2 and args[2] == 'pages':
+                step *= self._report_window_size()
+            self._scroll_report(step)
+
+    def _on_report_mousewheel(self, event):
+        """Mouse wheel handler for Windows/macOS"""
+        self._scroll_report(-3 if event.delta > 0 else 3)
+        return "break"
+
+    def _scroll_report(self, rows: int):
+        """Move the virtual window by a number of rows"""
+        if self._view_rows:
+            self._render_report_window(self._view_top + rows)
+        return "break"
+
+    @staticmethod
+    def _format_cell(value: Any) -> str:
+        """Format a single report value for display (scan_date is already text from SQL)"""
+        return "" if value is None else str(value)
 
     def clear_table(self):
         """Clear all items from the report table"""
-        for item in self.report_tree.get_children():
-            self.report_tree.delete(item)
+        children = self.report_tree.get_children()
+        if children:
+            self.report_tree.delete(*children)
+        self._view_rows = []
+        self._view_top = 0
+        self.report_v_scrollbar.set(0, 1)
 
     def clear_report(self):
         """Clear report data and filters"""
@@ -309,91 +492,139 @@ class ReportsTab(BaseTab):
             self.clear_table()
             self.current_report_data = []
             self.current_report_summary = {}
+            self._report_filters = None
+            self._current_offset = 0
+            self._report_total = 0
+            self.report_service.clear_report_cache()
             self.report_date_var.set(date.today().strftime("%Y-%m-%d"))
             self.report_job_type_var.set("")
             self.report_sub_job_type_var.set("")
             self.report_note_filter_var.set("")
 
+    def cleanup(self):
+        """Cancel the pending job and shut down the worker thread"""
+        if self._pending_future is not None:
+            self._pending_future.cancel()
+            self._pending_future = None
+        self._executor.shutdown(wait=False)
+
+    @staticmethod
+    def _measured(rows: Iterable[tuple], widths: list) -> Iterator[tuple]:
+        """Yield rows unchanged while widening widths to fit each value"""
+        for row in rows:
+            for i, value in enumerate(row):
+                width = len(str(value))
+                if width > widths[i]:
+                    widths[i] = width
+            yield row
+
+    @classmethod
+    def _write_workbook(cls, filename: str, sheets: list):
+        """
+        Write (sheet_name, headers, rows) sheets straight to an .xlsx file
+
+        Rows are written one at a time from any iterable and column widths are
+        tracked in the same pass, so no intermediate table is ever built.
+        """
+        if xlsxwriter is not None:
+            # constant_memory flushes each row to disk once the next one starts
+            workbook = xlsxwriter.Workbook(filename, {'constant_memory': True})
+            try:
+                for sheet_name, headers, rows in sheets:
+                    worksheet = workbook.add_worksheet(sheet_name)
+                    widths = [len(str(header)) for header in headers]
+                    worksheet.write_row(0, 0, headers)
+                    for row_num, row in enumerate(cls._measured(rows, widths), start=1):
+                        worksheet.write_row(row_num, 0, row)
+                    for i, width in enumerate(widths):
+                        worksheet.set_column(i, i, min(width, 48) + 2)
+            finally:
+                workbook.close()
+            return
+
+        # openpyxl is only needed for this fallback - imported on first use
+        from openpyxl import Workbook
+        from openpyxl.utils import get_column_letter
+
+        workbook = Workbook()
+        workbook.remove(workbook.active)
+        for sheet_name, headers, rows in sheets:
+            worksheet = workbook.create_sheet(sheet_name)
+            widths = [len(str(header)) for header in headers]
+            worksheet.append(list(headers))
+            for row in cls._measured(rows, widths):
+                worksheet.append(list(row))
+            for i, width in enumerate(widths):
+                worksheet.column_dimensions[get_column_letter(i + 1)].width = min(width, 48) + 2
+        workbook.save(filename)
+
     def export_report(self):
         """Export current report data to Excel with summary"""
         if not self.current_report_data:
             messagebox.showwarning("คำเตือน", "ไม่มีข้อมูลสำหรับส่งออก กรุณารันรายงานก่อน")
             return
 
-        try:
-            # Create filename with current date
-            today = date.today().strftime("%Y%m%d")
-            default_filename = f"รายงาน_{today}.xlsx"
-
-            # Ask user for save location
-            filename = filedialog.asksaveasfilename(
-                defaultextension=".xlsx",
-                filetypes=[("Excel files", "*.xlsx")],
-                initialfile=default_filename
+        # Create filename with current date
+        today = date.today().strftime("%Y%m%d")
+        default_filename = f"รายงาน_{today}.xlsx"
+
+        # Ask user for save location
+        filename = filedialog.asksaveasfilename(
+            defaultextension=".xlsx",
+            filetypes=[("Excel files", "*.xlsx")],
+            initialfile=default_filename
+        )
+
+        if filename:
+            # Streaming the report and writing the workbook happen on the worker
+            self._run_in_background(
+                self._write_report_file, self._on_export_done, "ไม่สามารถส่งออกไฟล์ได้",
+                filename, dict(self.current_report_summary), self._report_filters
             )
 
-            if filename:
-                # Create Excel workbook with multiple sheets
-                with pd.ExcelWriter(filename, engine='openpyxl') as writer:
-
-                    # Summary sheet
-                    if self.current_report_summary:
-                        summary_data = {
-                            'รายการ': [
-                                'วันที่รายงาน',
-                                'งานหลัก',
-                                'งานรอง',
-                                'กรองหมายเหตุ',
-                                'จำนวนรวม',
-                                'บาร์โค้ดไม่ซ้ำ',
-                                'วันที่สร้างรายงาน'
-                            ],
-                            'ค่า': [
-                                self.current_report_summary.get('report_date', ''),
-                                self.current_report_summary.get('job_type_name', ''),
-                                self.current_report_summary.get('sub_job_type_name', ''),
-                                self.current_report_summary.get('note_filter', 'ไม่มี') or 'ไม่มี',
-                                self.current_report_summary.get('total_count', 0),
-                                self.current_report_summary.get('unique_barcodes', 0),
-                                datetime.fromisoformat(
-                                    self.current_report_summary.get('generated_at', '')
-                                ).strftime('%Y-%m-%d %H:%M:%S') if self.current_report_summary.get('generated_at') else ''
-                            ]
-                        }
-                        summary_df = pd.DataFrame(summary_data)
-                        summary_df.to_excel(writer, sheet_name='สรุป', index=False)
-
-                    # Detail data sheet
-                    df = pd.DataFrame(self.current_report_data)
-                    if not df.empty:
-                        # Rename columns to Thai
-                        column_mapping = {
-                            'barcode': 'บาร์โค้ด',
-                            'scan_date': 'วันที่/เวลา',
-                            'job_type_name': 'งานหลัก',
-                            'sub_job_type_name': 'งานรอง',
-                            'user_id': 'ผู้ใช้',
-                            'notes': 'หมายเหตุ'
-                        }
-
-                        # Rename only existing columns
-                        df_columns = {col: column_mapping.get(col, col) for col in df.columns if col in column_mapping}
-                        df = df.rename(columns=df_columns)
-
-                        # Format datetime columns
-                        for col in df.columns:
-                            if df[col].dtype == 'datetime64[ns]' or 'date' in col.lower():
-                                df[col] = pd.to_datetime(df[col], errors='ignore').dt.strftime('%Y-%m-%d %H:%M:%S')
-
-                        df.to_excel(writer, sheet_name='รายละเอียด', index=False)
-
-                messagebox.showinfo(
-                    "สำเร็จ",
-                    f"ส่งออกไฟล์สำเร็จ\n{filename}\n\n"
-                    f"ประกอบด้วย:\n- แผ่นสรุป: ข้อมูลสรุปรายงาน\n- แผ่นรายละเอียด: ข้อมูลทั้งหมด"
-                )
+    def _write_report_file(
+        self,
+        filename: str,
+        summary: Dict[str, Any],
+        filters: tuple
+    ) -> str:
+        """Worker: write the report workbook, streaming every row from the database"""
+
+        sheets = []
+
+        # Summary sheet
+        if summary:
+            summary_rows = [
+                ('วันที่รายงาน', summary.get('report_date', '')),
+                ('งานหลัก', summary.get('job_type_name', '')),
+                ('งานรอง', summary.get('sub_job_type_name', '')),
+                ('กรองหมายเหตุ', summary.get('note_filter', 'ไม่มี') or 'ไม่มี'),
+                ('จำนวนรวม', summary.get('total_count', 0)),
+                ('บาร์โค้ดไม่ซ้ำ', summary.get('unique_barcodes', 0)),
+                ('วันที่สร้างรายงาน', datetime.fromisoformat(
+                    summary.get('generated_at', '')
+                ).strftime('%Y-%m-%d %H:%M:%S') if summary.get('generated_at') else '')
+            ]
+            sheets.append(('สรุป', ('รายการ', 'ค่า'), summary_rows))
+
+        # Detail data sheet - positional rows straight from the cursor, no per-row dicts
+        positions = [
+            self.report_service.REPORT_ROW_COLUMNS.index(column)
+            for column in self.REPORT_COLUMN_NAMES
+        ]
+        detail_rows = (
+            tuple('' if row[i] is None else row[i] for i in positions)
+            for row in self.report_service.iter_report_rows(*filters)
+        )
+        sheets.append(('รายละเอียด', tuple(self.REPORT_COLUMN_NAMES.values()), detail_rows))
 
-        except Exception as e:
-            import traceback
-            traceback.print_exc()
-            messagebox.showerror("ข้อผิดพลาด", f"ไม่สามารถส่งออกไฟล์ได้: {str(e)}")
+        self._write_workbook(filename, sheets)
+        return filename
+
+    def _on_export_done(self, filename: str):
+        """Main thread: report success"""
+        messagebox.showinfo(
+            "สำเร็จ",
+            f"ส่งออกไฟล์สำเร็จ\n{filename}\n\n"
+            f"ประกอบด้วย:\n- แผ่นสรุป: ข้อมูลสรุปรายงาน\n- แผ่นรายละเอียด: ข้อมูลทั้งหมด"
+        )
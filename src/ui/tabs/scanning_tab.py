@@ -6,8 +6,9 @@ UI component for barcode scanning
 """
 
 import tkinter as tk
+from concurrent.futures import Future, ThreadPoolExecutor
 from tkinter import ttk, messagebox
-from typing import Dict, Any, Callable, Optional
+from typing import Dict, Any, Callable, List, Optional
 from datetime import datetime
 from ..tabs.base_tab import BaseTab
 from ... import constants
@@ -25,6 +26,14 @@ class ScanningTab(BaseTab):
         on_scan_completed: Optional[Callable] = None
     ):
         self.on_scan_completed = on_scan_completed
+        # ชื่อ -> id สร้างครั้งเดียวตอนโหลดรายการ (ไม่ต้อง query ทุกครั้งที่เปลี่ยน/สแกน)
+        self._job_id_by_name: Dict[str, int] = {}
+        self._sub_id_by_name: Dict[str, int] = {}
+        # timer ที่จะล้างข้อความสแกนสำเร็จล่าสุด
+        self._last_scan_clear_job = None
+        # บันทึกการสแกนและโหลดประวัติใน worker thread เพื่อไม่ให้ UI ค้าง
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._history_future: Optional[Future] = None
         super().__init__(parent, db_manager, repositories, services)
         self.refresh_job_types()
 
@@ -68,6 +77,10 @@ class ScanningTab(BaseTab):
         scan_button = ttk.Button(scan_frame, text=constants.BUTTON_SCAN, command=self.process_barcode)
         scan_button.grid(row=2, column=2, padx=5, pady=5)
 
+        # แจ้งผลสแกนสำเร็จแบบไม่ต้องกดปิด (ไม่บล็อกการสแกนต่อเนื่อง)
+        self.last_scan_label = ttk.Label(scan_frame, text="", font=constants.FONT_REGULAR)
+        self.last_scan_label.grid(row=3, column=1, sticky=tk.W, padx=5, pady=(0, 5))
+
         # Frame สำหรับประวัติการสแกน
         history_frame = ttk.LabelFrame(main_frame, text=constants.SECTION_SCAN_HISTORY)
         history_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 20))
@@ -103,7 +116,8 @@ class ScanningTab(BaseTab):
             # Use JobTypeRepository instead of direct SQL
             results = self.job_type_repo.get_all_job_types()
 
-            job_types = [row['name'] for row in results]
+            self._job_id_by_name = {row['job_name']: row['id'] for row in results}
+            job_types = list(self._job_id_by_name)
             self.job_type_combo['values'] = job_types
 
             if job_types:
@@ -119,16 +133,14 @@ class ScanningTab(BaseTab):
             return
 
         try:
-            # Use JobTypeRepository to get job ID
-            job = self.job_type_repo.find_by_name(selected_job)
-
-            if job:
-                job_type_id = job['id']
+            job_type_id = self._job_id_by_name.get(selected_job)
 
+            if job_type_id is not None:
                 # Use SubJobRepository to get sub jobs
                 results = self.sub_job_repo.get_by_main_job(job_type_id, active_only=True)
 
-                sub_job_types = [row['name'] for row in results]
+                self._sub_id_by_name = {row['sub_job_name']: row['id'] for row in results}
+                sub_job_types = list(self._sub_id_by_name)
                 self.sub_job_type_combo['values'] = sub_job_types
 
                 if sub_job_types:
@@ -140,46 +152,72 @@ class ScanningTab(BaseTab):
             messagebox.showerror("ผิดพลาด", f"ไม่สามารถโหลด Sub Job Types: {str(e)}")
     
     def process_barcode(self, event=None):
-        """ประมวลผลบาร์โค้ด"""
+        """ประมวลผลบาร์โค้ด (บันทึกใน worker thread ไม่บล็อก UI)"""
         barcode = self.barcode_entry.get().strip()
         job_type = self.job_type_var.get()
         sub_job_type = self.sub_job_type_var.get()
 
-        try:
-            # Use ScanService to process the scan
-            result = self.scan_service.process_scan(
-                barcode=barcode,
-                job_type_name=job_type,
-                sub_job_type_name=sub_job_type
-            )
-
-            if result['success']:
-                # Show success message
-                messagebox.showinfo("สำเร็จ", result['message'])
-
-                # Clear and focus
-                self.barcode_entry.delete(0, tk.END)
-                self.barcode_entry.focus_set()
-
-                # Refresh history
-                self.refresh_history()
-
-                # Call callback
-                if self.on_scan_completed:
-                    self.on_scan_completed()
-            else:
-                # Check if this is a duplicate warning
-                if result.get('data') and 'duplicate_info' in result['data']:
-                    # Show duplicate warning dialog
-                    dup_info = result['data']['duplicate_info']
-                    self.show_duplicate_warning(barcode, dup_info)
-                else:
-                    # Show error message
-                    messagebox.showerror("ผิดพลาด", result['message'])
+        # ล้างช่องทันทีเพื่อให้สแกนตัวถัดไปได้เลย ผลจะแสดงเมื่อบันทึกเสร็จ
+        self.barcode_entry.delete(0, tk.END)
+        self.barcode_entry.focus_set()
+
+        # worker มีเธรดเดียว การสแกนจึงถูกบันทึกตามลำดับที่ยิงเข้ามา
+        future = self._executor.submit(
+            self.scan_service.process_scan,
+            barcode=barcode,
+            job_type_name=job_type,
+            job_id=self._job_id_by_name.get(job_type),
+            sub_job_type_name=sub_job_type,
+            user_id=self.db.current_user,
+            sub_job_id=self._sub_id_by_name.get(sub_job_type)
+        )
+        self.frame.after(30, self._poll_scan, future, barcode)
+
+    def _poll_scan(self, future: Future, barcode: str):
+        """ตรวจผลการบันทึกเป็นระยะ (ทำงานบน Tk main thread)"""
+        if not future.done():
+            self.frame.after(30, self._poll_scan, future, barcode)
+            return
 
+        try:
+            result = future.result()
         except Exception as e:
             messagebox.showerror("ผิดพลาด", f"ไม่สามารถบันทึกการสแกน: {str(e)}")
-    
+            return
+
+        if result['success']:
+            # Show a non-modal confirmation so the next scan is not blocked
+            self.show_last_scan(barcode)
+
+            # Refresh history
+            self.refresh_history()
+
+            # Call callback
+            if self.on_scan_completed:
+                self.on_scan_completed()
+        elif result.get('data') and 'duplicate_info' in result['data']:
+            # Show duplicate warning dialog
+            self.show_duplicate_warning(barcode, result['data']['duplicate_info'])
+        else:
+            # Show error message (the entry is already cleared, so name the barcode)
+            message = f"{barcode}: {result['message']}" if barcode else result['message']
+            messagebox.showerror("ผิดพลาด", message)
+
+    def show_last_scan(self, barcode: str):
+        """แสดงบาร์โค้ดที่สแกนสำเร็จล่าสุด แล้วล้างอัตโนมัติ"""
+        if self._last_scan_clear_job is not None:
+            self.last_scan_label.after_cancel(self._last_scan_clear_job)
+
+        self.last_scan_label.config(text=f"✓ {barcode}", foreground="green")
+        self._last_scan_clear_job = self.last_scan_label.after(
+            constants.SCAN_SUCCESS_TOAST_MS, self._clear_last_scan
+        )
+
+    def _clear_last_scan(self):
+        """ล้างข้อความสแกนสำเร็จล่าสุด"""
+        self._last_scan_clear_job = None
+        self.last_scan_label.config(text="")
+
     def show_duplicate_warning(self, barcode: str, existing_record: Dict):
         """แสดงคำเตือนเมื่อบาร์โค้ดซ้ำ"""
         dialog = tk.Toplevel(self.frame)
@@ -194,10 +232,10 @@ class ScanningTab(BaseTab):
         
         info_text = f"""
         ข้อมูลการสแกนก่อนหน้า:
-        - Job Type: {existing_record['job_type_name']}
-        - Sub Job Type: {existing_record['sub_job_type_name'] or 'ไม่มี'}
-        - วันที่สแกน: {existing_record['scan_date']}
-        - ผู้สแกน: {existing_record['scanned_by']}
+        - Job Type: {existing_record.get('job_type_name') or existing_record.get('job_type', '')}
+        - Sub Job Type: {existing_record.get('sub_job_type_name') or 'ไม่มี'}
+        - วันที่สแกน: {existing_record.get('scan_date', '')}
+        - ผู้สแกน: {existing_record.get('scanned_by') or existing_record.get('user_id', '')}
         """
         
         text_widget = tk.Text(dialog, height=8, width=50)
@@ -212,26 +250,55 @@ class ScanningTab(BaseTab):
         ttk.Button(dialog, text="ตกลง", command=continue_scanning).pack(pady=10)
     
     def refresh_history(self):
-        """รีเฟรชประวัติการสแกน"""
-        # ล้างข้อมูลเก่า
-        for item in self.history_tree.get_children():
-            self.history_tree.delete(item)
+        """รีเฟรชประวัติการสแกน (query ใน worker thread)"""
+        if self._history_future is not None:
+            self._history_future.cancel()
 
-        try:
-            # Use ScanLogRepository to get recent scans
-            results = self.scan_log_repo.get_recent_scans(limit=constants.RECENT_SCANS_LIMIT, include_job_info=True)
-
-            for row in results:
-                scan_time = row['scan_date'].strftime(constants.DATETIME_FORMAT) if row['scan_date'] else ""
-                sub_job = row.get('sub_job_type_name') or ""
-                status = constants.STATUS_SUCCESS if row['status'] == 'Active' else row['status']
+        future = self._executor.submit(
+            self.scan_log_repo.get_recent_scans,
+            limit=constants.RECENT_SCANS_LIMIT,
+            include_sub_job_name=True
+        )
+        self._history_future = future
+        self.frame.after(30, self._poll_history, future)
 
-                self.history_tree.insert("", tk.END, values=(
-                    scan_time, row['barcode'], row['job_type_name'], sub_job, status
-                ))
+    def _poll_history(self, future: Future):
+        """ตรวจผลของ worker เป็นระยะ (ทำงานบน Tk main thread)"""
+        if future is not self._history_future:
+            return  # ถูกแทนที่ด้วยการรีเฟรชใหม่แล้ว
+        if not future.done():
+            self.frame.after(30, self._poll_history, future)
+            return
 
+        self._history_future = None
+        try:
+            results = future.result()
         except Exception as e:
             messagebox.showerror("ผิดพลาด", f"ไม่สามารถโหลดประวัติ: {str(e)}")
+            return
+        self._show_history(results)
+
+    def _show_history(self, results: List[Dict[str, Any]]):
+        """แสดงประวัติการสแกนล่าสุดใน Treeview"""
+        # ล้างข้อมูลเก่า
+        children = self.history_tree.get_children()
+        if children:
+            self.history_tree.delete(*children)
+
+        for row in results:
+            scan_time = row['scan_date'].strftime(constants.DATETIME_FORMAT) if row['scan_date'] else ""
+            sub_job = row.get('sub_job_name') or ""
+
+            self.history_tree.insert("", tk.END, values=(
+                scan_time, row['barcode'], row['job_type'], sub_job, constants.STATUS_SUCCESS
+            ))
+
+    def cleanup(self):
+        """ยกเลิกงานที่ค้างอยู่และปิด worker thread"""
+        if self._history_future is not None:
+            self._history_future.cancel()
+            self._history_future = None
+        self._executor.shutdown(wait=False)
     
     def clear_data(self):
         """ล้างข้อมูล"""
@@ -104,8 +104,9 @@ class SettingsTab(BaseTab):
     def refresh_job_types(self):
         """รีเฟรชรายการ Job Types"""
         # ล้างข้อมูลเก่า
-        for item in self.job_tree.get_children():
-            self.job_tree.delete(item)
+        children = self.job_tree.get_children()
+        if children:
+            self.job_tree.delete(*children)
 
         try:
             # Use JobTypeRepository
@@ -122,8 +123,9 @@ class SettingsTab(BaseTab):
     def refresh_dependencies(self):
         """รีเฟรชรายการ Dependencies"""
         # ล้างข้อมูลเก่า
-        for item in self.dep_tree.get_children():
-            self.dep_tree.delete(item)
+        children = self.dep_tree.get_children()
+        if children:
+            self.dep_tree.delete(*children)
 
         try:
             # Use DependencyService to get all dependencies
@@ -7,7 +7,7 @@ UI component for managing sub job types
 
 import tkinter as tk
 from tkinter import ttk, messagebox
-from typing import Dict, Any, Callable, Optional
+from typing import Dict, Any, Callable, List, Optional
 from ..tabs.base_tab import BaseTab
 from ..dialogs.sub_job_edit_dialog import SubJobEditDialog
 
@@ -28,6 +28,9 @@ class SubJobSettingsTab(BaseTab):
         self.current_selected_sub_job_id = None
         self.job_types_data = {}
         self.sub_job_types_data = {}
+        # id ของแต่ละแถวใน listbox ตามลำดับ (ไม่ต้องแยก id ออกจากข้อความที่แสดง)
+        self._main_job_ids: List[int] = []
+        self._sub_job_ids: List[int] = []
         super().__init__(parent, db_manager, repositories, services)
         self.refresh_main_job_list()
 
@@ -154,17 +157,14 @@ class SubJobSettingsTab(BaseTab):
             # Use JobTypeRepository to get all job types
             results = self.job_type_repo.get_all_job_types()
 
-            # Clear and rebuild job types data
-            self.job_types_data = {}
+            # Build name -> id, row ids and display texts in one pass
+            self.job_types_data = {job['name']: job['id'] for job in results}
+            self._main_job_ids = [job['id'] for job in results]
 
-            # Add job types to main job listbox
-            for job in results:
-                job_name = job['name']
-                job_id = job['id']
-                self.job_types_data[job_name] = job_id
-
-                display_text = f"{job_name} (ID: {job_id})"
-                self.main_job_listbox.insert(tk.END, display_text)
+            # Add job types to main job listbox in a single call
+            display_texts = [f"{job['name']} (ID: {job['id']})" for job in results]
+            if display_texts:
+                self.main_job_listbox.insert(tk.END, *display_texts)
 
         except Exception as e:
             messagebox.showerror("ข้อผิดพลาด", f"ไม่สามารถโหลดประเภทงานหลักได้: {str(e)}")
@@ -178,7 +178,7 @@ class SubJobSettingsTab(BaseTab):
         # Get selected job
         display_text = self.main_job_listbox.get(selection[0])
         job_name = display_text.split(" (ID: ")[0]
-        job_id = self.job_types_data.get(job_name)
+        job_id = self._main_job_ids[selection[0]]
 
         self.current_selected_main_job_id = job_id
         self.selected_main_job_label.config(text=f"จัดการประเภทงานย่อยสำหรับ: {job_name}")
@@ -202,23 +202,21 @@ class SubJobSettingsTab(BaseTab):
                 active_only=True
             )
 
-            # Update sub_job_types_data
-            self.sub_job_types_data = {}
+            # Build name -> id, row ids and display texts in one pass
+            self.sub_job_types_data = {row['name']: row['id'] for row in results}
+            self._sub_job_ids = [row['id'] for row in results]
 
+            display_texts = []
             for row in results:
-                sub_job_id = row['id']
-                sub_job_name = row['name']
+                display_text = row['name']
                 description = row.get('description', '') or ""
-
-                self.sub_job_types_data[sub_job_name] = sub_job_id
-
-                # Display in listbox
-                display_text = f"{sub_job_name}"
                 if description:
                     display_text += f" - {description}"
-                display_text += f" (ID: {sub_job_id})"
+                display_texts.append(f"{display_text} (ID: {row['id']})")
 
-                self.sub_job_listbox.insert(tk.END, display_text)
+            # Display in listbox with a single call
+            if display_texts:
+                self.sub_job_listbox.insert(tk.END, *display_texts)
 
         except Exception as e:
             messagebox.showerror("ข้อผิดพลาด", f"ไม่สามารถโหลดรายการงานย่อยได้: {str(e)}")
@@ -230,15 +228,8 @@ class SubJobSettingsTab(BaseTab):
             self.edit_sub_job_btn.config(state=tk.NORMAL)
             self.delete_sub_job_btn.config(state=tk.NORMAL)
 
-            # Get selected sub job ID
-            display_text = self.sub_job_listbox.get(selection[0])
-            # Extract ID from the end of the string
-            if "(ID: " in display_text:
-                id_part = display_text.split("(ID: ")[-1].rstrip(")")
-                try:
-                    self.current_selected_sub_job_id = int(id_part)
-                except ValueError:
-                    self.current_selected_sub_job_id = None
+            # Get selected sub job ID by row position
+            self.current_selected_sub_job_id = self._sub_job_ids[selection[0]]
         else:
             self.edit_sub_job_btn.config(state=tk.DISABLED)
             self.delete_sub_job_btn.config(state=tk.DISABLED)
@@ -1,3 +1,4 @@
-# Web Module
+"""
+Web Module
 Flask web application for WMS Barcode Scanner
-
+"""
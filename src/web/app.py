@@ -7,11 +7,20 @@ WMS Barcode Scanner Web Application
 
 import sys
 import os
-from flask import Flask, render_template, request, jsonify, session
+from flask import Flask, Blueprint, Response, g, render_template, request, jsonify, session
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
+import gc
+import importlib
+import itertools
 import json
-from datetime import datetime
+import logging
+from datetime import datetime, timedelta
 import threading
+import time
+import traceback
+from contextlib import ExitStack
+from functools import lru_cache
 from typing import Optional
 
 # Load environment variables from .env file (if available)
@@ -22,37 +31,100 @@ except ImportError:
     # python-dotenv not installed, skip loading .env file
     pass
 
+# orjson is optional - faster serializer for hot endpoints, falls back to json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Add src directory to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from src.database.database_manager import DatabaseManager
-from src.database import (
-    JobTypeRepository,
-    SubJobRepository,
-    ScanLogRepository,
-    DependencyRepository
-)
-from src.services import (
-    ScanService,
-    DependencyService,
-    ReportService
-)
-from src.models.data_models import ScanRecord
-
-app = Flask(__name__)
-
-# Configuration from environment variables with fallback to defaults
-app.secret_key = os.getenv('FLASK_SECRET_KEY', 'wms_scanner_secret_key_2024')
-app.config['MAX_CONTENT_LENGTH'] = int(os.getenv('MAX_UPLOAD_SIZE', '10')) * 1024 * 1024  # MB to bytes
-
-# CORS configuration
-cors_origins = os.getenv('CORS_ORIGINS', '*')
-if cors_origins == '*':
-    CORS(app)
-else:
-    CORS(app, origins=cors_origins.split(','))
+from src.logging_config import get_logger, setup_logging
+
+logger = get_logger(__name__)
+
+# Database/service classes are imported on first use (see _load_components) so
+# that importing this module - e.g. by gunicorn before forking - stays cheap.
+_COMPONENT_SPECS = [
+    ('src.database.database_manager', 'DatabaseManager'),
+    ('src.database.job_type_repository', 'JobTypeRepository'),
+    ('src.database.sub_job_repository', 'SubJobRepository'),
+    ('src.database.scan_log_repository', 'ScanLogRepository'),
+    ('src.database.dependency_repository', 'DependencyRepository'),
+    ('src.services.scan_service', 'ScanService'),
+    ('src.services.dependency_service', 'DependencyService'),
+    ('src.services.report_service', 'ReportService'),
+]
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    JSON provider ที่ใช้ orjson แทน json module
+    datetime/Decimal/etc. ยังผ่าน DefaultJSONProvider.default เพื่อให้ผลลัพธ์เหมือนเดิม
+    """
+
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=self.default, option=option).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+# All routes live on this blueprint; create_app() attaches it to an app
+bp = Blueprint('wms', __name__)
+
+# Cache lifetime (seconds) for static files when not in debug mode
+STATIC_CACHE_MAX_AGE = 31536000
+
+# Cached /health payload: (monotonic expiry, response bytes)
+HEALTH_CACHE_SECONDS = 2
+_health_cache = (0.0, b'')
+
+# SQL ของ /api/report - สร้างครั้งเดียวตอนโหลดโมดูล
+# ใช้ (? IS NULL OR ...) แทนการต่อสตริงตาม note_filter เพื่อให้ข้อความ SQL คงที่
+_REPORT_SQL_WITH_SUB = """
+    SELECT
+        sl.barcode,
+        sl.scan_date,
+        sl.notes,
+        sl.user_id,
+        sl.job_type as job_type_name,
+        sjt.sub_job_name as sub_job_type_name
+    FROM scan_logs sl
+    LEFT JOIN sub_job_types sjt ON sl.sub_job_id = sjt.id
+    WHERE sl.job_id = ?
+    AND sl.sub_job_id = ?
+    AND sl.scan_date >= ? AND sl.scan_date < ?
+    AND (? IS NULL OR sl.notes LIKE ?)
+    ORDER BY sl.scan_date DESC
+"""
+
+# ไม่มีงานรอง - แสดงเฉพาะงานหลัก (ไม่กรอง sub_job_id)
+_REPORT_SQL_ALL_SUB = """
+    SELECT
+        sl.barcode,
+        sl.scan_date,
+        sl.notes,
+        sl.user_id,
+        sl.job_type as job_type_name,
+        ISNULL(sjt.sub_job_name, 'ไม่มี') as sub_job_type_name
+    FROM scan_logs sl
+    LEFT JOIN sub_job_types sjt ON sl.sub_job_id = sjt.id
+    WHERE sl.job_id = ?
+    AND sl.scan_date >= ? AND sl.scan_date < ?
+    AND (? IS NULL OR sl.notes LIKE ?)
+    ORDER BY sl.scan_date DESC
+"""
+
+# Request counter for periodic young-generation GC sweeps
+GC_COLLECT_EVERY_REQUESTS = 1000
+_request_counter = itertools.count(1)
 
 # Global database manager, repositories, and services
+# (แทนที่ทั้งชุดพร้อมกันโดย initialize_database ภายใต้ _init_lock)
+_init_lock = threading.Lock()
 db_manager = None
 job_type_repo = None
 sub_job_repo = None
@@ -73,7 +145,7 @@ def get_database_config() -> Optional[dict]:
     db_auth_type = os.getenv('DB_AUTH_TYPE', 'SQL')
 
     if db_server and db_database:
-        print("📋 Using database configuration from environment variables")
+        logger.info("📋 Using database configuration from environment variables")
         config = {
             'server': db_server,
             'database': db_database,
@@ -84,7 +156,7 @@ def get_database_config() -> Optional[dict]:
             db_username = os.getenv('DB_USERNAME')
             db_password = os.getenv('DB_PASSWORD')
             if not db_username or not db_password:
-                print("⚠️ DB_USERNAME or DB_PASSWORD not set in environment variables")
+                logger.warning("⚠️ DB_USERNAME or DB_PASSWORD not set in environment variables")
                 return None
             config['username'] = db_username
             config['password'] = db_password
@@ -105,127 +177,237 @@ def get_database_config() -> Optional[dict]:
         }
 
     # Fallback to config file (legacy method)
-    print("📋 Trying to load database configuration from config/sql_config.json")
+    logger.info("📋 Trying to load database configuration from config/sql_config.json")
     return None
 
+@lru_cache(maxsize=1)
+def get_app_config() -> dict:
+    """
+    Get web application settings from environment variables.
+    Every setting has a fallback default so the app can run without a .env file.
+    Result is cached; call get_app_config.cache_clear() to re-read the environment.
+    """
+    return {
+        'secret_key': os.getenv('FLASK_SECRET_KEY', 'wms_scanner_secret_key_2024'),
+        'max_content_length': int(os.getenv('MAX_UPLOAD_SIZE', '10')) * 1024 * 1024,  # MB to bytes
+        'cors_origins': os.getenv('CORS_ORIGINS', '*'),
+        'host': os.getenv('FLASK_HOST', '0.0.0.0'),
+        'port': int(os.getenv('FLASK_PORT', '5000')),
+        'debug': os.getenv('FLASK_DEBUG', '0') == '1',
+        'env': os.getenv('FLASK_ENV', 'development')
+    }
+
+def create_app() -> Flask:
+    """สร้าง Flask application ตามการตั้งค่าจาก environment variables"""
+    app_config = get_app_config()
+
+    flask_app = Flask(__name__)
+    flask_app.config['APP_CONFIG'] = app_config
+    if orjson is not None:
+        flask_app.json = OrjsonProvider(flask_app)
+    flask_app.secret_key = app_config['secret_key']
+    flask_app.config['MAX_CONTENT_LENGTH'] = app_config['max_content_length']
+
+    # Templates/static ไม่เปลี่ยนระหว่างรันใน production - ปิดการ reload และให้ browser cache ได้
+    if not app_config['debug']:
+        flask_app.config['TEMPLATES_AUTO_RELOAD'] = False
+        flask_app.jinja_env.auto_reload = False
+        flask_app.config['SEND_FILE_MAX_AGE_DEFAULT'] = STATIC_CACHE_MAX_AGE
+
+    # CORS configuration
+    if app_config['cors_origins'] == '*':
+        CORS(flask_app)
+    else:
+        CORS(flask_app, origins=app_config['cors_origins'].split(','))
+
+    flask_app.register_blueprint(bp)
+    flask_app.before_request(_begin_db_session)
+    flask_app.teardown_request(_cleanup_request)
+    return flask_app
+
+def _begin_db_session():
+    """ให้ทุก query ใน request เดียวกันใช้ connection เดียวกัน (ยืมเมื่อ query แรกเท่านั้น)"""
+    if db_manager is not None:
+        db_session = ExitStack()
+        db_session.enter_context(db_manager.scoped_session())
+        g.db_session = db_session
+
+def _cleanup_request(exc):
+    """ล้าง state ของ request เพื่อตัด reference cycle ที่ค้างอยู่"""
+    # คืน connection ของ request เข้า pool
+    db_session = g.pop('db_session', None)
+    if db_session is not None:
+        db_session.close()
+    # ปิด cursor ที่ถูกผูกไว้กับ request (ถ้ามี) เพื่อไม่ให้ค้างใน worker
+    cursor = g.pop('cursor', None)
+    if cursor is not None:
+        try:
+            cursor.close()
+        except Exception as e:
+            logger.warning(f"⚠️ ไม่สามารถปิด cursor: {e}")
+    for attr in list(vars(g)):
+        delattr(g, attr)
+    if exc is not None:
+        exc.__traceback__ = None
+    if next(_request_counter) % GC_COLLECT_EVERY_REQUESTS == 0:
+        gc.collect(0)
+
+def configure_logging():
+    """ตั้งค่า logging จาก LOG_* environment variables (เขียน log ผ่าน background thread)"""
+    setup_logging(
+        log_dir=os.getenv('LOG_DIR', 'logs'),
+        level=getattr(logging, os.getenv('LOG_LEVEL', 'INFO').upper(), logging.INFO),
+        console_output=os.getenv('LOG_TO_CONSOLE', '1') == '1',
+        file_output=os.getenv('LOG_TO_FILE', '1') == '1',
+        use_queue=True
+    )
+
+@lru_cache(maxsize=1)
+def _load_components() -> dict:
+    """Import database/service classes listed in _COMPONENT_SPECS (once)"""
+    return {
+        attr: getattr(importlib.import_module(module_name), attr)
+        for module_name, attr in _COMPONENT_SPECS
+    }
+
 def initialize_database():
-    """เริ่มต้นการเชื่อมต่อฐานข้อมูล"""
+    """
+    เริ่มต้นการเชื่อมต่อฐานข้อมูล
+
+    สร้าง manager/repositories/services ทั้งชุดในตัวแปร local ภายใต้ _init_lock
+    แล้วจึงเผยแพร่เป็น global พร้อมกันตอนท้าย request ที่รันพร้อมกันจึงไม่เห็น
+    db_manager ใหม่คู่กับ repository ที่ยังเป็น None หรือของชุดเก่า
+    """
     global db_manager, job_type_repo, sub_job_repo, scan_log_repo, dependency_repo
     global scan_service, dependency_service, report_service
-    try:
-        print("🔗 กำลังเชื่อมต่อฐานข้อมูล...")
+    with _init_lock:
+        try:
+            logger.info("🔗 กำลังเชื่อมต่อฐานข้อมูล...")
 
-        # Try to get config from environment variables first
-        connection_info = get_database_config()
+            components = _load_components()
+            DatabaseManager = components['DatabaseManager']
 
-        # สร้าง DatabaseManager (จะโหลด config จากไฟล์โดยอัตโนมัติถ้าไม่มี connection_info)
-        db_manager = DatabaseManager(connection_info) if connection_info else DatabaseManager()
+            # Try to get config from environment variables first
+            connection_info = get_database_config()
 
-        if db_manager.test_connection():
-            config = db_manager.get_config()
-            print(f"✅ เชื่อมต่อฐานข้อมูลสำเร็จ: {config.get('server', '')}/{config.get('database', '')}")
+            # สร้าง DatabaseManager (จะโหลด config จากไฟล์โดยอัตโนมัติถ้าไม่มี connection_info)
+            manager = DatabaseManager(connection_info) if connection_info else DatabaseManager()
+
+            if not manager.test_connection():
+                logger.error("❌ การทดสอบการเชื่อมต่อล้มเหลว")
+                return False
+
+            config = manager.get_config()
+            logger.info(f"✅ เชื่อมต่อฐานข้อมูลสำเร็จ: {config.get('server', '')}/{config.get('database', '')}")
+            # เปิด connection ให้ pool ล่วงหน้าพร้อมกัน คำขอแรกๆ จะได้ไม่ต้องรอ handshake
+            manager.warm_up()
 
             # สร้าง repository instances
-            job_type_repo = JobTypeRepository(db_manager)
-            sub_job_repo = SubJobRepository(db_manager)
-            scan_log_repo = ScanLogRepository(db_manager)
-            dependency_repo = DependencyRepository(db_manager)
-            print("✅ สร้าง repositories สำเร็จ")
+            repos = {
+                'job_type_repo': components['JobTypeRepository'](manager),
+                'sub_job_repo': components['SubJobRepository'](manager),
+                'scan_log_repo': components['ScanLogRepository'](manager),
+                'dependency_repo': components['DependencyRepository'](manager),
+            }
+            logger.info("✅ สร้าง repositories สำเร็จ")
 
             # สร้าง service instances
-            scan_service = ScanService(
-                scan_log_repo=scan_log_repo,
-                sub_job_repo=sub_job_repo,
-                dependency_repo=dependency_repo
-            )
-            dependency_service = DependencyService(
-                dependency_repo=dependency_repo,
-                job_type_repo=job_type_repo
-            )
-            report_service = ReportService(
-                scan_log_repo=scan_log_repo,
-                job_type_repo=job_type_repo,
-                sub_job_repo=sub_job_repo
-            )
-            print("✅ สร้าง services สำเร็จ")
+            services = {
+                'scan_service': components['ScanService'](
+                    scan_log_repo=repos['scan_log_repo'],
+                    sub_job_repo=repos['sub_job_repo'],
+                    dependency_repo=repos['dependency_repo']
+                ),
+                'dependency_service': components['DependencyService'](
+                    dependency_repo=repos['dependency_repo'],
+                    job_type_repo=repos['job_type_repo']
+                ),
+                'report_service': components['ReportService'](
+                    scan_log_repo=repos['scan_log_repo'],
+                    job_type_repo=repos['job_type_repo'],
+                    sub_job_repo=repos['sub_job_repo']
+                ),
+            }
+            logger.info("✅ สร้าง services สำเร็จ")
 
             # ตรวจสอบและสร้างตารางที่จำเป็น
-            ensure_tables_exist()
-
-            return True
-        else:
-            print("❌ การทดสอบการเชื่อมต่อล้มเหลว")
+            ensure_tables_exist(**repos)
+        except Exception as e:
+            logger.error(f"❌ เกิดข้อผิดพลาดในการเชื่อมต่อฐานข้อมูล: {e}")
             return False
-    except Exception as e:
-        print(f"❌ เกิดข้อผิดพลาดในการเชื่อมต่อฐานข้อมูล: {e}")
-        return False
+
+        # เผยแพร่ทั้งชุดหลังสร้างเสร็จเท่านั้น
+        previous = db_manager
+        job_type_repo = repos['job_type_repo']
+        sub_job_repo = repos['sub_job_repo']
+        scan_log_repo = repos['scan_log_repo']
+        dependency_repo = repos['dependency_repo']
+        scan_service = services['scan_service']
+        dependency_service = services['dependency_service']
+        report_service = services['report_service']
+        db_manager = manager
+
+    if previous is not None and previous is not manager:
+        # ปิด connection ค้างของ manager ชุดเก่า (request ที่ยังใช้อยู่จะเปิดใหม่เองถ้าจำเป็น)
+        previous.close_prepared()
+        previous.close_connections()
+    return True
 
 def check_dependencies(barcode, job_type_id):
     """ตรวจสอบ Dependencies ของงาน (เหมือน Desktop App)"""
     try:
-        # ตรวจสอบ Dependencies ผ่าน DependencyRepository
-        required_jobs = dependency_repo.get_required_jobs(job_type_id)
-
-        if not required_jobs:
-            # ไม่มี dependencies สามารถสแกนได้
-            return {'success': True, 'message': 'ไม่มี dependencies'}
-
-        # ตรวจสอบว่าทุกงานที่จำเป็นถูกสแกนแล้วหรือไม่
-        for required_job in required_jobs:
-            required_job_id = required_job['required_job_id']
-            required_job_name = required_job['job_name']
-
-            # ตรวจสอบว่างานที่จำเป็นถูกสแกนแล้วหรือไม่ ผ่าน ScanLogRepository
-            duplicate = scan_log_repo.check_duplicate(
-                barcode=barcode,
-                job_id=required_job_id,
-                hours=24*365  # ตรวจสอบย้อนหลัง 1 ปี (ไม่จำกัดเวลา)
-            )
-
-            if duplicate is None:
-                # งานที่จำเป็นยังไม่ถูกสแกน
-                print(f"❌ ไม่มีงาน {required_job_name} สำหรับบาร์โค้ด {barcode}")
-                return {
-                    'success': False,
-                    'message': f'ไม่สามารถสแกนได้ - ต้องสแกนงาน "{required_job_name}" ก่อน'
-                }
+        # ดึงเฉพาะงานที่จำเป็นแต่ยังไม่ถูกสแกน ใน query เดียว (ย้อนหลัง 1 ปี)
+        missing_jobs = dependency_repo.get_missing_required_jobs(
+            job_id=job_type_id,
+            barcode=barcode,
+            hours=24*365
+        )
+
+        if missing_jobs:
+            # งานที่จำเป็นยังไม่ถูกสแกน
+            required_job_name = missing_jobs[0]['job_name']
+            logger.error(f"❌ ไม่มีงาน {required_job_name} สำหรับบาร์โค้ด {barcode}")
+            return {
+                'success': False,
+                'message': f'ไม่สามารถสแกนได้ - ต้องสแกนงาน "{required_job_name}" ก่อน'
+            }
 
         # ทุก dependencies ถูกต้อง
         return {'success': True, 'message': 'Dependencies ถูกต้อง'}
 
     except Exception as e:
-        print(f"❌ เกิดข้อผิดพลาดในการตรวจสอบ Dependencies: {str(e)}")
+        logger.error(f"❌ เกิดข้อผิดพลาดในการตรวจสอบ Dependencies: {str(e)}")
         return {'success': False, 'message': f'เกิดข้อผิดพลาดในการตรวจสอบ Dependencies: {str(e)}'}
 
-def ensure_tables_exist():
+def ensure_tables_exist(job_type_repo, sub_job_repo, scan_log_repo, dependency_repo):
     """ตรวจสอบและสร้างตารางที่จำเป็น"""
     try:
         # สร้างตารางผ่าน repositories
         if job_type_repo.ensure_table_exists():
-            print("✅ ตาราง job_types พร้อมใช้งาน")
+            logger.info("✅ ตาราง job_types พร้อมใช้งาน")
 
         if sub_job_repo.ensure_table_exists():
-            print("✅ ตาราง sub_job_types พร้อมใช้งาน")
+            logger.info("✅ ตาราง sub_job_types พร้อมใช้งาน")
 
         if scan_log_repo.ensure_table_exists():
-            print("✅ ตาราง scan_logs พร้อมใช้งาน")
+            logger.info("✅ ตาราง scan_logs พร้อมใช้งาน")
 
             # สร้าง indexes สำหรับ scan_logs
             if scan_log_repo.ensure_indexes_exist():
-                print("✅ สร้าง indexes สำเร็จ")
+                logger.info("✅ สร้าง indexes สำเร็จ")
 
         if dependency_repo.ensure_table_exists():
-            print("✅ ตาราง job_dependencies พร้อมใช้งาน")
+            logger.info("✅ ตาราง job_dependencies พร้อมใช้งาน")
 
     except Exception as e:
-        print(f"⚠️ เกิดข้อผิดพลาดในการตรวจสอบตาราง: {e}")
+        logger.warning(f"⚠️ เกิดข้อผิดพลาดในการตรวจสอบตาราง: {e}")
 
-@app.route('/')
+@bp.route('/')
 def index():
     """หน้าแรกของแอปพลิเคชัน"""
     return render_template('index.html')
 
-@app.route('/api/init')
+@bp.route('/api/init')
 def initialize_app():
     """API สำหรับเริ่มต้นแอปพลิเคชัน"""
     try:
@@ -248,7 +430,7 @@ def initialize_app():
             'connected': False
         })
 
-@app.route('/api/login', methods=['POST'])
+@bp.route('/api/login', methods=['POST'])
 def login():
     """API สำหรับ login"""
     try:
@@ -280,7 +462,7 @@ def login():
             'current_user': username
         }
         
-        db_manager = DatabaseManager(connection_info)
+        db_manager = _load_components()['DatabaseManager'](connection_info)
         if db_manager.test_connection():
             # บันทึกข้อมูลใน session
             session['db_config'] = {
@@ -296,21 +478,21 @@ def login():
     except Exception as e:
         return jsonify({'success': False, 'message': f'เกิดข้อผิดพลาด: {str(e)}'})
 
-@app.route('/api/job_types')
+@bp.route('/api/job_types')
 def get_job_types():
     """API สำหรับดึงรายการ Job Types"""
     try:
         if not job_type_repo:
-            print("❌ ไม่มี job_type_repo")
+            logger.error("❌ ไม่มี job_type_repo")
             return jsonify({'success': False, 'message': 'ไม่มีการเชื่อมต่อฐานข้อมูล'})
 
-        print("🔍 กำลังดึงข้อมูล Job Types...")
+        logger.debug("🔍 กำลังดึงข้อมูล Job Types...")
         results = job_type_repo.get_all_job_types()
-        print(f"📊 ผลลัพธ์: {len(results) if results else 0} รายการ")
+        logger.debug(f"📊 ผลลัพธ์: {len(results) if results else 0} รายการ")
 
         # ถ้าไม่มีข้อมูล ให้เพิ่มข้อมูลตัวอย่าง
         if not results:
-            print("⚠️ ไม่พบข้อมูล Job Types จะเพิ่มข้อมูลตัวอย่าง...")
+            logger.warning("⚠️ ไม่พบข้อมูล Job Types จะเพิ่มข้อมูลตัวอย่าง...")
 
             sample_data = [
                 '1.Release',
@@ -325,41 +507,41 @@ def get_job_types():
                 try:
                     if not job_type_repo.job_name_exists(job_name):
                         job_type_repo.create_job_type(job_name)
-                        print(f"✅ เพิ่ม Job Type: {job_name}")
+                        logger.info(f"✅ เพิ่ม Job Type: {job_name}")
                 except Exception as e:
-                    print(f"⚠️ ไม่สามารถเพิ่ม Job Type {job_name}: {str(e)}")
+                    logger.warning(f"⚠️ ไม่สามารถเพิ่ม Job Type {job_name}: {str(e)}")
 
             # ดึงข้อมูลใหม่
             results = job_type_repo.get_all_job_types()
-            print(f"📊 ผลลัพธ์ใหม่: {len(results) if results else 0} รายการ")
+            logger.debug(f"📊 ผลลัพธ์ใหม่: {len(results) if results else 0} รายการ")
 
         if results:
             for row in results:
-                print(f"  - ID: {row['id']}, Name: {row['job_name']}")
+                logger.debug(f"  - ID: {row['id']}, Name: {row['job_name']}")
 
         job_types = [{'id': row['id'], 'name': row['job_name']} for row in results] if results else []
         return jsonify({'success': True, 'data': job_types})
 
     except Exception as e:
-        print(f"❌ เกิดข้อผิดพลาดใน get_job_types: {str(e)}")
+        logger.error(f"❌ เกิดข้อผิดพลาดใน get_job_types: {str(e)}")
         return jsonify({'success': False, 'message': f'เกิดข้อผิดพลาด: {str(e)}'})
 
-@app.route('/api/sub_job_types/<int:job_type_id>')
+@bp.route('/api/sub_job_types/<int:job_type_id>')
 def get_sub_job_types(job_type_id):
     """API สำหรับดึงรายการ Sub Job Types"""
     try:
         if not sub_job_repo:
-            print("❌ ไม่มี sub_job_repo")
+            logger.error("❌ ไม่มี sub_job_repo")
             return jsonify({'success': False, 'message': 'ไม่มีการเชื่อมต่อฐานข้อมูล'})
 
-        print(f"🔍 กำลังดึงข้อมูล Sub Job Types สำหรับ Job Type ID: {job_type_id}")
+        logger.debug(f"🔍 กำลังดึงข้อมูล Sub Job Types สำหรับ Job Type ID: {job_type_id}")
 
         results = sub_job_repo.get_by_main_job(job_type_id, active_only=True)
-        print(f"📊 ผลลัพธ์: {len(results) if results else 0} รายการ")
+        logger.debug(f"📊 ผลลัพธ์: {len(results) if results else 0} รายการ")
 
         # ถ้าไม่มีข้อมูล ให้เพิ่มข้อมูลตัวอย่าง
         if not results:
-            print("⚠️ ไม่พบข้อมูล Sub Job Types จะเพิ่มข้อมูลตัวอย่าง...")
+            logger.warning("⚠️ ไม่พบข้อมูล Sub Job Types จะเพิ่มข้อมูลตัวอย่าง...")
 
             # ข้อมูลตัวอย่างตาม Job Type
             sample_sub_jobs = {
@@ -376,33 +558,33 @@ def get_sub_job_types(job_type_id):
                     try:
                         if not sub_job_repo.duplicate_exists(job_type_id, sub_job_name[0]):
                             sub_job_repo.create_sub_job(job_type_id, sub_job_name[0])
-                            print(f"✅ เพิ่ม Sub Job Type: {sub_job_name[0]} สำหรับ Job Type ID: {job_type_id}")
+                            logger.info(f"✅ เพิ่ม Sub Job Type: {sub_job_name[0]} สำหรับ Job Type ID: {job_type_id}")
                     except Exception as e:
-                        print(f"⚠️ ไม่สามารถเพิ่ม Sub Job Type {sub_job_name[0]}: {str(e)}")
+                        logger.warning(f"⚠️ ไม่สามารถเพิ่ม Sub Job Type {sub_job_name[0]}: {str(e)}")
 
                 # ดึงข้อมูลใหม่
                 results = sub_job_repo.get_by_main_job(job_type_id, active_only=True)
-                print(f"📊 ผลลัพธ์ใหม่: {len(results) if results else 0} รายการ")
+                logger.debug(f"📊 ผลลัพธ์ใหม่: {len(results) if results else 0} รายการ")
 
         if results:
             for row in results:
-                print(f"  - ID: {row['id']}, Name: {row['sub_job_name']}")
+                logger.debug(f"  - ID: {row['id']}, Name: {row['sub_job_name']}")
 
         sub_job_types = [{'id': row['id'], 'name': row['sub_job_name']} for row in results] if results else []
         return jsonify({'success': True, 'data': sub_job_types})
 
     except Exception as e:
-        print(f"❌ เกิดข้อผิดพลาดใน get_sub_job_types: {str(e)}")
+        logger.error(f"❌ เกิดข้อผิดพลาดใน get_sub_job_types: {str(e)}")
         return jsonify({'success': False, 'message': f'เกิดข้อผิดพลาด: {str(e)}'})
 
-@app.route('/api/scan', methods=['POST'])
+@bp.route('/api/scan', methods=['POST'])
 def scan_barcode():
     """API สำหรับสแกนบาร์โค้ด using ScanService"""
     try:
-        print(f"🔍 เริ่มต้นการสแกนบาร์โค้ด...")
+        logger.debug(f"🔍 เริ่มต้นการสแกนบาร์โค้ด...")
 
         if not scan_service:
-            print("❌ ไม่มี scan service")
+            logger.error("❌ ไม่มี scan service")
             return jsonify({'success': False, 'message': 'ไม่มีการเชื่อมต่อฐานข้อมูล'})
 
         data = request.get_json()
@@ -411,7 +593,7 @@ def scan_barcode():
         sub_job_type_id = data.get('sub_job_type_id')
         note = data.get('note', '')
 
-        print(f"📝 ข้อมูลที่ได้รับ: barcode={barcode}, job_type_id={job_type_id}, sub_job_type_id={sub_job_type_id}, note={note}")
+        logger.debug(f"📝 ข้อมูลที่ได้รับ: barcode={barcode}, job_type_id={job_type_id}, sub_job_type_id={sub_job_type_id}, note={note}")
 
         # Basic validation
         if not barcode:
@@ -429,10 +611,14 @@ def scan_barcode():
 
         # Get sub job type info if provided
         sub_job_type_name = None
+        sub_job_id = None
         if sub_job_type_id:
             sub_info = sub_job_repo.get_details(sub_job_type_id)
             if sub_info:
                 sub_job_type_name = sub_info['sub_job_name']
+                # ใช้ id ที่ได้แล้วต่อได้เลย ถ้าเป็นงานย่อยที่ใช้งานอยู่ของ Job Type นี้
+                if sub_info['is_active'] and str(sub_info['main_job_id']) == str(job_type_id):
+                    sub_job_id = sub_info['id']
 
         # Use ScanService to process the scan (handles all business logic)
         result = scan_service.process_scan(
@@ -441,12 +627,13 @@ def scan_barcode():
             job_id=job_type_id,
             sub_job_type_name=sub_job_type_name or "",
             user_id=db_manager.current_user,
-            notes=note
+            notes=note,
+            sub_job_id=sub_job_id
         )
 
         # Handle the result
         if not result['success']:
-            print(f"❌ Scan failed: {result['message']}")
+            logger.error(f"❌ Scan failed: {result['message']}")
             # Check if it's a duplicate
             if 'ซ้ำ' in result['message'] or 'duplicate' in result['message'].lower():
                 duplicate_info = result['data'].get('duplicate_info', {})
@@ -464,16 +651,15 @@ def scan_barcode():
             else:
                 return jsonify({'success': False, 'message': result['message']})
 
-        print(f"✅ บันทึกสำเร็จ")
+        logger.info(f"✅ บันทึกสำเร็จ")
         return jsonify({'success': True, 'message': f'บันทึกการสแกนบาร์โค้ด: {barcode}'})
 
     except Exception as e:
-        print(f"❌ เกิดข้อผิดพลาด: {str(e)}")
-        import traceback
+        logger.error(f"❌ เกิดข้อผิดพลาด: {str(e)}")
         traceback.print_exc()
         return jsonify({'success': False, 'message': f'ไม่สามารถบันทึกการสแกน: {str(e)}'})
 
-@app.route('/api/history')
+@bp.route('/api/history')
 def get_scan_history():
     """API สำหรับดึงประวัติการสแกน - ทำงานเหมือน Desktop App"""
     try:
@@ -517,16 +703,26 @@ def get_scan_history():
     except Exception as e:
         return jsonify({'success': False, 'message': f'เกิดข้อผิดพลาด: {str(e)}'})
 
-@app.route('/health')
+@bp.route('/health')
 def health_check():
     """Health check endpoint for Docker/Kubernetes"""
+    global _health_cache
     try:
-        # Basic health check - just return 200 if app is running
-        return jsonify({
-            'status': 'healthy',
-            'service': 'wms-barcode-scanner-web',
-            'timestamp': datetime.now().isoformat()
-        }), 200
+        # Probes hit this at high frequency - serve cached bytes for a few seconds
+        expiry, body = _health_cache
+        now = time.monotonic()
+        if now >= expiry:
+            payload = {
+                'status': 'healthy',
+                'service': 'wms-barcode-scanner-web',
+                'timestamp': datetime.now().isoformat()
+            }
+            if db_manager is not None:
+                # อ่านแบบไม่ถือ lock ของ pool - probe ไม่แย่ง lock กับ query
+                payload['database'] = db_manager.get_pool_stats()
+            body = orjson.dumps(payload) if orjson else json.dumps(payload).encode('utf-8')
+            _health_cache = (now + HEALTH_CACHE_SECONDS, body)
+        return Response(body, status=200, mimetype='application/json')
     except Exception as e:
         return jsonify({
             'status': 'unhealthy',
@@ -534,73 +730,47 @@ def health_check():
             'timestamp': datetime.now().isoformat()
         }), 503
 
-@app.route('/api/status')
+@bp.route('/api/status')
 def get_status():
     """API สำหรับตรวจสอบสถานะการเชื่อมต่อ"""
     try:
         if db_manager:
-            db_manager.test_connection()
-            return jsonify({'success': True, 'connected': True})
+            # ไม่เปิด connection ทดสอบใหม่ถ้าเพิ่งมี query สำเร็จ
+            return jsonify({'success': True, 'connected': db_manager.ensure_connection()})
         else:
             return jsonify({'success': True, 'connected': False})
     except:
         return jsonify({'success': True, 'connected': False})
 
-@app.route('/api/today_summary')
+@bp.route('/api/today_summary')
 def get_today_summary():
     """API สำหรับดึงสรุปงานที่สแกนวันนี้"""
     try:
-        if not scan_log_repo or not job_type_repo or not sub_job_repo:
+        if not scan_service or not job_type_repo or not sub_job_repo:
             return jsonify({'success': False, 'message': 'ไม่มีการเชื่อมต่อฐานข้อมูล'})
 
-        job_type_id = request.args.get('job_type_id')
-        sub_job_type_id = request.args.get('sub_job_type_id')
+        # แปลง id เป็น int ครั้งเดียว (จำนวนต่องานย่อยใช้ sub_job_id แบบ int เป็น key)
+        job_type_id = request.args.get('job_type_id', type=int)
+        sub_job_type_id = request.args.get('sub_job_type_id', type=int)
         note_filter = request.args.get('note_filter')
 
         if not job_type_id:
             return jsonify({'success': True, 'data': {'total_count': 0, 'message': 'กรุณาเลือก Job Type'}})
 
-        # ใช้ get_today_summary_count จาก repository (ไม่รองรับ note_filter)
-        # ถ้ามี note_filter ต้องใช้ db_manager โดยตรง
-        if note_filter and note_filter.strip():
-            # ใช้ db_manager สำหรับกรณีมี note_filter
-            if sub_job_type_id and sub_job_type_id != '':
-                count_query = """
-                    SELECT COUNT(*) as total_count
-                    FROM scan_logs sl
-                    WHERE sl.job_id = ?
-                    AND sl.sub_job_id = ?
-                    AND CAST(sl.scan_date AS DATE) = CAST(GETDATE() AS DATE)
-                    AND sl.notes LIKE ?
-                """
-                params = (job_type_id, sub_job_type_id, f"%{note_filter.strip()}%")
-            else:
-                count_query = """
-                    SELECT COUNT(*) as total_count
-                    FROM scan_logs sl
-                    WHERE sl.job_id = ?
-                    AND CAST(sl.scan_date AS DATE) = CAST(GETDATE() AS DATE)
-                    AND sl.notes LIKE ?
-                """
-                params = (job_type_id, f"%{note_filter.strip()}%")
-
-            result = db_manager.execute_query(count_query, params)
-            total_count = result[0]['total_count'] if result else 0
-        else:
-            # ใช้ repository สำหรับกรณีไม่มี note_filter
-            total_count = scan_log_repo.get_today_summary_count(
-                job_id=job_type_id,
-                sub_job_id=sub_job_type_id if sub_job_type_id and sub_job_type_id != '' else None
-            )
+        # นับผ่าน ScanService - ค่าเดิมถูกใช้ซ้ำช่วงสั้นๆ และล้างเมื่อมีการสแกนใหม่
+        total_count = scan_service.get_today_count(
+            job_id=job_type_id,
+            sub_job_id=sub_job_type_id,
+            notes_filter=note_filter.strip() if note_filter and note_filter.strip() else None
+        )
 
-        # ดึงข้อมูล Job Type และ Sub Job Type สำหรับแสดงผล
-        job_type_query = "SELECT job_name FROM job_types WHERE id = ?"
-        job_result = db_manager.execute_query(job_type_query, (job_type_id,))
-        job_type_name = job_result[0]['job_name'] if job_result else 'ไม่ทราบ'
+        # ดึงชื่อ Job Type และ Sub Job Type สำหรับแสดงผล (ข้อมูลหลักถูก cache ใน repository)
+        job_result = job_type_repo.find_by_id(job_type_id)
+        job_type_name = job_result['job_name'] if job_result else 'ไม่ทราบ'
 
         sub_job_type_name = 'ไม่มี'
-        if sub_job_type_id and sub_job_type_id != '':
-            sub_result = sub_job_repo.get_details(sub_job_type_id)
+        if sub_job_type_id:
+            sub_result = sub_job_repo.find_by_id(sub_job_type_id, columns=('id', 'sub_job_name'))
             if sub_result:
                 sub_job_type_name = sub_result['sub_job_name']
 
@@ -616,10 +786,10 @@ def get_today_summary():
         })
 
     except Exception as e:
-        print(f"❌ เกิดข้อผิดพลาดในการดึงสรุปงานวันนี้: {str(e)}")
+        logger.error(f"❌ เกิดข้อผิดพลาดในการดึงสรุปงานวันนี้: {str(e)}")
         return jsonify({'success': False, 'message': f'เกิดข้อผิดพลาดในการดึงสรุปงานวันนี้: {str(e)}'})
 
-@app.route('/api/report', methods=['POST'])
+@bp.route('/api/report', methods=['POST'])
 def generate_report():
     """API สำหรับสร้างรายงาน"""
     try:
@@ -640,10 +810,10 @@ def generate_report():
 
         # แปลงวันที่เป็นรูปแบบที่เหมาะสม
         try:
-            from datetime import datetime
             report_date_obj = datetime.strptime(report_date, '%Y-%m-%d')
-            start_date = report_date_obj.strftime('%Y-%m-%d 00:00:00')
-            end_date = report_date_obj.strftime('%Y-%m-%d 23:59:59')
+            # ช่วงวันแบบ [00:00 วันนั้น, 00:00 วันถัดไป) ให้ SQL Server ใช้ index บน scan_date ได้
+            day_start = report_date_obj
+            day_end = report_date_obj + timedelta(days=1)
         except:
             return jsonify({'success': False, 'message': 'รูปแบบวันที่ไม่ถูกต้อง'})
 
@@ -663,78 +833,14 @@ def generate_report():
             else:
                 return jsonify({'success': False, 'message': 'ไม่พบงานรองที่เลือก'})
 
-        # ใช้ repository สำหรับดึงข้อมูลรายงาน (ไม่รองรับ note_filter)
-        # ถ้ามี note_filter ต้องใช้ db_manager โดยตรง
-        if note_filter and note_filter.strip():
-            # ใช้ db_manager สำหรับกรณีมี note_filter
-            if sub_job_type_id:
-                # มีงานรอง
-                report_query = """
-                    SELECT
-                        sl.barcode,
-                        sl.scan_date,
-                        sl.notes,
-                        sl.user_id,
-                        jt.job_name as job_type_name,
-                        sjt.sub_job_name as sub_job_type_name
-                    FROM scan_logs sl
-                    LEFT JOIN job_types jt ON sl.job_id = jt.id
-                    LEFT JOIN sub_job_types sjt ON sl.sub_job_id = sjt.id
-                    WHERE sl.job_id = ?
-                    AND sl.sub_job_id = ?
-                    AND CAST(sl.scan_date AS DATE) = ?
-                    AND sl.notes LIKE ?
-                    ORDER BY sl.scan_date DESC
-                """
-                params = (job_type_id, sub_job_type_id, report_date, f"%{note_filter.strip()}%")
-            else:
-                # ไม่มีงานรอง - แสดงเฉพาะงานหลัก (ไม่กรอง sub_job_id)
-                report_query = """
-                    SELECT
-                        sl.barcode,
-                        sl.scan_date,
-                        sl.notes,
-                        sl.user_id,
-                        jt.job_name as job_type_name,
-                        ISNULL(sjt.sub_job_name, 'ไม่มี') as sub_job_type_name
-                    FROM scan_logs sl
-                    LEFT JOIN job_types jt ON sl.job_id = jt.id
-                    LEFT JOIN sub_job_types sjt ON sl.sub_job_id = sjt.id
-                    WHERE sl.job_id = ?
-                    AND CAST(sl.scan_date AS DATE) = ?
-                    AND sl.notes LIKE ?
-                    ORDER BY sl.scan_date DESC
-                """
-                params = (job_type_id, report_date, f"%{note_filter.strip()}%")
-
-            results = db_manager.execute_query(report_query, params)
+        # คำสั่ง SQL คงที่ - note_filter ที่ไม่ได้ใช้ส่งเป็น None เพื่อให้ SQL Server ใช้ plan เดิมซ้ำ
+        notes_like = f"%{note_filter.strip()}%" if note_filter and note_filter.strip() else None
+        if sub_job_type_id:
+            params = (job_type_id, sub_job_type_id, day_start, day_end, notes_like, notes_like)
+            results = db_manager.execute_query(_REPORT_SQL_WITH_SUB, params)
         else:
-            # ใช้ repository สำหรับกรณีไม่มี note_filter
-            if sub_job_type_id:
-                # มีงานรอง - ใช้ get_report_with_sub_job
-                results = scan_log_repo.get_report_with_sub_job(
-                    start_date=start_date,
-                    end_date=end_date,
-                    job_id=job_type_id,
-                    sub_job_id=sub_job_type_id
-                )
-            else:
-                # ไม่มีงานรอง - ใช้ get_report_main_job_only
-                results = scan_log_repo.get_report_main_job_only(
-                    start_date=start_date,
-                    end_date=end_date,
-                    job_id=job_type_id
-                )
-
-            # เพิ่ม job_type_name และ sub_job_type_name ให้กับผลลัพธ์
-            for row in results:
-                if 'job_type_name' not in row:
-                    row['job_type_name'] = job_type_name
-                if 'sub_job_type_name' not in row:
-                    if sub_job_type_id:
-                        row['sub_job_type_name'] = sub_job_type_name
-                    else:
-                        row['sub_job_type_name'] = 'ไม่มี'
+            params = (job_type_id, day_start, day_end, notes_like, notes_like)
+            results = db_manager.execute_query(_REPORT_SQL_ALL_SUB, params)
 
         # นับจำนวนรวม
         total_count = len(results) if results else 0
@@ -768,32 +874,43 @@ def generate_report():
         })
 
     except Exception as e:
-        print(f"❌ เกิดข้อผิดพลาดในการสร้างรายงาน: {str(e)}")
+        logger.error(f"❌ เกิดข้อผิดพลาดในการสร้างรายงาน: {str(e)}")
         return jsonify({'success': False, 'message': f'เกิดข้อผิดพลาดในการสร้างรายงาน: {str(e)}'})
 
-if __name__ == '__main__':
-    # สร้างโฟลเดอร์ templates ถ้ายังไม่มี
-    os.makedirs('templates', exist_ok=True)
-    os.makedirs('static', exist_ok=True)
-
-    # Get Flask configuration from environment variables
-    flask_host = os.getenv('FLASK_HOST', '0.0.0.0')
-    flask_port = int(os.getenv('FLASK_PORT', '5000'))
-    flask_debug = os.getenv('FLASK_DEBUG', '0') == '1'
-    flask_env = os.getenv('FLASK_ENV', 'development')
-
-    print("🚀 เริ่มต้น WMS Barcode Scanner Web Application")
-    print(f"🌍 Environment: {flask_env}")
-    print(f"📱 สามารถเข้าถึงได้ที่: http://localhost:{flask_port}")
-    print(f"📱 สำหรับ Android: http://[IP_ADDRESS]:{flask_port}")
-    print("💡 ใช้ IP Address ของเครื่องนี้แทน [IP_ADDRESS]")
-    print(f"🔧 Debug mode: {'ON' if flask_debug else 'OFF'}")
+
+app = create_app()
+
+def main():
+    """Entry point สำหรับรันด้วย `python src/web/app.py`"""
+    # สร้างโฟลเดอร์ templates/static ของแอปถ้ายังไม่มี
+    for folder in (app.template_folder, app.static_folder):
+        path = os.path.join(app.root_path, folder)
+        if not os.path.isdir(path):
+            os.makedirs(path, exist_ok=True)
+
+    configure_logging()
+
+    app_config = app.config['APP_CONFIG']
+    flask_host = app_config['host']
+    flask_port = app_config['port']
+    flask_debug = app_config['debug']
+    flask_env = app_config['env']
+
+    logger.info("🚀 เริ่มต้น WMS Barcode Scanner Web Application")
+    logger.info(f"🌍 Environment: {flask_env}")
+    logger.info(f"📱 สามารถเข้าถึงได้ที่: http://localhost:{flask_port}")
+    logger.info(f"📱 สำหรับ Android: http://[IP_ADDRESS]:{flask_port}")
+    logger.info("💡 ใช้ IP Address ของเครื่องนี้แทน [IP_ADDRESS]")
+    logger.info(f"🔧 Debug mode: {'ON' if flask_debug else 'OFF'}")
 
     # เริ่มต้นการเชื่อมต่อฐานข้อมูล
-    print("🔗 กำลังเชื่อมต่อฐานข้อมูล...")
+    logger.info("🔗 กำลังเชื่อมต่อฐานข้อมูล...")
     if initialize_database():
-        print("✅ พร้อมใช้งาน - ฐานข้อมูลเชื่อมต่อสำเร็จ")
+        logger.info("✅ พร้อมใช้งาน - ฐานข้อมูลเชื่อมต่อสำเร็จ")
     else:
-        print("⚠️ แอปพลิเคชันจะทำงานในโหมด Offline")
+        logger.warning("⚠️ แอปพลิเคชันจะทำงานในโหมด Offline")
+
+    app.run(host=flask_host, port=flask_port, debug=flask_debug)
 
-    app.run(host=flask_host, port=flask_port, debug=flask_debug) 
\ No newline at end of file
+if __name__ == '__main__':
+    main()
@@ -8,9 +8,17 @@ This module tests the database manager functionality including:
 - Error handling
 """
 import pytest
+from collections import OrderedDict
 from unittest.mock import Mock, MagicMock, patch, call
 import pyodbc
 
+from src.exceptions import (
+    ConfigurationException,
+    ConnectionException,
+    DatabaseException,
+    QueryException,
+)
+
 
 @pytest.fixture
 def mock_connection_config():
@@ -90,7 +98,39 @@ class TestDatabaseManagerConnection:
         result = db.test_connection()
 
         assert result is False
-        mock_messagebox.assert_called_once()
+        # The caller decides how to report it
+        mock_messagebox.assert_not_called()
+
+    @patch('src.database.database_manager.pyodbc.connect')
+    def test_ensure_connection_skips_probe_after_recent_query(self, mock_connect, mock_connection_config):
+        """Test a recent successful query stands in for a connection test"""
+        from src.database.database_manager import DatabaseManager
+
+        mock_cursor = MagicMock()
+        mock_cursor.description = [('id',)]
+        mock_cursor.fetchmany.side_effect = [[(1,)], []]
+        mock_connect.return_value.__enter__.return_value.cursor.return_value = mock_cursor
+
+        db = DatabaseManager()
+        db.execute_query("SELECT id FROM test")
+
+        assert db.ensure_connection() is True
+        mock_connect.assert_called_once()
+
+    @patch('src.database.database_manager.pyodbc.connect')
+    def test_ensure_connection_probes_when_idle(self, mock_connect, mock_connection_config):
+        """Test the connection is tested again once it has been idle too long"""
+        from src.database.database_manager import DatabaseManager
+        from src import constants
+
+        db = DatabaseManager()
+        with patch('src.database.database_manager.time.monotonic', return_value=1000.0):
+            assert db.test_connection() is True
+        later = 1000.0 + constants.CONNECTION_VALIDATE_IDLE_SECONDS
+        with patch('src.database.database_manager.time.monotonic', return_value=later):
+            assert db.ensure_connection() is True
+
+        assert mock_connect.call_count == 2
 
 
 @pytest.mark.unit
@@ -106,10 +146,10 @@ class TestDatabaseManagerQueries:
         # Setup mock cursor with results
         mock_cursor = MagicMock()
         mock_cursor.description = [('id',), ('name',)]
-        mock_cursor.fetchall.return_value = [
+        mock_cursor.fetchmany.side_effect = [[
             (1, 'Test1'),
             (2, 'Test2')
-        ]
+        ], []]
 
         mock_conn = MagicMock()
         mock_conn.cursor.return_value = mock_cursor
@@ -130,7 +170,7 @@ class TestDatabaseManagerQueries:
 
         mock_cursor = MagicMock()
         mock_cursor.description = [('count',)]
-        mock_cursor.fetchall.return_value = [(5,)]
+        mock_cursor.fetchmany.side_effect = [[(5,)], []]
 
         mock_conn = MagicMock()
         mock_conn.cursor.return_value = mock_cursor
@@ -145,6 +185,71 @@ class TestDatabaseManagerQueries:
             (1,)
         )
 
+    @patch('src.database.database_manager.pyodbc.connect')
+    def test_execute_query_tuples(self, mock_connect, mock_connection_config):
+        """Test query execution returning positional rows"""
+        from src.database.database_manager import DatabaseManager
+
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = [(1, 'Test1'), (2, 'Test2')]
+
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value = mock_cursor
+        mock_connect.return_value.__enter__.return_value = mock_conn
+
+        db = DatabaseManager()
+        results = db.execute_query_tuples("SELECT id, name FROM test WHERE id > ?", (0,))
+
+        assert results == [(1, 'Test1'), (2, 'Test2')]
+        mock_cursor.execute.assert_called_once_with("SELECT id, name FROM test WHERE id > ?", (0,))
+
+    @patch('src.database.database_manager.pyodbc.connect')
+    @patch('tkinter.messagebox.showerror')
+    def test_execute_query_tuples_error(self, mock_messagebox, mock_connect, mock_connection_config):
+        """Test tuple query error handling matches execute_query"""
+        from src.database.database_manager import DatabaseManager
+
+        mock_connect.side_effect = Exception("Query error")
+
+        db = DatabaseManager()
+        with pytest.raises(ConnectionException):
+            db.execute_query_tuples("SELECT 1")
+        mock_messagebox.assert_not_called()
+
+    @patch('src.database.database_manager.pyodbc.connect')
+    def test_execute_query_iter(self, mock_connect, mock_connection_config):
+        """Test rows are streamed from the cursor in batches"""
+        from src.database.database_manager import DatabaseManager
+
+        mock_cursor = MagicMock()
+        mock_cursor.fetchmany.side_effect = [[(1, 'A'), (2, 'B')], [(3, 'C')], []]
+
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value = mock_cursor
+        mock_connect.return_value.__enter__.return_value = mock_conn
+
+        db = DatabaseManager()
+        rows = db.execute_query_iter("SELECT id, name FROM test", batch_size=2)
+
+        # Nothing runs until the generator is consumed
+        mock_cursor.execute.assert_not_called()
+        assert list(rows) == [(1, 'A'), (2, 'B'), (3, 'C')]
+        mock_cursor.fetchmany.assert_called_with(2)
+        mock_cursor.fetchall.assert_not_called()
+
+    @patch('src.database.database_manager.pyodbc.connect')
+    @patch('tkinter.messagebox.showerror')
+    def test_execute_query_iter_error(self, mock_messagebox, mock_connect, mock_connection_config):
+        """Test streaming query error handling matches execute_query"""
+        from src.database.database_manager import DatabaseManager
+
+        mock_connect.side_effect = Exception("Query error")
+
+        db = DatabaseManager()
+        with pytest.raises(ConnectionException):
+            list(db.execute_query_iter("SELECT 1"))
+        mock_messagebox.assert_not_called()
+
     @patch('src.database.database_manager.pyodbc.connect')
     @patch('tkinter.messagebox.showerror')
     def test_execute_query_error(self, mock_messagebox, mock_connect, mock_connection_config):
@@ -154,10 +259,65 @@ class TestDatabaseManagerQueries:
         mock_connect.side_effect = Exception("Query error")
 
         db = DatabaseManager()
-        results = db.execute_query("SELECT * FROM test")
+        with pytest.raises(ConnectionException) as exc_info:
+            db.execute_query("SELECT * FROM test")
+
+        assert "Query error" in str(exc_info.value)
+        assert isinstance(exc_info.value, DatabaseException)
+        mock_messagebox.assert_not_called()
+
+    @patch('src.database.database_manager.pyodbc.connect')
+    @patch('tkinter.messagebox.showerror')
+    def test_execute_query_failure_raises_query_exception(self, mock_messagebox, mock_connect, mock_connection_config):
+        """Test a failing statement raises QueryException chained to the driver error"""
+        from src.database.database_manager import DatabaseManager
+
+        driver_error = Exception("Invalid column name")
+        mock_cursor = mock_connect.return_value.__enter__.return_value.cursor.return_value
+        mock_cursor.execute.side_effect = driver_error
+
+        db = DatabaseManager()
+        with pytest.raises(QueryException) as exc_info:
+            db.execute_query("SELECT nope FROM test")
 
-        assert results == []
-        mock_messagebox.assert_called_once()
+        assert exc_info.value.__cause__ is driver_error
+        mock_messagebox.assert_not_called()
+
+
+    @patch('src.database.database_manager.pyodbc.connect')
+    def test_execute_query_row_building_matches_zip(self, mock_connect, mock_connection_config):
+        """Test generated row builders handle quotes and duplicate column names like dict(zip())"""
+        from src.database.database_manager import DatabaseManager
+
+        columns = ["id", "it's \"quoted\"", "id"]
+        rows = [(1, 'a', 2), (3, 'b', 4)]
+        mock_cursor = MagicMock()
+        mock_cursor.description = [(name,) for name in columns]
+        mock_cursor.fetchmany.side_effect = [rows, []]
+        mock_connect.return_value.__enter__.return_value.cursor.return_value = mock_cursor
+
+        db = DatabaseManager()
+        results = db.execute_query("SELECT 1")
+
+        assert results == [dict(zip(columns, row)) for row in rows]
+
+    def test_row_builder_is_cached_per_column_set(self):
+        """Test the builder is generated once for the same columns"""
+        from src.database.database_manager import _row_builder
+
+        assert _row_builder(('id', 'name')) is _row_builder(('id', 'name'))
+        assert _row_builder(('id', 'name'))((1, 'x')) == {'id': 1, 'name': 'x'}
+
+    def test_row_builder_interns_column_names(self):
+        """Test non-identifier column names share one interned key object"""
+        import sys
+        from src.database.database_manager import _row_builder
+
+        name = ''.join(['ชื่อ', ' งาน'])
+        row = _row_builder(('id', name))((1, 'x'))
+
+        assert row == {'id': 1, name: 'x'}
+        assert [key for key in row if key != 'id'][0] is sys.intern(name)
 
 
 @pytest.mark.unit
@@ -184,6 +344,35 @@ class TestDatabaseManagerNonQuery:
         mock_cursor.execute.assert_called_once()
         mock_conn.commit.assert_called_once()
 
+    @patch('src.database.database_manager.pyodbc.connect')
+    def test_execute_many_success(self, mock_connect, mock_connection_config):
+        """Test batched execution uses executemany and commits once"""
+        from src.database.database_manager import DatabaseManager
+
+        mock_cursor = MagicMock()
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value = mock_cursor
+        mock_connect.return_value.__enter__.return_value = mock_conn
+
+        db = DatabaseManager()
+        rows = [(1, 'a'), (2, 'b')]
+        rowcount = db.execute_many("INSERT INTO test VALUES (?, ?)", rows)
+
+        assert rowcount == 2
+        assert mock_cursor.fast_executemany is True
+        mock_cursor.executemany.assert_called_once_with("INSERT INTO test VALUES (?, ?)", rows)
+        mock_cursor.execute.assert_not_called()
+        mock_conn.commit.assert_called_once()
+
+    @patch('src.database.database_manager.pyodbc.connect')
+    def test_execute_many_empty(self, mock_connect, mock_connection_config):
+        """Test an empty batch does not open a connection"""
+        from src.database.database_manager import DatabaseManager
+
+        db = DatabaseManager()
+        assert db.execute_many("INSERT INTO test VALUES (?)", []) == 0
+        mock_connect.assert_not_called()
+
     @patch('src.database.database_manager.pyodbc.connect')
     @patch('tkinter.messagebox.showerror')
     def test_execute_non_query_error(self, mock_messagebox, mock_connect, mock_connection_config):
@@ -193,10 +382,9 @@ class TestDatabaseManagerNonQuery:
         mock_connect.side_effect = Exception("Insert error")
 
         db = DatabaseManager()
-        rowcount = db.execute_non_query("INSERT INTO test VALUES (?, ?)", (1, 'test'))
-
-        assert rowcount == 0
-        mock_messagebox.assert_called_once()
+        with pytest.raises(ConnectionException):
+            db.execute_non_query("INSERT INTO test VALUES (?, ?)", (1, 'test'))
+        mock_messagebox.assert_not_called()
 
 
 @pytest.mark.unit
@@ -211,7 +399,7 @@ class TestDatabaseManagerStoredProcedure:
 
         mock_cursor = MagicMock()
         mock_cursor.description = [('result',)]
-        mock_cursor.fetchall.return_value = [('success',)]
+        mock_cursor.fetchmany.side_effect = [[('success',)], []]
 
         mock_conn = MagicMock()
         mock_conn.cursor.return_value = mock_cursor
@@ -224,6 +412,14 @@ class TestDatabaseManagerStoredProcedure:
         assert results[0]['result'] == 'success'
         mock_cursor.execute.assert_called_once()
 
+    def test_sp_call_sql_is_cached(self):
+        """Test the EXEC text is built once per procedure and parameter count"""
+        from src.database.database_manager import _sp_call_sql
+
+        assert _sp_call_sql('sp_test', 2) == "EXEC sp_test ?,?"
+        assert _sp_call_sql('sp_test', 0) == "EXEC sp_test "
+        assert _sp_call_sql('sp_test', 2) is _sp_call_sql('sp_test', 2)
+
     @patch('src.database.database_manager.pyodbc.connect')
     @patch('tkinter.messagebox.showerror')
     def test_execute_sp_error(self, mock_messagebox, mock_connect, mock_connection_config):
@@ -233,10 +429,474 @@ class TestDatabaseManagerStoredProcedure:
         mock_connect.side_effect = Exception("SP error")
 
         db = DatabaseManager()
-        results = db.execute_sp("sp_test", (1,))
+        with pytest.raises(ConnectionException):
+            db.execute_sp("sp_test", (1,))
+        mock_messagebox.assert_not_called()
+
+
+@pytest.mark.unit
+@pytest.mark.database
+class TestDatabaseManagerConnectionReuse:
+    """Test queries reuse idle connections instead of reconnecting"""
+
+    @patch('src.database.database_manager.pyodbc.connect')
+    def test_queries_reuse_one_connection(self, mock_connect, mock_connection_config):
+        """Test consecutive queries share a pooled connection"""
+        from src.database.database_manager import DatabaseManager
+
+        mock_cursor = mock_connect.return_value.__enter__.return_value.cursor.return_value
+        mock_cursor.description = [('id',)]
+        mock_cursor.fetchmany.side_effect = [[(1,)], [], [(1,)], []]
+
+        db = DatabaseManager()
+        db.execute_query("SELECT id FROM test")
+        db.execute_non_query("UPDATE test SET id = 1")
+        db.execute_query("SELECT id FROM test")
+
+        mock_connect.assert_called_once_with(db.connection_string)
+
+    @patch('tkinter.messagebox.showerror')
+    @patch('src.database.database_manager.pyodbc.connect')
+    def test_failed_query_discards_connection(self, mock_connect, mock_messagebox, mock_connection_config):
+        """Test a connection that raised is closed and not reused"""
+        from src.database.database_manager import DatabaseManager
+
+        mock_cursor = mock_connect.return_value.__enter__.return_value.cursor.return_value
+        mock_cursor.execute.side_effect = [Exception("Connection lost"), None]
+        mock_cursor.description = [('id',)]
+        mock_cursor.fetchmany.return_value = []
+
+        db = DatabaseManager()
+        with pytest.raises(QueryException):
+            db.execute_query("SELECT id FROM test")
+        db.execute_query("SELECT id FROM test")
+
+        assert mock_connect.call_count == 2
+        mock_connect.return_value.close.assert_called_once()
+
+    @patch('src.database.database_manager.pyodbc.connect')
+    def test_idle_connection_is_replaced(self, mock_connect, mock_connection_config):
+        """Test a connection idle longer than the threshold is not reused"""
+        from src.database.database_manager import DatabaseManager
+        from src import constants
+
+        db = DatabaseManager()
+        with patch('src.database.database_manager.time.monotonic', return_value=1000.0):
+            db.execute_non_query("UPDATE test SET id = 1")
+        later = 1000.0 + constants.CONNECTION_VALIDATE_IDLE_SECONDS
+        with patch('src.database.database_manager.time.monotonic', return_value=later):
+            db.execute_non_query("UPDATE test SET id = 1")
+
+        assert mock_connect.call_count == 2
+        mock_connect.return_value.close.assert_called_once()
+
+    def test_release_expires_old_idle_connections(self, mock_connection_config):
+        """Test returning a connection closes only the idle ones past the threshold"""
+        from src.database.database_manager import DatabaseManager
+        from src import constants
+
+        db = DatabaseManager()
+        old, recent, returned = MagicMock(), MagicMock(), MagicMock()
+        with patch('src.database.database_manager.time.monotonic', return_value=1000.0):
+            db._release_connection(db.connection_string, old, OrderedDict())
+        with patch('src.database.database_manager.time.monotonic', return_value=1010.0):
+            db._release_connection(db.connection_string, recent, OrderedDict())
+        later = 1000.0 + constants.CONNECTION_VALIDATE_IDLE_SECONDS
+        with patch('src.database.database_manager.time.monotonic', return_value=later):
+            db._release_connection(db.connection_string, returned, OrderedDict())
+
+        old.close.assert_called_once()
+        recent.close.assert_not_called()
+        assert [entry[2] for entry in db._idle_connections] == [recent, returned]
+
+    def test_release_into_full_pool_drops_oldest(self, mock_connection_config):
+        """Test a full pool keeps the most recently returned connections"""
+        from src.database.database_manager import DatabaseManager
+        from src import constants
+
+        db = DatabaseManager()
+        connections = [MagicMock() for _ in range(constants.DB_POOL_MAX_IDLE + 1)]
+        for conn in connections:
+            db._release_connection(db.connection_string, conn, OrderedDict())
+
+        connections[0].close.assert_called_once()
+        assert [entry[2] for entry in db._idle_connections] == connections[1:]
+
+    @patch('src.database.database_manager.pyodbc.connect')
+    def test_repeated_query_reuses_cursor(self, mock_connect, mock_connection_config):
+        """Test the same SQL text runs again on its already prepared cursor"""
+        from src.database.database_manager import DatabaseManager
+
+        conn = mock_connect.return_value.__enter__.return_value
+        conn.cursor.side_effect = lambda: MagicMock(description=None)
+
+        db = DatabaseManager()
+        db.execute_non_query("UPDATE test SET id = ?", (1,))
+        db.execute_non_query("UPDATE test SET id = ?", (2,))
+        db.execute_non_query("DELETE FROM test WHERE id = ?", (1,))
+
+        assert conn.cursor.call_count == 2
+
+    @patch('src.database.database_manager.pyodbc.connect')
+    def test_statement_cache_is_bounded(self, mock_connect, mock_connection_config):
+        """Test the least recently used cursor is closed when the cache is full"""
+        from src.database.database_manager import DatabaseManager
+        from src import constants
+
+        conn = mock_connect.return_value.__enter__.return_value
+        cursors = []
+        def new_cursor():
+            cursors.append(MagicMock(description=None))
+            return cursors[-1]
+        conn.cursor.side_effect = new_cursor
+
+        db = DatabaseManager()
+        for index in range(constants.DB_STATEMENT_CACHE_SIZE + 1):
+            db.execute_non_query(f"UPDATE test SET id = {index}")
+
+        cursors[0].close.assert_called_once()
+        cursors[1].close.assert_not_called()
+
+    @patch('src.database.database_manager.threading.Timer')
+    def test_sweep_closes_expired_connections_without_queries(self, mock_timer, mock_connection_config):
+        """Test the idle sweep timer closes expired connections and re-arms only while needed"""
+        from src.database.database_manager import DatabaseManager
+        from src import constants
+
+        db = DatabaseManager()
+        old, recent = MagicMock(), MagicMock()
+        with patch('src.database.database_manager.time.monotonic', return_value=1000.0):
+            db._release_connection(db.connection_string, old, OrderedDict())
+        with patch('src.database.database_manager.time.monotonic', return_value=1010.0):
+            db._release_connection(db.connection_string, recent, OrderedDict())
+
+        # One timer for the whole pool, armed when the first connection went idle
+        mock_timer.assert_called_once_with(
+            constants.CONNECTION_VALIDATE_IDLE_SECONDS, db._sweep_idle_connections
+        )
+
+        later = 1000.0 + constants.CONNECTION_VALIDATE_IDLE_SECONDS
+        with patch('src.database.database_manager.time.monotonic', return_value=later):
+            db._sweep_idle_connections()
+
+        old.close.assert_called_once()
+        recent.close.assert_not_called()
+        # Re-armed for the moment the remaining connection expires
+        assert mock_timer.call_args[0][0] == pytest.approx(10.0)
+
+        with patch('src.database.database_manager.time.monotonic', return_value=later + 10.0):
+            db._sweep_idle_connections()
+
+        recent.close.assert_called_once()
+        assert mock_timer.call_count == 2
+        assert db._sweep_timer is None
+
+    @patch('src.database.database_manager.threading.Timer')
+    def test_sweep_timer_starts_outside_pool_lock(self, mock_timer, mock_connection_config):
+        """Test the sweep thread is started after the pool lock is released"""
+        from src.database.database_manager import DatabaseManager
+
+        db = DatabaseManager()
+        lock_held = []
+        mock_timer.return_value.start.side_effect = lambda: lock_held.append(db._pool_lock.locked())
 
-        assert results == []
-        mock_messagebox.assert_called_once()
+        db._release_connection(db.connection_string, MagicMock(), OrderedDict())
+
+        assert lock_held == [False]
+
+    @patch('src.database.database_manager.pyodbc.connect')
+    def test_warm_up_fills_pool(self, mock_connect, mock_connection_config):
+        """Test warm_up opens the missing connections and queries reuse them"""
+        from src.database.database_manager import DatabaseManager
+        from src import constants
+
+        mock_connect.side_effect = lambda cs: MagicMock()
+
+        db = DatabaseManager()
+        assert db.warm_up() == constants.DB_POOL_MAX_IDLE
+        assert db.warm_up() == 0
+        db.execute_non_query("UPDATE test SET id = 1")
+        db.close_connections()
+
+        assert mock_connect.call_count == constants.DB_POOL_MAX_IDLE
+
+    @patch('src.database.database_manager.pyodbc.connect')
+    def test_warm_up_skips_failed_connections(self, mock_connect, mock_connection_config):
+        """Test warm_up keeps the connections that opened and ignores failures"""
+        from src.database.database_manager import DatabaseManager
+
+        mock_connect.side_effect = [MagicMock(), Exception("Login timeout")]
+
+        db = DatabaseManager()
+        assert db.warm_up(2) == 1
+        assert len(db._idle_connections) == 1
+        db.close_connections()
+
+    @patch('src.database.database_manager.threading.Timer')
+    def test_close_connections_cancels_sweep(self, mock_timer, mock_connection_config):
+        """Test shutdown cancels the pending sweep timer"""
+        from src.database.database_manager import DatabaseManager
+
+        db = DatabaseManager()
+        db._release_connection(db.connection_string, MagicMock(), OrderedDict())
+        db.close_connections()
+
+        mock_timer.return_value.cancel.assert_called_once()
+        assert db._sweep_timer is None
+
+    def test_pool_stats_do_not_take_pool_lock(self, mock_connection_config):
+        """Test stats can be read while another thread holds the pool lock"""
+        from src.database.database_manager import DatabaseManager
+        from src import constants
+
+        db = DatabaseManager()
+        db._idle_connections.append((db.connection_string, 0.0, MagicMock(), OrderedDict()))
+
+        with db._pool_lock:
+            stats = db.get_pool_stats()
+
+        assert stats['idle_connections'] == 1
+        assert stats['max_idle_connections'] == constants.DB_POOL_MAX_IDLE
+        assert stats['borrowed_connections'] == 0
+        assert stats['seconds_since_success'] is None
+
+    @patch('src.database.database_manager.pyodbc.connect')
+    def test_close_connections(self, mock_connect, mock_connection_config):
+        """Test idle connections are closed on shutdown"""
+        from src.database.database_manager import DatabaseManager
+
+        db = DatabaseManager()
+        db.execute_non_query("UPDATE test SET id = 1")
+        db.close_connections()
+        db.execute_non_query("UPDATE test SET id = 1")
+
+        mock_connect.return_value.close.assert_called_once()
+        assert mock_connect.call_count == 2
+
+
+@pytest.mark.unit
+@pytest.mark.database
+class TestDatabaseManagerScopedSession:
+    """Test connections pinned to a thread for the length of a scope"""
+
+    @patch('src.database.database_manager.pyodbc.connect')
+    def test_session_skips_pool_between_queries(self, mock_connect, mock_connection_config):
+        """Test queries in one scope reuse the pinned connection without touching the pool"""
+        from src.database.database_manager import DatabaseManager
+
+        db = DatabaseManager()
+        with patch.object(db, '_release_connection', wraps=db._release_connection) as release:
+            with db.scoped_session():
+                db.execute_non_query("UPDATE test SET id = 1")
+                db.execute_non_query("UPDATE test SET id = 2")
+                assert release.call_count == 0
+                assert len(db._idle_connections) == 0
+            release.assert_called_once()
+
+        mock_connect.assert_called_once()
+        assert len(db._idle_connections) == 1
+
+    @patch('src.database.database_manager.pyodbc.connect')
+    def test_session_without_queries_opens_nothing(self, mock_connect, mock_connection_config):
+        """Test a scope with no queries does not borrow a connection"""
+        from src.database.database_manager import DatabaseManager
+
+        db = DatabaseManager()
+        with db.scoped_session():
+            pass
+
+        mock_connect.assert_not_called()
+
+    @patch('src.database.database_manager.pyodbc.connect')
+    def test_session_drops_failed_connection(self, mock_connect, mock_connection_config):
+        """Test a pinned connection that raised is replaced on the next query"""
+        from src.database.database_manager import DatabaseManager
+
+        mock_cursor = mock_connect.return_value.__enter__.return_value.cursor.return_value
+        mock_cursor.execute.side_effect = [Exception("Connection lost"), None]
+
+        db = DatabaseManager()
+        with db.scoped_session():
+            with pytest.raises(QueryException):
+                db.execute_non_query("UPDATE test SET id = 1")
+            db.execute_non_query("UPDATE test SET id = 1")
+
+        assert mock_connect.call_count == 2
+        mock_connect.return_value.close.assert_called_once()
+
+    @patch('src.database.database_manager.pyodbc.connect')
+    def test_nested_session_uses_outer_scope(self, mock_connect, mock_connection_config):
+        """Test an inner scope does not return the connection early"""
+        from src.database.database_manager import DatabaseManager
+
+        db = DatabaseManager()
+        with db.scoped_session():
+            with db.scoped_session():
+                db.execute_non_query("UPDATE test SET id = 1")
+            assert len(db._idle_connections) == 0
+            db.execute_non_query("UPDATE test SET id = 2")
+
+        mock_connect.assert_called_once()
+        assert len(db._idle_connections) == 1
+
+
+@pytest.mark.unit
+@pytest.mark.database
+class TestDatabaseManagerPrepared:
+    """Test prepared statements on a persistent connection"""
+
+    @patch('src.database.database_manager.pyodbc.connect')
+    def test_prepared_statement_reuses_connection(self, mock_connect, mock_connection_config):
+        """Test repeated calls reuse one connection and cursor"""
+        from src.database.database_manager import DatabaseManager
+
+        mock_cursor = mock_connect.return_value.cursor.return_value
+        mock_cursor.description = None
+        mock_cursor.rowcount = 1
+
+        db = DatabaseManager()
+        statement = db.prepare('ins', "INSERT INTO test VALUES (?)")
+
+        assert statement((1,)) == 1
+        assert db.prepare('ins', "INSERT INTO test VALUES (?)") is statement
+        assert statement((2,)) == 1
+
+        mock_connect.assert_called_once()
+        assert mock_cursor.execute.call_count == 2
+        assert mock_connect.return_value.commit.call_count == 2
+
+    @patch('src.database.database_manager.pyodbc.connect')
+    def test_prepared_select_returns_dicts(self, mock_connect, mock_connection_config):
+        """Test SELECT statements return rows as dictionaries"""
+        from src.database.database_manager import DatabaseManager
+
+        mock_cursor = mock_connect.return_value.cursor.return_value
+        mock_cursor.description = [('id',), ('name',)]
+        mock_cursor.fetchmany.side_effect = [[(1, 'a')], []]
+
+        db = DatabaseManager()
+        rows = db.prepare('sel', "SELECT id, name FROM test WHERE id = ?")((1,))
+
+        assert rows == [{'id': 1, 'name': 'a'}]
+        mock_connect.return_value.commit.assert_not_called()
+
+    @patch('src.database.database_manager.pyodbc.connect')
+    def test_prepared_statement_reconnects_after_error(self, mock_connect, mock_connection_config):
+        """Test a failed call raises and the next call opens a new connection"""
+        from src.database.database_manager import DatabaseManager
+
+        mock_cursor = mock_connect.return_value.cursor.return_value
+        mock_cursor.description = None
+        mock_cursor.execute.side_effect = [Exception("Connection lost"), None]
+
+        db = DatabaseManager()
+        statement = db.prepare('ins', "INSERT INTO test VALUES (?)")
+
+        with pytest.raises(Exception):
+            statement((1,))
+        statement((1,))
+
+        assert mock_connect.call_count == 2
+        mock_connect.return_value.close.assert_called_once()
+
+    @patch('src.database.database_manager.pyodbc.connect')
+    def test_prepared_statement_expires_idle_connection(self, mock_connect, mock_connection_config):
+        """Test a connection idle past the threshold is closed instead of reused"""
+        from src.database.database_manager import DatabaseManager
+        from src import constants
+
+        db = DatabaseManager()
+        statement = db.prepare('ins', "INSERT INTO test VALUES (?)")
+        old, new = MagicMock(), MagicMock()
+        mock_connect.side_effect = [old, new]
+        old.cursor.return_value.description = None
+        new.cursor.return_value.description = None
+
+        with patch('src.database.database_manager.time.monotonic', return_value=1000.0):
+            statement((1,))
+        later = 1000.0 + constants.CONNECTION_VALIDATE_IDLE_SECONDS
+        with patch('src.database.database_manager.time.monotonic', return_value=later):
+            statement((2,))
+
+        old.close.assert_called_once()
+        new.cursor.return_value.execute.assert_called_once_with("INSERT INTO test VALUES (?)", (2,))
+
+    @patch('src.database.database_manager.pyodbc.connect')
+    def test_prepared_statement_retries_dropped_idle_connection(self, mock_connect, mock_connection_config):
+        """Test a failure on a reused connection is retried once on a fresh one"""
+        from src.database.database_manager import DatabaseManager
+
+        db = DatabaseManager()
+        statement = db.prepare('ins', "INSERT INTO test VALUES (?)")
+        dropped, fresh = MagicMock(), MagicMock()
+        mock_connect.side_effect = [dropped, fresh]
+        dropped.cursor.return_value.description = None
+        fresh.cursor.return_value.description = None
+        fresh.cursor.return_value.rowcount = 1
+
+        statement((1,))
+        dropped.cursor.return_value.execute.side_effect = Exception("Communication link failure")
+
+        assert statement((2,)) == 1
+        dropped.close.assert_called_once()
+        fresh.cursor.return_value.execute.assert_called_once_with("INSERT INTO test VALUES (?)", (2,))
+
+    @patch('src.database.database_manager.pyodbc.connect')
+    def test_prepared_statement_idle_list_is_bounded(self, mock_connect, mock_connection_config):
+        """Test at most DB_POOL_MAX_IDLE connections are kept per statement"""
+        from src.database.database_manager import DatabaseManager
+        from src import constants
+
+        db = DatabaseManager()
+        statement = db.prepare('ins', "INSERT INTO test VALUES (?)")
+        for _ in range(constants.DB_POOL_MAX_IDLE + 1):
+            statement._release(statement._open(db.connection_string))
+
+        assert len(statement._idle) == constants.DB_POOL_MAX_IDLE
+        statement.close()
+
+    @patch('src.database.database_manager.pyodbc.connect')
+    def test_prepared_statement_concurrent_call_opens_second_connection(self, mock_connect, mock_connection_config):
+        """Test a call made while another is running does not wait for it"""
+        from src.database.database_manager import DatabaseManager
+
+        db = DatabaseManager()
+        statement = db.prepare('ins', "INSERT INTO test VALUES (?)")
+        first = MagicMock()
+        second = MagicMock()
+        mock_connect.side_effect = [first, second]
+        first.cursor.return_value.description = None
+        second.cursor.return_value.description = None
+
+        # while the first call is still executing, run another one
+        first.cursor.return_value.execute.side_effect = lambda *args: statement((2,))
+        statement((1,))
+
+        assert mock_connect.call_count == 2
+        second.cursor.return_value.execute.assert_called_once_with("INSERT INTO test VALUES (?)", (2,))
+        # both connections are kept for reuse
+        statement((3,))
+        assert mock_connect.call_count == 2
+
+    @patch('src.database.database_manager.pyodbc.connect')
+    def test_prepared_statement_drops_connection_on_new_connection_string(self, mock_connect, mock_connection_config):
+        """Test idle connections for an old connection string are closed"""
+        from src.database.database_manager import DatabaseManager
+
+        db = DatabaseManager()
+        statement = db.prepare('ins', "INSERT INTO test VALUES (?)")
+        old = MagicMock()
+        new = MagicMock()
+        mock_connect.side_effect = [old, new]
+        old.cursor.return_value.description = None
+        new.cursor.return_value.description = None
+
+        statement((1,))
+        db.connection_string = "other_connection_string"
+        statement((2,))
+
+        old.close.assert_called_once()
+        mock_connect.assert_called_with("other_connection_string")
 
 
 @pytest.mark.unit
@@ -282,7 +942,6 @@ class TestDatabaseManagerConfiguration:
         db.config_manager.update_config.side_effect = Exception("Update error")
 
         new_config = {'server': 'new-server'}
-        result = db.update_connection(new_config)
-
-        assert result is False
-        mock_messagebox.assert_called_once()
+        with pytest.raises(ConfigurationException):
+            db.update_connection(new_config)
+        mock_messagebox.assert_not_called()
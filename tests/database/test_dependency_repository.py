@@ -63,6 +63,25 @@ class TestDependencyRepositoryBasics:
 
         assert len(results) == 0
 
+    def test_get_missing_required_jobs(self, dependency_repo, mock_db_manager):
+        """Test missing dependencies come from one prepared set-based query"""
+        statement = mock_db_manager.prepare.return_value
+        statement.return_value = [
+            {'required_job_id': 2, 'job_name': 'QC'}
+        ]
+
+        results = dependency_repo.get_missing_required_jobs(job_id=3, barcode='BC123', hours=48)
+
+        assert results == [{'required_job_id': 2, 'job_name': 'QC'}]
+        statement.assert_called_once_with((3, 'BC123', -48))
+        mock_db_manager.execute_query.assert_not_called()
+
+        # Verify scans are checked inside the same query
+        name, query = mock_db_manager.prepare.call_args[0]
+        assert name == 'missing_required_jobs'
+        assert "NOT EXISTS" in query
+        assert "sl.job_id = jd.required_job_id" in query
+
 
 @pytest.mark.unit
 @pytest.mark.database
@@ -87,7 +106,8 @@ class TestDependencyRepositoryScanStatus:
 
         # Verify query checks today's date
         call_args = mock_db_manager.execute_query.call_args[0]
-        assert "CAST(scan_date AS DATE) = CAST(GETDATE() AS DATE)" in call_args[0]
+        assert "scan_date >= CAST(GETDATE() AS DATE)" in call_args[0]
+        assert "scan_date < DATEADD(day, 1, CAST(GETDATE() AS DATE))" in call_args[0]
 
     def test_get_required_job_with_scan_status_all_time(self, dependency_repo, mock_db_manager):
         """Test getting required jobs with all-time scan status"""
@@ -165,6 +185,27 @@ class TestDependencyRepositoryManagement:
         assert "GETDATE()" in call_args[0]
         assert call_args[1] == (3, 1)
 
+    def test_add_dependencies_batches_rows(self, dependency_repo, mock_db_manager):
+        """Test adding several dependencies in one executemany call"""
+        mock_db_manager.execute_many.return_value = 2
+
+        rowcount = dependency_repo.add_dependencies(3, [1, 2])
+
+        assert rowcount == 2
+        query, rows = mock_db_manager.execute_many.call_args[0]
+        assert "INSERT INTO job_dependencies" in query
+        assert rows == [(3, 1), (3, 2)]
+        mock_db_manager.execute_non_query.assert_not_called()
+
+    def test_get_dependent_job_ids(self, dependency_repo, mock_db_manager):
+        """Test getting the jobs that require a job"""
+        mock_db_manager.execute_query.return_value = [{'job_id': 4}, {'job_id': 5}]
+
+        assert dependency_repo.get_dependent_job_ids(1) == [4, 5]
+        query, params = mock_db_manager.execute_query.call_args[0]
+        assert "WHERE required_job_id = ?" in query
+        assert params == (1,)
+
     def test_remove_dependency(self, dependency_repo, mock_db_manager):
         """Test removing a specific dependency"""
         mock_db_manager.execute_non_query.return_value = 1
@@ -213,7 +254,7 @@ class TestDependencyRepositoryManagement:
 
     def test_dependency_exists_true(self, dependency_repo, mock_db_manager):
         """Test checking if dependency exists (returns true)"""
-        mock_db_manager.execute_query.return_value = [{'count': 1}]
+        mock_db_manager.execute_query.return_value = [{'found': 1}]
 
         exists = dependency_repo.dependency_exists(job_id=3, required_job_id=1)
 
@@ -224,16 +265,28 @@ class TestDependencyRepositoryManagement:
         call_args = mock_db_manager.execute_query.call_args[0]
         assert "job_id = ?" in call_args[0]
         assert "required_job_id = ?" in call_args[0]
+        assert "EXISTS" in call_args[0]
         assert call_args[1] == (3, 1)
 
     def test_dependency_exists_false(self, dependency_repo, mock_db_manager):
         """Test checking if dependency exists (returns false)"""
-        mock_db_manager.execute_query.return_value = [{'count': 0}]
+        mock_db_manager.execute_query.return_value = [{'found': 0}]
 
         exists = dependency_repo.dependency_exists(job_id=3, required_job_id=1)
 
         assert exists is False
 
+    def test_guard_checks_are_not_cached(self, dependency_repo, mock_db_manager):
+        """Test cycle/duplicate checks see dependencies added by other processes"""
+        mock_db_manager.execute_query.side_effect = [
+            [{'found': 0}], [{'found': 1}], [], [{'job_id': 3}]
+        ]
+
+        assert dependency_repo.dependency_exists(job_id=3, required_job_id=1) is False
+        assert dependency_repo.validate_no_circular_dependency(1, 3) is False
+        assert dependency_repo.get_dependent_job_ids(1) == []
+        assert dependency_repo.get_dependent_job_ids(1) == [3]
+
 
 @pytest.mark.unit
 @pytest.mark.database
@@ -301,7 +354,7 @@ class TestDependencyRepositoryValidation:
     def test_validate_no_circular_dependency_valid(self, dependency_repo, mock_db_manager):
         """Test validation when no circular dependency exists"""
         # No reverse dependency found
-        mock_db_manager.execute_query.return_value = [{'count': 0}]
+        mock_db_manager.execute_query.return_value = [{'found': 0}]
 
         is_valid = dependency_repo.validate_no_circular_dependency(
             job_id=1,
@@ -318,7 +371,7 @@ class TestDependencyRepositoryValidation:
     def test_validate_no_circular_dependency_invalid(self, dependency_repo, mock_db_manager):
         """Test validation when circular dependency would be created"""
         # Reverse dependency exists
-        mock_db_manager.execute_query.return_value = [{'count': 1}]
+        mock_db_manager.execute_query.return_value = [{'found': 1}]
 
         is_valid = dependency_repo.validate_no_circular_dependency(
             job_id=1,
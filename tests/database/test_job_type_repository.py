@@ -66,7 +66,7 @@ class TestJobTypeRepositoryBasics:
         assert result is not None
         assert result['job_name'] == 'Inbound'
         mock_db_manager.execute_query.assert_called_once_with(
-            "SELECT * FROM job_types WHERE id = ?",
+            "SELECT id, job_name FROM job_types WHERE id = ?",
             (1,)
         )
 
@@ -124,19 +124,21 @@ class TestJobTypeRepositoryCreate:
 
     def test_job_name_exists_true(self, job_type_repo, mock_db_manager):
         """Test checking if job name exists (returns true)"""
-        mock_db_manager.execute_query.return_value = [{'count': 1}]
+        mock_db_manager.execute_query.return_value = [{'found': 1}]
 
         exists = job_type_repo.job_name_exists('Inbound')
 
         assert exists is True
-        mock_db_manager.execute_query.assert_called_once_with(
-            "SELECT COUNT(*) as count FROM job_types WHERE job_name = ?",
-            ('Inbound',)
-        )
+        mock_db_manager.execute_query.assert_called_once()
+        query, params = mock_db_manager.execute_query.call_args[0]
+        assert "EXISTS" in query
+        assert "COUNT(*)" not in query
+        assert "WHERE job_name = ?" in query
+        assert params == ('Inbound',)
 
     def test_job_name_exists_false(self, job_type_repo, mock_db_manager):
         """Test checking if job name exists (returns false)"""
-        mock_db_manager.execute_query.return_value = [{'count': 0}]
+        mock_db_manager.execute_query.return_value = [{'found': 0}]
 
         exists = job_type_repo.job_name_exists('NonExistent')
 
@@ -144,15 +146,16 @@ class TestJobTypeRepositoryCreate:
 
     def test_job_name_exists_exclude_id(self, job_type_repo, mock_db_manager):
         """Test checking if job name exists with ID exclusion"""
-        mock_db_manager.execute_query.return_value = [{'count': 0}]
+        mock_db_manager.execute_query.return_value = [{'found': 0}]
 
         exists = job_type_repo.job_name_exists('Inbound', exclude_id=1)
 
         assert exists is False
-        mock_db_manager.execute_query.assert_called_once_with(
-            "SELECT COUNT(*) as count FROM job_types WHERE job_name = ? AND id != ?",
-            ('Inbound', 1)
-        )
+        mock_db_manager.execute_query.assert_called_once()
+        query, params = mock_db_manager.execute_query.call_args[0]
+        assert "EXISTS" in query
+        assert "WHERE job_name = ? AND id != ?" in query
+        assert params == ('Inbound', 1)
 
 
 @pytest.mark.unit
@@ -236,3 +239,193 @@ class TestJobTypeRepositoryTableManagement:
         result = job_type_repo.ensure_table_exists()
 
         assert result is False
+
+
+@pytest.mark.unit
+@pytest.mark.database
+class TestJobTypeRepositoryBaseQueries:
+    """Test the generic BaseRepository helpers through JobTypeRepository"""
+
+    def test_find_where_builds_query(self, job_type_repo, mock_db_manager):
+        """Test find_where uses placeholders and the requested ORDER BY"""
+        job_type_repo.find_where({'job_name': 'A'}, order_by='job_name DESC')
+
+        query, params = mock_db_manager.execute_query.call_args[0]
+        assert query == "SELECT id, job_name FROM job_types WHERE job_name = ? ORDER BY job_name DESC"
+        assert params == ('A',)
+
+    def test_same_shape_reuses_query_text(self, job_type_repo, mock_db_manager):
+        """Test identical calls reuse the same built SQL string"""
+        job_type_repo.count({'job_name': 'A'})
+        job_type_repo.count({'job_name': 'B'})
+
+        first, second = [c[0][0] for c in mock_db_manager.execute_query.call_args_list]
+        assert first is second
+
+    def test_find_all_rejects_unsafe_order_by(self, job_type_repo, mock_db_manager):
+        """Test ORDER BY must be a plain column name"""
+        with pytest.raises(ValueError):
+            job_type_repo.find_all(order_by='id; DROP TABLE job_types')
+
+        mock_db_manager.execute_query.assert_not_called()
+
+    def test_exists_without_conditions(self, job_type_repo, mock_db_manager):
+        """Test exists({}) checks for any row instead of building an empty WHERE"""
+        mock_db_manager.execute_query.return_value = [{'found': 1}]
+
+        assert job_type_repo.exists({}) is True
+
+        query, params = mock_db_manager.execute_query.call_args[0]
+        assert query == (
+            "SELECT CASE WHEN EXISTS (SELECT 1 FROM job_types) THEN 1 ELSE 0 END as found"
+        )
+        assert params == ()
+
+    def test_delete_requires_conditions(self):
+        """Test a DELETE without key columns is refused"""
+        from src.database.base_repository import _build_sql
+
+        with pytest.raises(ValueError):
+            _build_sql('delete', 'job_types')
+
+    def test_update_rejects_unsafe_column(self, job_type_repo, mock_db_manager):
+        """Test column names are validated before building SQL"""
+        with pytest.raises(ValueError):
+            job_type_repo.update(1, {'job_name = 1 --': 'x'})
+
+        mock_db_manager.execute_non_query.assert_not_called()
+
+
+@pytest.mark.unit
+@pytest.mark.database
+class TestJobTypeRepositoryCache:
+    """Test master data caching of job type reads"""
+
+    def test_get_all_job_types_is_cached(self, job_type_repo, mock_db_manager):
+        """Test repeated reads hit the database once"""
+        mock_db_manager.execute_query.return_value = [{'id': 1, 'job_name': 'Inbound'}]
+
+        first = job_type_repo.get_all_job_types()
+        second = job_type_repo.get_all_job_types()
+
+        assert first == second == [{'id': 1, 'job_name': 'Inbound'}]
+        assert first is not second
+        assert mock_db_manager.execute_query.call_count == 1
+
+    def test_write_invalidates_cache(self, job_type_repo, mock_db_manager):
+        """Test a write makes the next read go to the database"""
+        job_type_repo.get_all_job_types()
+        job_type_repo.create_job_type('Outbound')
+        job_type_repo.get_all_job_types()
+
+        assert mock_db_manager.execute_query.call_count == 2
+
+    def test_cache_expires(self, job_type_repo, mock_db_manager):
+        """Test cached reads are re-queried after the TTL"""
+        from src import constants
+
+        with patch('src.database.base_repository.time.monotonic', return_value=1000.0):
+            job_type_repo.get_all_job_types()
+        later = 1000.0 + constants.MASTER_DATA_CACHE_TTL_SECONDS
+        with patch('src.database.base_repository.time.monotonic', return_value=later):
+            job_type_repo.get_all_job_types()
+
+        assert mock_db_manager.execute_query.call_count == 2
+
+    def test_display_lookups_are_cached(self, job_type_repo, mock_db_manager):
+        """Test find_by_name and the count reuse cached results"""
+        mock_db_manager.execute_query.return_value = [{'id': 1, 'job_name': 'Inbound', 'count': 1}]
+
+        for _ in range(2):
+            job_type_repo.find_by_name('Inbound')
+            job_type_repo.get_job_type_count()
+
+        assert mock_db_manager.execute_query.call_count == 2
+
+    def test_uniqueness_check_is_not_cached(self, job_type_repo, mock_db_manager):
+        """Test job_name_exists sees names created by other processes"""
+        mock_db_manager.execute_query.side_effect = [[{'found': 0}], [{'found': 1}]]
+
+        assert job_type_repo.job_name_exists('Inbound') is False
+        assert job_type_repo.job_name_exists('Inbound') is True
+
+    def test_delete_invalidates_name_lookups(self, job_type_repo, mock_db_manager):
+        """Test a deleted job type is not found from a stale cache entry"""
+        mock_db_manager.execute_query.return_value = [{'id': 1, 'job_name': 'Inbound'}]
+        assert job_type_repo.find_by_name('Inbound') is not None
+
+        job_type_repo.delete_job_type(1)
+        mock_db_manager.execute_query.return_value = []
+
+        assert job_type_repo.find_by_name('Inbound') is None
+
+    def test_cache_is_safe_across_threads(self, job_type_repo, mock_db_manager):
+        """Test concurrent reads and invalidations never raise"""
+        import threading
+        from src.database.base_repository import BaseRepository
+
+        mock_db_manager.execute_query.return_value = [{'id': 1, 'job_name': 'Inbound'}]
+        errors = []
+
+        def read():
+            try:
+                for index in range(2000):
+                    job_type_repo.cached_query(f"SELECT {index % 5}")
+            except Exception as e:
+                errors.append(e)
+
+        def invalidate():
+            try:
+                for _ in range(2000):
+                    BaseRepository.invalidate_cache('job_types')
+                    BaseRepository.invalidate_cache()
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=read) for _ in range(4)]
+        threads += [threading.Thread(target=invalidate) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+
+    def test_invalidation_during_query_is_not_overwritten(self, job_type_repo, mock_db_manager):
+        """Test a result fetched before an invalidation is not cached"""
+        from src.database.base_repository import BaseRepository
+
+        def stale_read(query, params):
+            BaseRepository.invalidate_cache()
+            return [{'id': 1, 'job_name': 'Old'}]
+        mock_db_manager.execute_query.side_effect = stale_read
+
+        job_type_repo.get_all_job_types()
+        job_type_repo.get_all_job_types()
+
+        assert mock_db_manager.execute_query.call_count == 2
+
+    def test_exists_uses_exists_query(self, job_type_repo, mock_db_manager):
+        """Test exists() probes with EXISTS rather than COUNT(*)"""
+        mock_db_manager.execute_query.return_value = [{'found': 1}]
+
+        assert job_type_repo.exists({'job_name': 'A'}) is True
+
+        query, params = mock_db_manager.execute_query.call_args[0]
+        assert query == (
+            "SELECT CASE WHEN EXISTS (SELECT 1 FROM job_types WHERE job_name = ?) "
+            "THEN 1 ELSE 0 END as found"
+        )
+        assert params == ('A',)
+
+    def test_find_all_with_explicit_columns(self, job_type_repo, mock_db_manager):
+        """Test callers can project specific columns"""
+        job_type_repo.find_all(order_by='job_name', columns=('job_name',))
+
+        query = mock_db_manager.execute_query.call_args[0][0]
+        assert query == "SELECT job_name FROM job_types ORDER BY job_name"
+
+    def test_find_all_rejects_unsafe_column(self, job_type_repo, mock_db_manager):
+        """Test projected column names are validated too"""
+        with pytest.raises(ValueError):
+            job_type_repo.find_all(columns=('id, (SELECT 1)',))
@@ -10,6 +10,8 @@ This module tests the scan log repository functionality including:
 - Summary statistics
 """
 import pytest
+from datetime import date, datetime
+from pathlib import Path
 from unittest.mock import MagicMock
 
 
@@ -60,6 +62,21 @@ class TestScanLogRepositoryBasics:
         assert "GETDATE()" in call_args[0]
         assert call_args[1] == ('BC123', 'Inbound', 'user1', 1, 2, 'Test note')
 
+    def test_create_scans_batch(self, scan_log_repo, mock_db_manager):
+        """Test batched scan creation sends all rows in one executemany"""
+        mock_db_manager.execute_many.return_value = 2
+        rows = [
+            ('BC1', 'Inbound', 'user1', 1, 2, ''),
+            ('BC2', 'Inbound', 'user1', 1, None, 'note')
+        ]
+
+        assert scan_log_repo.create_scans(rows) == 2
+
+        query, params = mock_db_manager.execute_many.call_args[0]
+        assert "INSERT INTO scan_logs" in query
+        assert "GETDATE()" in query
+        assert params == rows
+
     def test_create_scan_without_sub_job(self, scan_log_repo, mock_db_manager):
         """Test creating scan without sub job"""
         mock_db_manager.execute_non_query.return_value = 1
@@ -75,6 +92,51 @@ class TestScanLogRepositoryBasics:
         call_args = mock_db_manager.execute_non_query.call_args[0]
         assert call_args[1] == ('BC456', 'Outbound', 'user2', 3, None, '')
 
+    def test_create_scan_if_new_inserted(self, scan_log_repo, mock_db_manager):
+        """Test duplicate check and insert run as one prepared statement"""
+        statement = mock_db_manager.prepare.return_value
+        statement.return_value = 1
+
+        rowcount = scan_log_repo.create_scan_if_new(
+            barcode='BC123',
+            job_type='Inbound',
+            user_id='user1',
+            job_id=1,
+            sub_job_id=2,
+            notes='Test note',
+            hours=48
+        )
+
+        assert rowcount == 1
+        statement.assert_called_once()
+        mock_db_manager.execute_non_query.assert_not_called()
+        mock_db_manager.execute_query.assert_not_called()
+
+        name, query = mock_db_manager.prepare.call_args[0]
+        params = statement.call_args[0][0]
+        assert name == 'scan_insert_if_new'
+        assert "INSERT INTO scan_logs" in query
+        assert "WHERE NOT EXISTS" in query
+        assert "UPDLOCK, HOLDLOCK" in query
+        # Only the latest scan of the barcode for the job is compared (sub1 -> sub2 -> sub1 is allowed)
+        assert "SELECT TOP 1 sub_job_id" in query
+        assert "ORDER BY scan_date DESC, id DESC" in query
+        assert "latest.sub_job_id = ?" in query
+        assert params == ('BC123', 'Inbound', 'user1', 1, 2, 'Test note', 'BC123', 1, -48, 2, 2)
+
+    def test_create_scan_if_new_duplicate(self, scan_log_repo, mock_db_manager):
+        """Test a duplicate inserts no rows"""
+        statement = mock_db_manager.prepare.return_value
+        statement.return_value = 0
+
+        rowcount = scan_log_repo.create_scan_if_new(
+            barcode='BC123', job_type='Inbound', user_id='user1', job_id=1
+        )
+
+        assert rowcount == 0
+        params = statement.call_args[0][0]
+        assert params[9:11] == (None, None)
+
 
 @pytest.mark.unit
 @pytest.mark.database
@@ -173,17 +235,20 @@ class TestScanLogRepositorySearch:
         assert "job_id = ?" in call_args[0]
         assert "sub_job_id = ?" in call_args[0]
         assert "user_id = ?" in call_args[0]
-        assert "scan_date AS DATE) >= ?" in call_args[0]
-        assert "scan_date AS DATE) <= ?" in call_args[0]
-        assert "TOP 50" in call_args[0]
-
-        # Verify parameters
-        assert '%BC%' in call_args[1]
+        assert "sl.scan_date >= ?" in call_args[0]
+        assert "sl.scan_date < ?" in call_args[0]
+        assert "CAST(sl.scan_date" not in call_args[0]
+        assert "OFFSET ? ROWS FETCH NEXT ? ROWS ONLY" in call_args[0]
+
+        # Verify parameters (offset and page size bind last)
+        assert call_args[1][-2:] == (0, 50)
+        assert 'BC%' in call_args[1]
         assert 1 in call_args[1]
         assert 2 in call_args[1]
         assert 'user1' in call_args[1]
-        assert '2024-01-01' in call_args[1]
-        assert '2024-01-31' in call_args[1]
+        # Inclusive end date becomes an exclusive bound on the next day
+        assert datetime(2024, 1, 1) in call_args[1]
+        assert datetime(2024, 2, 1) in call_args[1]
 
     def test_search_history_no_filters(self, scan_log_repo, mock_db_manager):
         """Test searching with no filters"""
@@ -198,13 +263,162 @@ class TestScanLogRepositorySearch:
         assert "WHERE 1=1" in call_args[0]
 
     def test_search_history_partial_barcode(self, scan_log_repo, mock_db_manager):
-        """Test searching with partial barcode match"""
+        """Test plain barcode input searches by prefix (index-friendly)"""
         mock_db_manager.execute_query.return_value = []
 
         scan_log_repo.search_history(barcode='123')
 
         call_args = mock_db_manager.execute_query.call_args[0]
-        assert '%123%' in call_args[1]
+        assert '123%' in call_args[1]
+        assert '%123%' not in call_args[1]
+
+    def test_search_history_wildcard_barcode(self, scan_log_repo, mock_db_manager):
+        """Test input with LIKE wildcards keeps the contains match"""
+        mock_db_manager.execute_query.return_value = []
+
+        scan_log_repo.search_history(barcode='12_4')
+
+        call_args = mock_db_manager.execute_query.call_args[0]
+        assert '%12_4%' in call_args[1]
+
+    def test_search_history_params_follow_placeholder_order(self, scan_log_repo, mock_db_manager):
+        """Test parameters line up with placeholders when some filters are missing"""
+        mock_db_manager.execute_query.return_value = []
+
+        scan_log_repo.search_history(job_id=3, end_date='2024-01-31', limit=10)
+
+        query, params = mock_db_manager.execute_query.call_args[0]
+        assert query.count('?') == len(params)
+        assert params == (3, datetime(2024, 2, 1), 0, 10)
+
+    def test_search_history_accepts_date_objects(self, scan_log_repo, mock_db_manager):
+        """Test date and datetime filters are normalised to midnight"""
+        mock_db_manager.execute_query.return_value = []
+
+        scan_log_repo.search_history(
+            start_date=datetime(2024, 3, 5, 14, 30), end_date=date(2024, 3, 6), limit=10
+        )
+
+        params = mock_db_manager.execute_query.call_args[0][1]
+        assert params == (datetime(2024, 3, 5), datetime(2024, 3, 7), 0, 10)
+
+    def test_search_history_invalid_date(self, scan_log_repo, mock_db_manager):
+        """Test malformed date strings are rejected before querying"""
+        with pytest.raises(ValueError):
+            scan_log_repo.search_history(start_date='05/03/2024')
+
+        mock_db_manager.execute_query.assert_not_called()
+
+    def test_search_history_with_offset(self, scan_log_repo, mock_db_manager):
+        """Test fetching a later page"""
+        mock_db_manager.execute_query.return_value = []
+
+        scan_log_repo.search_history(barcode='BC', limit=500, offset=1000)
+
+        params = mock_db_manager.execute_query.call_args[0][1]
+        assert params == ('BC%', 1000, 500)
+
+    def test_search_history_default_order(self, scan_log_repo, mock_db_manager):
+        """Test newest scans come first by default"""
+        mock_db_manager.execute_query.return_value = []
+
+        scan_log_repo.search_history()
+
+        query = mock_db_manager.execute_query.call_args[0][0]
+        assert "ORDER BY sl.scan_date DESC, sl.id DESC" in query
+
+    def test_search_history_order_by_column(self, scan_log_repo, mock_db_manager):
+        """Test sorting by a whitelisted column"""
+        mock_db_manager.execute_query.return_value = []
+
+        scan_log_repo.search_history(order_by='barcode', descending=False)
+
+        query = mock_db_manager.execute_query.call_args[0][0]
+        assert "ORDER BY sl.barcode ASC, sl.id DESC" in query
+
+    def test_search_history_order_by_id_has_no_tie_breaker(self, scan_log_repo, mock_db_manager):
+        """Test id is not repeated in ORDER BY"""
+        mock_db_manager.execute_query.return_value = []
+
+        scan_log_repo.search_history(order_by='id', descending=False)
+
+        query = mock_db_manager.execute_query.call_args[0][0]
+        assert "ORDER BY sl.id ASC\n" in query
+
+    def test_search_history_rejects_unknown_order(self, scan_log_repo, mock_db_manager):
+        """Test ORDER BY only accepts whitelisted columns"""
+        with pytest.raises(ValueError):
+            scan_log_repo.search_history(order_by='barcode; DROP TABLE scan_logs')
+
+        mock_db_manager.execute_query.assert_not_called()
+
+    def test_search_history_rows(self, scan_log_repo, mock_db_manager):
+        """Test positional rows use explicit columns and the tuple fetch"""
+        mock_db_manager.execute_query_tuples.return_value = [
+            (1, datetime(2024, 1, 1), 'BC1', 'Pack', None, 'user1', '')
+        ]
+
+        rows = scan_log_repo.search_history_rows(job_id=1, limit=20, offset=40)
+
+        assert rows[0][2] == 'BC1'
+        mock_db_manager.execute_query.assert_not_called()
+        query, params = mock_db_manager.execute_query_tuples.call_args[0]
+        assert "sl.*" not in query
+        assert "sl.id, sl.scan_date, sl.barcode" in query
+        assert params == (1, 40, 20)
+
+    def test_search_history_rows_matches_column_list(self, scan_log_repo, mock_db_manager):
+        """Test HISTORY_ROW_COLUMNS describes the selected columns"""
+        scan_log_repo.search_history_rows()
+
+        query = mock_db_manager.execute_query_tuples.call_args[0][0]
+        select_list = query.split("SELECT", 1)[1].split("FROM", 1)[0]
+        selected = [column.strip().split('.')[-1] for column in select_list.split(',')]
+        assert tuple(selected) == scan_log_repo.HISTORY_ROW_COLUMNS
+
+    def test_iter_history_rows_streams_every_match(self, scan_log_repo, mock_db_manager):
+        """Test the export stream uses the search filters without paging"""
+        mock_db_manager.execute_query_iter.return_value = iter([
+            (1, datetime(2024, 1, 1), 'BC1', 'Pack', None, 'user1', '')
+        ])
+
+        rows = list(scan_log_repo.iter_history_rows(job_id=1, order_by='barcode', descending=False))
+
+        assert rows[0][2] == 'BC1'
+        query, params = mock_db_manager.execute_query_iter.call_args[0]
+        assert "sl.id, sl.scan_date, sl.barcode" in query
+        assert "OFFSET" not in query
+        assert "ORDER BY sl.barcode ASC" in query
+        assert params == (1,)
+
+    def test_count_history(self, scan_log_repo, mock_db_manager):
+        """Test counting with the same filters as search_history"""
+        mock_db_manager.execute_query.return_value = [{'total_count': 1234}]
+
+        count = scan_log_repo.count_history(job_id=1, start_date='2024-01-01')
+
+        assert count == 1234
+        query, params = mock_db_manager.execute_query.call_args[0]
+        assert "COUNT(*)" in query
+        assert "OFFSET" not in query
+        assert params == (1, datetime(2024, 1, 1))
+
+    def test_count_history_no_results(self, scan_log_repo, mock_db_manager):
+        """Test count returns 0 when query returns nothing"""
+        mock_db_manager.execute_query.return_value = []
+
+        assert scan_log_repo.count_history() == 0
+
+    def test_search_history_reuses_query_text(self, scan_log_repo, mock_db_manager):
+        """Test the same filter combination produces the identical SQL object"""
+        mock_db_manager.execute_query.return_value = []
+
+        scan_log_repo.search_history(barcode='A', start_date='2024-01-01')
+        first_query = mock_db_manager.execute_query.call_args[0][0]
+        scan_log_repo.search_history(barcode='B', start_date='2024-02-01')
+        second_query = mock_db_manager.execute_query.call_args[0][0]
+
+        assert first_query is second_query
 
 
 @pytest.mark.unit
@@ -230,11 +444,12 @@ class TestScanLogRepositoryReports:
 
         # Verify query
         call_args = mock_db_manager.execute_query.call_args[0]
-        assert "BETWEEN ? AND ?" in call_args[0]
+        assert "sl.scan_date >= ? AND sl.scan_date < ?" in call_args[0]
+        assert "CAST(sl.scan_date AS DATE)" not in call_args[0]
         assert "job_id = ?" in call_args[0]
         assert "sub_job_id = ?" in call_args[0]
         assert "LEFT JOIN sub_job_types" in call_args[0]
-        assert call_args[1] == ('2024-01-01', '2024-01-31', 1, 2)
+        assert call_args[1] == (datetime(2024, 1, 1), datetime(2024, 2, 1), 1, 2)
 
     def test_get_report_with_sub_job_no_filters(self, scan_log_repo, mock_db_manager):
         """Test getting report without job filters"""
@@ -247,7 +462,7 @@ class TestScanLogRepositoryReports:
 
         # Verify only date filter
         call_args = mock_db_manager.execute_query.call_args[0]
-        assert call_args[1] == ('2024-01-01', '2024-01-31')
+        assert call_args[1] == (datetime(2024, 1, 1), datetime(2024, 2, 1))
 
     def test_get_report_main_job_only(self, scan_log_repo, mock_db_manager):
         """Test getting report for main job only"""
@@ -267,8 +482,130 @@ class TestScanLogRepositoryReports:
         # Verify query parameters
         call_args = mock_db_manager.execute_query.call_args[0]
         assert "job_id = ?" in call_args[0]
-        assert "BETWEEN ? AND ?" in call_args[0]
-        assert call_args[1] == (1, '2024-01-01', '2024-01-31')
+        assert "sl.scan_date >= ? AND sl.scan_date < ?" in call_args[0]
+        assert call_args[1] == (1, datetime(2024, 1, 1), datetime(2024, 2, 1))
+
+    def test_get_report_page(self, scan_log_repo, mock_db_manager):
+        """Test paged report query with aliased display columns"""
+        mock_db_manager.execute_query.return_value = [{'id': 1, 'barcode': 'BC123'}]
+
+        results = scan_log_repo.get_report_page(
+            start_date='2024-01-15', end_date='2024-01-15',
+            job_id=1, sub_job_id=2, offset=500, limit=500
+        )
+
+        assert len(results) == 1
+        query, params = mock_db_manager.execute_query.call_args[0]
+        assert "AS job_type_name" in query
+        assert "AS sub_job_type_name" in query
+        assert "CONVERT(varchar(19), sl.scan_date, 120) AS scan_date" in query
+        assert "sl.scan_date >= ?" in query
+        assert "ORDER BY sl.scan_date DESC, sl.id DESC" in query
+        assert "OFFSET ? ROWS FETCH NEXT ? ROWS ONLY" in query
+        assert params == (
+            datetime(2024, 1, 15), datetime(2024, 1, 16), 1, 2, 500, 500
+        )
+
+    def test_get_report_page_escapes_notes_filter(self, scan_log_repo, mock_db_manager):
+        """Test notes filter is a literal contains match"""
+        scan_log_repo.get_report_page('2024-01-15', '2024-01-15', notes_filter='50%_off')
+
+        query, params = mock_db_manager.execute_query.call_args[0]
+        assert "sl.notes LIKE ?" in query
+        assert "sl.job_id" not in query
+        assert params[2] == '%50[%][_]off%'
+
+    def test_get_report_page_uses_fulltext_index(self, scan_log_repo, mock_db_manager):
+        """Test a word-prefix notes filter uses CONTAINS when a full-text index exists"""
+        mock_db_manager.execute_query.side_effect = [[{'index_count': 1}], [], []]
+
+        scan_log_repo.get_report_page('2024-01-15', '2024-01-15', notes_filter='box "dam*')
+        scan_log_repo.get_report_page('2024-01-15', '2024-01-15', notes_filter='box*')
+
+        assert "sys.fulltext_index_columns" in mock_db_manager.execute_query.call_args_list[0][0][0]
+        query, params = mock_db_manager.execute_query.call_args_list[1][0]
+        assert "CONTAINS(sl.notes, ?)" in query
+        assert "LIKE" not in query
+        assert params[2] == '"box*" AND "dam*"'
+        # Index detection runs once per repository
+        assert mock_db_manager.execute_query.call_count == 3
+
+    def test_get_report_page_substring_filter_ignores_fulltext_index(self, scan_log_repo, mock_db_manager):
+        """Test a plain notes filter stays a substring match even with a full-text index"""
+        scan_log_repo._notes_fulltext = True
+
+        scan_log_repo.get_report_page('2024-01-15', '2024-01-15', notes_filter='123')
+
+        query, params = mock_db_manager.execute_query.call_args[0]
+        assert "CONTAINS" not in query
+        assert params[2] == '%123%'
+
+    def test_get_report_page_without_fulltext_index(self, scan_log_repo, mock_db_manager):
+        """Test a word-prefix filter falls back to LIKE without a full-text index"""
+        mock_db_manager.execute_query.side_effect = [[{'index_count': 0}], []]
+
+        scan_log_repo.get_report_page('2024-01-15', '2024-01-15', notes_filter='box*')
+
+        query, params = mock_db_manager.execute_query.call_args[0]
+        assert "sl.notes LIKE ?" in query
+        assert params[2] == '%box%'
+
+    def test_iter_report_rows(self, scan_log_repo, mock_db_manager):
+        """Test export rows are streamed positionally without paging"""
+        mock_db_manager.execute_query_iter.return_value = iter([(1, 'BC1')])
+
+        rows = scan_log_repo.iter_report_rows('2024-01-15', '2024-01-15', job_id=1)
+
+        assert list(rows) == [(1, 'BC1')]
+        query, params = mock_db_manager.execute_query_iter.call_args[0]
+        assert "ORDER BY sl.scan_date DESC, sl.id DESC" in query
+        assert "OFFSET" not in query
+        assert params == (datetime(2024, 1, 15), datetime(2024, 1, 16), 1)
+        assert len(scan_log_repo.REPORT_ROW_COLUMNS) == 7
+
+    def test_get_report_first_page(self, scan_log_repo, mock_db_manager):
+        """Test first page and totals come from a single windowed query"""
+        mock_db_manager.execute_query.return_value = [
+            {'id': 2, 'barcode': 'B', 'row_num': 1, 'total_scans': 1200, 'unique_barcodes': 900},
+            {'id': 1, 'barcode': 'A', 'row_num': 2, 'total_scans': 1200, 'unique_barcodes': 900},
+        ]
+
+        rows, stats = scan_log_repo.get_report_first_page(
+            '2024-01-15', '2024-01-15', job_id=1, limit=2
+        )
+
+        assert stats == {'total_scans': 1200, 'unique_barcodes': 900}
+        assert rows == [{'id': 2, 'barcode': 'B'}, {'id': 1, 'barcode': 'A'}]
+        mock_db_manager.execute_query.assert_called_once()
+        query, params = mock_db_manager.execute_query.call_args[0]
+        assert "COUNT(*) OVER ()" in query
+        assert "ROW_NUMBER() OVER (ORDER BY sl.scan_date DESC, sl.id DESC)" in query
+        assert "DENSE_RANK() OVER (ORDER BY sl.barcode)" in query
+        assert "FETCH NEXT ? ROWS ONLY" in query
+        assert params == (datetime(2024, 1, 15), datetime(2024, 1, 16), 1, 2)
+
+    def test_get_report_first_page_empty(self, scan_log_repo, mock_db_manager):
+        """Test an empty report has zero totals"""
+        mock_db_manager.execute_query.return_value = []
+
+        rows, stats = scan_log_repo.get_report_first_page('2024-01-15', '2024-01-15')
+
+        assert rows == []
+        assert stats == {'total_scans': 0, 'unique_barcodes': 0}
+
+    def test_get_report_page_reuses_query_text(self, scan_log_repo, mock_db_manager):
+        """Test the same report filter shape produces the identical SQL object"""
+        mock_db_manager.execute_query.return_value = []
+
+        scan_log_repo.get_report_page('2024-01-15', '2024-01-15', job_id=1, sub_job_id=2)
+        first_query = mock_db_manager.execute_query.call_args[0][0]
+        scan_log_repo.get_report_page('2024-02-01', '2024-02-01', job_id=3, sub_job_id=4, offset=500)
+        second_query = mock_db_manager.execute_query.call_args[0][0]
+        scan_log_repo.get_report_page('2024-02-01', '2024-02-01', job_id=3)
+        main_job_query = mock_db_manager.execute_query.call_args[0][0]
+
+        assert first_query is second_query
+        assert "sl.sub_job_id = ?" not in main_job_query
 
 
 @pytest.mark.unit
@@ -289,7 +626,8 @@ class TestScanLogRepositoryCounts:
         call_args = mock_db_manager.execute_query.call_args[0]
         assert "job_id = ?" in call_args[0]
         assert "sub_job_id = ?" in call_args[0]
-        assert "GETDATE()" in call_args[0]
+        assert "scan_date >= CAST(GETDATE() AS DATE)" in call_args[0]
+        assert "CAST(scan_date AS DATE)" not in call_args[0]
         assert call_args[1] == (1, 2)
 
     def test_get_today_summary_count_main_job_only(self, scan_log_repo, mock_db_manager):
@@ -306,6 +644,27 @@ class TestScanLogRepositoryCounts:
         assert "sub_job_id" not in call_args[0]
         assert call_args[1] == (1,)
 
+    def test_get_today_counts_by_sub_job(self, scan_log_repo, mock_db_manager):
+        """Test today's counts for all sub jobs come from one GROUP BY query"""
+        mock_db_manager.execute_query.return_value = [
+            {'sub_job_id': 2, 'total_count': 15},
+            {'sub_job_id': None, 'total_count': 3}
+        ]
+
+        counts = scan_log_repo.get_today_counts_by_sub_job(job_id=1, notes_filter='box')
+
+        assert counts == {2: 15, None: 3}
+        query, params = mock_db_manager.execute_query.call_args[0]
+        assert "GROUP BY sub_job_id" in query
+        assert "scan_date >= CAST(GETDATE() AS DATE)" in query
+        assert params == (1, '%box%', '%box%')
+
+    def test_get_today_counts_by_sub_job_without_notes(self, scan_log_repo, mock_db_manager):
+        """Test the notes filter is disabled with NULL parameters"""
+        scan_log_repo.get_today_counts_by_sub_job(job_id=1)
+
+        assert mock_db_manager.execute_query.call_args[0][1] == (1, None, None)
+
     def test_get_count_by_job_with_dates(self, scan_log_repo, mock_db_manager):
         """Test getting count by job with date range"""
         mock_db_manager.execute_query.return_value = [{'count': 100}]
@@ -321,8 +680,8 @@ class TestScanLogRepositoryCounts:
 
         # Verify query
         call_args = mock_db_manager.execute_query.call_args[0]
-        assert "BETWEEN ? AND ?" in call_args[0]
-        assert call_args[1] == (1, '2024-01-01', '2024-01-31')
+        assert "scan_date >= ? AND scan_date < ?" in call_args[0]
+        assert call_args[1] == (1, datetime(2024, 1, 1), datetime(2024, 2, 1))
 
     def test_get_count_by_job_no_dates(self, scan_log_repo, mock_db_manager):
         """Test getting count by job without dates"""
@@ -335,7 +694,7 @@ class TestScanLogRepositoryCounts:
         # Verify simpler query
         call_args = mock_db_manager.execute_query.call_args[0]
         assert "WHERE job_id = ?" in call_args[0]
-        assert "BETWEEN" not in call_args[0]
+        assert "scan_date" not in call_args[0]
         assert call_args[1] == (1,)
 
     def test_get_today_summary_count_no_results(self, scan_log_repo, mock_db_manager):
@@ -382,14 +741,34 @@ class TestScanLogRepositoryTableManagement:
         result = scan_log_repo.ensure_indexes_exist()
 
         assert result is True
-        # Should be called 6 times (one for each index)
-        assert mock_db_manager.execute_non_query.call_count == 6
+        # Should be called 8 times (one for each index)
+        assert mock_db_manager.execute_non_query.call_count == 8
 
         # Verify index creation queries
         calls = mock_db_manager.execute_non_query.call_args_list
-        index_names = ['barcode', 'scan_date', 'job_type', 'user_id', 'job_id', 'sub_job_id']
+        index_names = ['barcode', 'scan_date', 'job_type', 'user_id', 'job_id', 'sub_job_id', 'date_job', 'job_date']
         for i, index_name in enumerate(index_names):
-            assert f"idx_scan_logs_{index_name}" in calls[i][0][0]
+            assert f"CREATE NONCLUSTERED INDEX IX_scan_logs_{index_name} " in calls[i][0][0]
+        assert "ON scan_logs(scan_date, job_id) INCLUDE (barcode, notes, user_id, sub_job_id)" in calls[6][0][0]
+        assert "ON scan_logs(job_id, sub_job_id, scan_date)" in calls[7][0][0]
+
+    def test_ensure_indexes_exist_matches_setup_script(self, scan_log_repo, mock_db_manager):
+        """Test the repository creates the same index names as wms_setup_db.sql"""
+        setup_sql = (Path(__file__).resolve().parents[2] / 'wms_setup_db.sql').read_text(encoding='utf-8')
+
+        for name, _, _ in scan_log_repo._INDEXES:
+            assert f"CREATE INDEX {name} ON scan_logs" in setup_sql
+
+    def test_ensure_indexes_exist_checks_key_columns(self, scan_log_repo, mock_db_manager):
+        """Test an index with the same key columns under another name is not duplicated"""
+        scan_log_repo.ensure_indexes_exist()
+
+        query = mock_db_manager.execute_non_query.call_args_list[7][0][0]
+        assert "i.name = 'IX_scan_logs_job_date'" in query
+        assert "FROM sys.index_columns" in query
+        assert "ic.key_ordinal > 0) = 3" in query
+        for ordinal, column in enumerate(('job_id', 'sub_job_id', 'scan_date'), start=1):
+            assert f"ic.key_ordinal = {ordinal} AND COL_NAME(ic.object_id, ic.column_id) = '{column}'" in query
 
     def test_ensure_indexes_exist_failure(self, scan_log_repo, mock_db_manager):
         """Test index creation fails gracefully"""
@@ -152,7 +152,7 @@ class TestSubJobRepositoryCreate:
 
     def test_duplicate_exists_true(self, sub_job_repo, mock_db_manager):
         """Test checking if sub job name exists (returns true)"""
-        mock_db_manager.execute_query.return_value = [{'count': 1}]
+        mock_db_manager.execute_query.return_value = [{'found': 1}]
 
         exists = sub_job_repo.duplicate_exists(1, 'Receiving')
 
@@ -164,11 +164,12 @@ class TestSubJobRepositoryCreate:
         assert "main_job_id = ?" in call_args[0]
         assert "sub_job_name = ?" in call_args[0]
         assert "is_active = 1" in call_args[0]
+        assert "EXISTS" in call_args[0]
         assert call_args[1] == (1, 'Receiving')
 
     def test_duplicate_exists_false(self, sub_job_repo, mock_db_manager):
         """Test checking if sub job name exists (returns false)"""
-        mock_db_manager.execute_query.return_value = [{'count': 0}]
+        mock_db_manager.execute_query.return_value = [{'found': 0}]
 
         exists = sub_job_repo.duplicate_exists(1, 'NonExistent')
 
@@ -176,7 +177,7 @@ class TestSubJobRepositoryCreate:
 
     def test_duplicate_exists_exclude_id(self, sub_job_repo, mock_db_manager):
         """Test checking duplicate with ID exclusion"""
-        mock_db_manager.execute_query.return_value = [{'count': 0}]
+        mock_db_manager.execute_query.return_value = [{'found': 0}]
 
         exists = sub_job_repo.duplicate_exists(1, 'Receiving', exclude_id=1)
 
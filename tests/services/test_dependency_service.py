@@ -11,6 +11,8 @@ This module tests the dependency service business logic including:
 import pytest
 from unittest.mock import MagicMock
 
+from src.exceptions import QueryException
+
 
 @pytest.fixture
 def mock_dependency_repo():
@@ -294,23 +296,26 @@ class TestDependencyServiceSaveDependencies:
     ):
         """Test successfully saving dependencies"""
         mock_dependency_repo.remove_all_dependencies.return_value = 2
-        mock_dependency_repo.validate_no_circular_dependency.return_value = True
-        mock_dependency_repo.add_dependency.return_value = 1
+        mock_dependency_repo.get_dependent_job_ids.return_value = []
+        mock_dependency_repo.add_dependencies.return_value = 3
 
         result = dependency_service.save_dependencies(1, [2, 3, 4])
 
         assert result['success'] is True
         assert result['data']['dependencies_added'] == 3
         assert len(result['data']['errors']) == 0
-        assert mock_dependency_repo.add_dependency.call_count == 3
+        # One circular check and one batched INSERT for the whole list
+        mock_dependency_repo.get_dependent_job_ids.assert_called_once_with(1)
+        mock_dependency_repo.add_dependencies.assert_called_once_with(1, [2, 3, 4])
+        mock_dependency_repo.add_dependency.assert_not_called()
 
     def test_save_dependencies_with_circular(
         self, dependency_service, mock_dependency_repo
     ):
         """Test saving dependencies with circular dependency detected"""
         mock_dependency_repo.remove_all_dependencies.return_value = 0
-        mock_dependency_repo.validate_no_circular_dependency.side_effect = [True, False, True]
-        mock_dependency_repo.add_dependency.return_value = 1
+        mock_dependency_repo.get_dependent_job_ids.return_value = [3]
+        mock_dependency_repo.add_dependencies.return_value = 2
 
         result = dependency_service.save_dependencies(1, [2, 3, 4])
 
@@ -318,6 +323,21 @@ class TestDependencyServiceSaveDependencies:
         assert result['data']['dependencies_added'] == 2  # Only 2 added (skipped circular)
         assert len(result['data']['errors']) == 1
         assert 'Circular' in result['data']['errors'][0]
+        mock_dependency_repo.add_dependencies.assert_called_once_with(1, [2, 4])
+
+    def test_save_dependencies_batch_failure(
+        self, dependency_service, mock_dependency_repo
+    ):
+        """Test a failed batched INSERT is reported as an error"""
+        mock_dependency_repo.get_dependent_job_ids.return_value = []
+        mock_dependency_repo.add_dependencies.side_effect = QueryException("FK violation")
+
+        result = dependency_service.save_dependencies(1, [2, 2, 3])
+
+        assert result['success'] is False
+        assert result['data']['dependencies_added'] == 0
+        # Duplicate IDs are only inserted once
+        mock_dependency_repo.add_dependencies.assert_called_once_with(1, [2, 3])
 
     def test_save_dependencies_empty_list(
         self, dependency_service, mock_dependency_repo
@@ -332,14 +332,19 @@ class TestImportServiceImportScans:
         ]
 
         mock_job_type_repo.find_by_id.return_value = {'id': 1, 'job_name': 'Inbound'}
-        mock_scan_log_repo.create_scan.return_value = 1
+        mock_scan_log_repo.create_scans.return_value = 2
 
         result = import_service.import_scans(validated_rows, 'user1')
 
         assert result['success'] is True
         assert result['data']['imported_count'] == 2
         assert result['data']['failed_count'] == 0
-        assert mock_scan_log_repo.create_scan.call_count == 2
+        # Both rows go out in a single batch
+        mock_scan_log_repo.create_scans.assert_called_once_with([
+            ('BC001', 'Inbound', 'user1', 1, 10, 'Test'),
+            ('BC002', 'Inbound', 'user1', 1, 10, '')
+        ])
+        mock_job_type_repo.find_by_id.assert_called_once_with(1)
 
     def test_import_scans_empty(self, import_service):
         """Test import with no validated rows"""
@@ -372,14 +377,14 @@ class TestImportServiceImportScans:
         ]
 
         mock_job_type_repo.find_by_id.return_value = {'id': 1, 'job_name': 'Inbound'}
-        mock_scan_log_repo.create_scan.return_value = 1
+        mock_scan_log_repo.create_scans.return_value = 1
 
         result = import_service.import_scans(validated_rows, 'user1')
 
         assert result['success'] is False  # Not all succeeded
         assert result['data']['imported_count'] == 1
         assert result['data']['failed_count'] == 1
-        assert mock_scan_log_repo.create_scan.call_count == 1
+        assert len(mock_scan_log_repo.create_scans.call_args[0][0]) == 1
 
     def test_import_scans_database_error(
         self, import_service, mock_job_type_repo, mock_scan_log_repo
@@ -399,6 +404,7 @@ class TestImportServiceImportScans:
         ]
 
         mock_job_type_repo.find_by_id.return_value = {'id': 1, 'job_name': 'Inbound'}
+        mock_scan_log_repo.create_scans.side_effect = Exception("Database error")
         mock_scan_log_repo.create_scan.side_effect = Exception("Database error")
 
         result = import_service.import_scans(validated_rows, 'user1')
@@ -408,6 +414,56 @@ class TestImportServiceImportScans:
         assert result['data']['failed_count'] == 1
         assert len(result['data']['errors']) == 1
 
+    def test_import_scans_failed_batch_falls_back_to_single_rows(
+        self, import_service, mock_scan_log_repo
+    ):
+        """Test one bad row in a batch only fails that row"""
+        validated_rows = [
+            {
+                'valid': True,
+                'row_number': i,
+                'validated_data': {'barcode': f'BC{i}', 'main_job_id': 1, 'sub_job_id': 10}
+            }
+            for i in range(1, 4)
+        ]
+        mock_scan_log_repo.create_scans.side_effect = Exception("FK violation")
+
+        def create_scan(barcode, *args):
+            if barcode == 'BC2':
+                raise Exception("FK violation")
+            return 1
+        mock_scan_log_repo.create_scan.side_effect = create_scan
+
+        result = import_service.import_scans(validated_rows, 'user1', job_type_name='Inbound')
+
+        assert result['data']['imported_count'] == 2
+        assert result['data']['failed_count'] == 1
+        assert [error['row_number'] for error in result['data']['errors']] == [2]
+        assert 'FK violation' in result['data']['errors'][0]['error']
+        assert mock_scan_log_repo.create_scan.call_count == 3
+
+    def test_import_scans_flushes_full_batches(
+        self, import_service, mock_scan_log_repo
+    ):
+        """Test rows are sent in batches of IMPORT_INSERT_BATCH_SIZE"""
+        from src import constants
+
+        validated_rows = [
+            {
+                'valid': True,
+                'row_number': i,
+                'validated_data': {'barcode': f'BC{i}', 'main_job_id': 1, 'sub_job_id': 10}
+            }
+            for i in range(constants.IMPORT_INSERT_BATCH_SIZE + 1)
+        ]
+        mock_scan_log_repo.create_scans.side_effect = lambda rows: len(rows)
+
+        result = import_service.import_scans(validated_rows, 'user1', job_type_name='Inbound')
+
+        assert result['data']['imported_count'] == constants.IMPORT_INSERT_BATCH_SIZE + 1
+        sizes = [len(c[0][0]) for c in mock_scan_log_repo.create_scans.call_args_list]
+        assert sizes == [constants.IMPORT_INSERT_BATCH_SIZE, 1]
+
 
 @pytest.mark.unit
 @pytest.mark.services
@@ -9,7 +9,7 @@ This module tests the report service business logic including:
 - Statistics calculation
 """
 import pytest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 from datetime import datetime
 
 
@@ -388,3 +388,215 @@ class TestReportServiceStatistics:
         assert result['success'] is True
         assert result['data']['statistics']['total_scans'] == 0
         assert result['data']['statistics']['unique_barcodes'] == 0
+
+
+@pytest.mark.unit
+@pytest.mark.services
+class TestReportServicePaging:
+    """Test paged report generation"""
+
+    def test_generate_report_page(
+        self, report_service, mock_scan_log_repo, mock_job_type_repo, sample_scans
+    ):
+        """First page comes with statistics counted over the whole report"""
+        mock_job_type_repo.find_by_id.return_value = {'id': 1, 'job_name': 'Inbound'}
+        mock_scan_log_repo.get_report_first_page.return_value = (
+            sample_scans, {'total_scans': 1200, 'unique_barcodes': 900}
+        )
+
+        result = report_service.generate_report_page('2024-01-15', 1, limit=3)
+
+        assert result['success'] is True
+        assert result['data']['statistics'] == {'total_scans': 1200, 'unique_barcodes': 900}
+        assert result['data']['scans'] == sample_scans
+        assert result['message'] == 'พบข้อมูล 1200 รายการ'
+        mock_scan_log_repo.get_report_first_page.assert_called_once_with(
+            start_date='2024-01-15', end_date='2024-01-15', job_id=1,
+            sub_job_id=None, notes_filter=None, limit=3
+        )
+        mock_scan_log_repo.get_report_with_sub_job.assert_not_called()
+
+    def test_generate_report_page_empty(
+        self, report_service, mock_scan_log_repo, mock_job_type_repo
+    ):
+        """An empty report returns no rows and zero statistics"""
+        mock_job_type_repo.find_by_id.return_value = {'id': 1, 'job_name': 'Inbound'}
+        mock_scan_log_repo.get_report_first_page.return_value = (
+            [], {'total_scans': 0, 'unique_barcodes': 0}
+        )
+
+        result = report_service.generate_report_page('2024-01-15', 1)
+
+        assert result['success'] is True
+        assert result['data']['scans'] == []
+        assert result['data']['statistics']['total_scans'] == 0
+
+    def test_generate_report_page_invalid_date(self, report_service, mock_job_type_repo):
+        """Invalid dates are rejected before querying"""
+        mock_job_type_repo.find_by_id.return_value = {'id': 1, 'job_name': 'Inbound'}
+
+        result = report_service.generate_report_page('invalid-date', 1)
+
+        assert result['success'] is False
+        assert 'รูปแบบวันที่' in result['message']
+
+    def test_generate_report_page_database_error(
+        self, report_service, mock_scan_log_repo, mock_job_type_repo
+    ):
+        """Database errors are returned as a failed result"""
+        mock_job_type_repo.find_by_id.return_value = {'id': 1, 'job_name': 'Inbound'}
+        mock_scan_log_repo.get_report_first_page.side_effect = Exception("Database error")
+
+        result = report_service.generate_report_page('2024-01-15', 1)
+
+        assert result['success'] is False
+        assert 'ไม่สามารถสร้างรายงาน' in result['message']
+
+    def test_iter_report_rows(self, report_service, mock_scan_log_repo):
+        """Export rows are streamed from the repository for the report date"""
+        mock_scan_log_repo.iter_report_rows.return_value = iter([])
+
+        report_service.iter_report_rows('2024-01-15', 1, notes_filter='x')
+
+        mock_scan_log_repo.iter_report_rows.assert_called_once_with(
+            start_date='2024-01-15', end_date='2024-01-15', job_id=1,
+            sub_job_id=None, notes_filter='x'
+        )
+
+    def test_get_report_page(self, report_service, mock_scan_log_repo):
+        """Later pages pass the offset through to the repository"""
+        mock_scan_log_repo.get_report_page.return_value = []
+
+        report_service.get_report_page('2024-01-15', 1, 10, 'x', offset=500, limit=500)
+
+        mock_scan_log_repo.get_report_page.assert_called_once_with(
+            start_date='2024-01-15', end_date='2024-01-15', job_id=1,
+            sub_job_id=10, notes_filter='x', offset=500, limit=500
+        )
+
+
+@pytest.mark.unit
+@pytest.mark.services
+class TestReportServiceCache:
+    """Test caching of report rows between identical requests"""
+
+    def test_repeated_report_reuses_cached_scans(
+        self, report_service, mock_scan_log_repo, mock_job_type_repo, sample_scans
+    ):
+        """Identical filters within the TTL should not query the database again"""
+        mock_job_type_repo.find_by_id.return_value = {'id': 1, 'job_name': 'Inbound'}
+        mock_scan_log_repo.get_report_with_sub_job.return_value = sample_scans
+
+        first = report_service.generate_report('2024-01-15', 1)
+        second = report_service.generate_report('2024-01-15', 1)
+
+        assert first['data']['scans'] == second['data']['scans']
+        mock_scan_log_repo.get_report_with_sub_job.assert_called_once()
+
+    def test_different_filters_are_cached_separately(
+        self, report_service, mock_scan_log_repo, mock_job_type_repo, sample_scans
+    ):
+        """A different notes filter is a different cache entry"""
+        mock_job_type_repo.find_by_id.return_value = {'id': 1, 'job_name': 'Inbound'}
+        mock_scan_log_repo.get_report_with_sub_job.return_value = sample_scans
+
+        report_service.generate_report('2024-01-15', 1)
+        result = report_service.generate_report('2024-01-15', 1, notes_filter='note 1')
+
+        assert result['data']['statistics']['total_scans'] == 1
+        assert mock_scan_log_repo.get_report_with_sub_job.call_count == 2
+
+    def test_expired_entry_is_requeried(
+        self, report_service, mock_scan_log_repo, mock_job_type_repo, sample_scans
+    ):
+        """Entries older than the TTL should be fetched again"""
+        from src import constants
+
+        mock_job_type_repo.find_by_id.return_value = {'id': 1, 'job_name': 'Inbound'}
+        mock_scan_log_repo.get_report_with_sub_job.return_value = sample_scans
+
+        with patch('src.services.report_service.time.monotonic') as mock_clock:
+            mock_clock.return_value = 1000.0
+            report_service.generate_report('2024-01-15', 1)
+            mock_clock.return_value = 1000.0 + constants.REPORT_CACHE_TTL_SECONDS
+            report_service.generate_report('2024-01-15', 1)
+
+        assert mock_scan_log_repo.get_report_with_sub_job.call_count == 2
+
+    def test_repeated_first_page_is_cached(
+        self, report_service, mock_scan_log_repo, mock_job_type_repo, sample_scans
+    ):
+        """The reports tab's first-page query is served from the cache until cleared"""
+        mock_job_type_repo.find_by_id.return_value = {'id': 1, 'job_name': 'Inbound'}
+        mock_scan_log_repo.get_report_first_page.return_value = (
+            sample_scans, {'total_scans': 3, 'unique_barcodes': 3}
+        )
+
+        first = report_service.generate_report_page('2024-01-15', 1, limit=3)
+        first['data']['scans'].append({'id': 99})
+        second = report_service.generate_report_page('2024-01-15', 1, limit=3)
+        report_service.clear_report_cache()
+        report_service.generate_report_page('2024-01-15', 1, limit=3)
+
+        assert second['data']['scans'] == sample_scans
+        assert mock_scan_log_repo.get_report_first_page.call_count == 2
+
+    def test_clear_report_cache(
+        self, report_service, mock_scan_log_repo, mock_job_type_repo, sample_scans
+    ):
+        """Clearing the cache forces the next report to hit the database"""
+        mock_job_type_repo.find_by_id.return_value = {'id': 1, 'job_name': 'Inbound'}
+        mock_scan_log_repo.get_report_with_sub_job.return_value = sample_scans
+
+        report_service.generate_report('2024-01-15', 1)
+        report_service.clear_report_cache()
+        report_service.generate_report('2024-01-15', 1)
+
+        assert mock_scan_log_repo.get_report_with_sub_job.call_count == 2
+
+    def test_returned_scans_do_not_alias_the_cache(
+        self, report_service, mock_scan_log_repo, mock_job_type_repo, sample_scans
+    ):
+        """Mutating data['scans'] must not change what the next report returns"""
+        mock_job_type_repo.find_by_id.return_value = {'id': 1, 'job_name': 'Inbound'}
+        mock_scan_log_repo.get_report_with_sub_job.return_value = list(sample_scans)
+
+        first = report_service.generate_report('2024-01-15', 1)
+        first['data']['scans'].append({'id': 99})
+        ranged = report_service.generate_date_range_report('2024-01-15', '2024-01-15', 1)
+        ranged['data']['scans'].clear()
+        second = report_service.generate_report('2024-01-15', 1)
+
+        assert second['data']['scans'] == sample_scans
+        mock_scan_log_repo.get_report_with_sub_job.assert_called_once()
+
+    def test_clear_during_load_is_not_overwritten(
+        self, report_service, mock_scan_log_repo, mock_job_type_repo, sample_scans
+    ):
+        """A report loaded before clear_report_cache() must not be cached afterwards"""
+        mock_job_type_repo.find_by_id.return_value = {'id': 1, 'job_name': 'Inbound'}
+
+        def stale_load(**kwargs):
+            report_service.clear_report_cache()
+            return sample_scans
+        mock_scan_log_repo.get_report_with_sub_job.side_effect = stale_load
+
+        report_service.generate_report('2024-01-15', 1)
+        report_service.generate_report('2024-01-15', 1)
+
+        assert mock_scan_log_repo.get_report_with_sub_job.call_count == 2
+
+    def test_cache_is_bounded(
+        self, report_service, mock_scan_log_repo, mock_job_type_repo
+    ):
+        """The oldest filter set is evicted once the cache is full"""
+        from src import constants
+
+        mock_job_type_repo.find_by_id.return_value = {'id': 1, 'job_name': 'Inbound'}
+        mock_scan_log_repo.get_report_with_sub_job.return_value = []
+
+        for i in range(constants.REPORT_CACHE_SIZE + 1):
+            report_service.generate_report('2024-01-15', 1, notes_filter=f'n{i}')
+
+        assert len(report_service._report_cache) == constants.REPORT_CACHE_SIZE
+        assert ('2024-01-15', '2024-01-15', 1, None, 'n0') not in report_service._report_cache
@@ -9,7 +9,7 @@ This module tests the scan service business logic including:
 - Error handling
 """
 import pytest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 
 @pytest.fixture
@@ -88,23 +88,10 @@ class TestScanServiceValidation:
 @pytest.mark.unit
 @pytest.mark.services
 class TestScanServiceDuplicateCheck:
-    """Test duplicate checking"""
+    """Test duplicate handling"""
 
-    def test_check_duplicate_not_found(self, scan_service, mock_scan_log_repo):
-        """Test no duplicate found"""
-        mock_scan_log_repo.check_duplicate.return_value = None
-
-        result = scan_service._check_duplicate("BARCODE123", 1, 10)
-
-        assert result['success'] is True
-        mock_scan_log_repo.check_duplicate.assert_called_once_with(
-            barcode="BARCODE123",
-            job_id=1,
-            hours=24*365
-        )
-
-    def test_check_duplicate_found_same_sub_job(self, scan_service, mock_scan_log_repo):
-        """Test duplicate found with same sub job"""
+    def test_duplicate_result_includes_existing_scan(self, scan_service, mock_scan_log_repo):
+        """Test the previous matching scan is returned as duplicate_info"""
         existing_scan = {
             'id': 123,
             'barcode': 'BARCODE123',
@@ -114,35 +101,35 @@ class TestScanServiceDuplicateCheck:
         }
         mock_scan_log_repo.check_duplicate.return_value = existing_scan
 
-        result = scan_service._check_duplicate("BARCODE123", 1, 10)
+        result = scan_service._duplicate_result("BARCODE123", 1, 10)
 
         assert result['success'] is False
         assert 'ซ้ำ' in result['message']
         assert result['data']['duplicate_info'] == existing_scan
+        mock_scan_log_repo.check_duplicate.assert_called_once_with(
+            barcode="BARCODE123",
+            job_id=1,
+            hours=24*365
+        )
 
-    def test_check_duplicate_found_different_sub_job(self, scan_service, mock_scan_log_repo):
-        """Test duplicate found but different sub job - should allow"""
-        existing_scan = {
-            'id': 123,
-            'barcode': 'BARCODE123',
-            'job_id': 1,
-            'sub_job_id': 11,  # Different sub job
-            'scan_date': '2024-01-01 10:00:00'
+    def test_only_latest_scan_with_same_sub_job_is_duplicate(self, scan_service, mock_scan_log_repo):
+        """Test sub1 -> sub2 -> sub1 is allowed: the latest scan (sub2) decides"""
+        mock_scan_log_repo.check_duplicate.return_value = {
+            'id': 124, 'barcode': 'BARCODE123', 'job_id': 1, 'sub_job_id': 20
         }
-        mock_scan_log_repo.check_duplicate.return_value = existing_scan
 
-        result = scan_service._check_duplicate("BARCODE123", 1, 10)
+        assert scan_service._find_duplicate("BARCODE123", 1, 10) is None
+        assert scan_service._find_duplicate("BARCODE123", 1, 20)['id'] == 124
 
-        assert result['success'] is True
-
-    def test_check_duplicate_error(self, scan_service, mock_scan_log_repo):
-        """Test duplicate check handles errors"""
+    def test_duplicate_result_lookup_error(self, scan_service, mock_scan_log_repo):
+        """Test a failed lookup still reports the duplicate"""
         mock_scan_log_repo.check_duplicate.side_effect = Exception("Database error")
 
-        result = scan_service._check_duplicate("BARCODE123", 1, 10)
+        result = scan_service._duplicate_result("BARCODE123", 1, 10)
 
         assert result['success'] is False
-        assert 'ตรวจสอบข้อมูลซ้ำ' in result['message']
+        assert 'ซ้ำ' in result['message']
+        assert result['data']['duplicate_info'] == {}
 
 
 @pytest.mark.unit
@@ -152,61 +139,47 @@ class TestScanServiceDependencyCheck:
 
     def test_check_dependencies_no_dependencies(self, scan_service, mock_dependency_repo):
         """Test when job has no dependencies"""
-        mock_dependency_repo.get_required_jobs.return_value = []
+        mock_dependency_repo.get_missing_required_jobs.return_value = []
 
         result = scan_service._check_dependencies("BARCODE123", 1)
 
         assert result['success'] is True
 
-    def test_check_dependencies_all_satisfied(self, scan_service, mock_dependency_repo, mock_scan_log_repo):
-        """Test when all dependencies are satisfied"""
-        mock_dependency_repo.get_required_jobs.return_value = [
-            {'required_job_id': 2, 'job_name': 'Inbound'},
-            {'required_job_id': 3, 'job_name': 'QC'}
-        ]
-
-        # Both required jobs have been scanned
-        mock_scan_log_repo.check_duplicate.side_effect = [
-            {'id': 1, 'barcode': 'BARCODE123', 'job_id': 2},  # Inbound found
-            {'id': 2, 'barcode': 'BARCODE123', 'job_id': 3}   # QC found
-        ]
+    def test_check_dependencies_single_query(self, scan_service, mock_dependency_repo, mock_scan_log_repo):
+        """Test dependencies are checked with one repository call"""
+        mock_dependency_repo.get_missing_required_jobs.return_value = []
 
         result = scan_service._check_dependencies("BARCODE123", 1)
 
         assert result['success'] is True
-        assert mock_scan_log_repo.check_duplicate.call_count == 2
+        mock_dependency_repo.get_missing_required_jobs.assert_called_once_with(
+            job_id=1,
+            barcode="BARCODE123",
+            hours=24 * 365
+        )
+        mock_scan_log_repo.check_duplicate.assert_not_called()
 
-    def test_check_dependencies_one_missing(self, scan_service, mock_dependency_repo, mock_scan_log_repo):
+    def test_check_dependencies_one_missing(self, scan_service, mock_dependency_repo):
         """Test when one dependency is missing"""
-        mock_dependency_repo.get_required_jobs.return_value = [
-            {'required_job_id': 2, 'job_name': 'Inbound'},
+        mock_dependency_repo.get_missing_required_jobs.return_value = [
             {'required_job_id': 3, 'job_name': 'QC'}
         ]
 
-        # First job found, second job missing
-        mock_scan_log_repo.check_duplicate.side_effect = [
-            {'id': 1, 'barcode': 'BARCODE123', 'job_id': 2},  # Inbound found
-            None  # QC not found
-        ]
-
         result = scan_service._check_dependencies("BARCODE123", 1)
 
         assert result['success'] is False
         assert 'QC' in result['message']
         assert len(result['data']['missing_dependencies']) == 1
-        assert result['data']['missing_dependencies'][0]['job_name'] == 'QC'
+        assert result['data']['missing_dependencies'][0] == {'job_id': 3, 'job_name': 'QC'}
 
-    def test_check_dependencies_multiple_missing(self, scan_service, mock_dependency_repo, mock_scan_log_repo):
+    def test_check_dependencies_multiple_missing(self, scan_service, mock_dependency_repo):
         """Test when multiple dependencies are missing"""
-        mock_dependency_repo.get_required_jobs.return_value = [
+        mock_dependency_repo.get_missing_required_jobs.return_value = [
             {'required_job_id': 2, 'job_name': 'Inbound'},
             {'required_job_id': 3, 'job_name': 'QC'},
             {'required_job_id': 4, 'job_name': 'Putaway'}
         ]
 
-        # All jobs missing
-        mock_scan_log_repo.check_duplicate.side_effect = [None, None, None]
-
         result = scan_service._check_dependencies("BARCODE123", 1)
 
         assert result['success'] is False
@@ -214,7 +187,7 @@ class TestScanServiceDependencyCheck:
 
     def test_check_dependencies_error(self, scan_service, mock_dependency_repo):
         """Test dependency check handles errors"""
-        mock_dependency_repo.get_required_jobs.side_effect = Exception("Database error")
+        mock_dependency_repo.get_missing_required_jobs.side_effect = Exception("Database error")
 
         result = scan_service._check_dependencies("BARCODE123", 1)
 
@@ -233,9 +206,8 @@ class TestScanServiceProcessScan:
         """Test successful scan processing"""
         # Setup mocks
         mock_sub_job_repo.find_by_name.return_value = {'id': 10, 'sub_job_name': 'Receiving'}
-        mock_scan_log_repo.check_duplicate.side_effect = [None, None]  # No duplicate, no dependencies
-        mock_dependency_repo.get_required_jobs.return_value = []
-        mock_scan_log_repo.create_scan.return_value = 1
+        mock_dependency_repo.get_missing_required_jobs.return_value = []  # No missing dependencies
+        mock_scan_log_repo.create_scan_if_new.return_value = 1  # Not a duplicate
 
         result = scan_service.process_scan(
             barcode="BARCODE123",
@@ -249,7 +221,36 @@ class TestScanServiceProcessScan:
         assert result['success'] is True
         assert 'สำเร็จ' in result['message']
         assert result['data']['barcode'] == "BARCODE123"
-        mock_scan_log_repo.create_scan.assert_called_once()
+        mock_scan_log_repo.create_scan_if_new.assert_called_once_with(
+            barcode="BARCODE123",
+            job_type="Inbound",
+            user_id="user1",
+            job_id=1,
+            sub_job_id=10,
+            notes="Test notes",
+            hours=24*365
+        )
+        mock_scan_log_repo.check_duplicate.assert_not_called()
+
+    def test_process_scan_with_known_sub_job_id(
+        self, scan_service, mock_scan_log_repo, mock_sub_job_repo, mock_dependency_repo
+    ):
+        """Test a caller-resolved sub job ID skips the lookup query"""
+        mock_dependency_repo.get_missing_required_jobs.return_value = []
+        mock_scan_log_repo.create_scan_if_new.return_value = 1
+
+        result = scan_service.process_scan(
+            barcode="BARCODE123",
+            job_type_name="Inbound",
+            job_id=1,
+            sub_job_type_name="Receiving",
+            user_id="user1",
+            sub_job_id=10
+        )
+
+        assert result['success'] is True
+        mock_sub_job_repo.find_by_name.assert_not_called()
+        assert mock_scan_log_repo.create_scan_if_new.call_args[1]['sub_job_id'] == 10
 
     def test_process_scan_validation_failed(self, scan_service):
         """Test scan fails validation"""
@@ -280,10 +281,12 @@ class TestScanServiceProcessScan:
         assert 'ไม่พบประเภทงานย่อย' in result['message']
 
     def test_process_scan_duplicate_found(
-        self, scan_service, mock_scan_log_repo, mock_sub_job_repo
+        self, scan_service, mock_scan_log_repo, mock_sub_job_repo, mock_dependency_repo
     ):
         """Test scan fails when duplicate found"""
         mock_sub_job_repo.find_by_name.return_value = {'id': 10, 'sub_job_name': 'Receiving'}
+        mock_dependency_repo.get_missing_required_jobs.return_value = []
+        mock_scan_log_repo.create_scan_if_new.return_value = 0  # Insert skipped
         mock_scan_log_repo.check_duplicate.return_value = {
             'id': 123,
             'barcode': 'BARCODE123',
@@ -308,13 +311,10 @@ class TestScanServiceProcessScan:
     ):
         """Test scan fails when dependencies not satisfied"""
         mock_sub_job_repo.find_by_name.return_value = {'id': 10, 'sub_job_name': 'Receiving'}
-        mock_scan_log_repo.check_duplicate.side_effect = [
-            None,  # No duplicate
-            None   # Required job not found
-        ]
-        mock_dependency_repo.get_required_jobs.return_value = [
-            {'required_job_id': 2, 'job_name': 'Inbound'}
+        mock_dependency_repo.get_missing_required_jobs.return_value = [
+            {'required_job_id': 2, 'job_name': 'Inbound'}  # Required job not scanned
         ]
+        mock_scan_log_repo.check_duplicate.return_value = None  # Not scanned before
 
         result = scan_service.process_scan(
             barcode="BARCODE123",
@@ -327,15 +327,40 @@ class TestScanServiceProcessScan:
         assert result['success'] is False
         assert 'Inbound' in result['message']
         assert 'missing_dependencies' in result['data']
+        mock_scan_log_repo.create_scan_if_new.assert_not_called()
+
+    def test_process_scan_duplicate_reported_before_missing_dependencies(
+        self, scan_service, mock_scan_log_repo, mock_sub_job_repo, mock_dependency_repo
+    ):
+        """Test a rescan whose prerequisite was removed is still reported as a duplicate"""
+        mock_sub_job_repo.find_by_name.return_value = {'id': 10, 'sub_job_name': 'Picking'}
+        mock_dependency_repo.get_missing_required_jobs.return_value = [
+            {'required_job_id': 2, 'job_name': 'Inbound'}
+        ]
+        mock_scan_log_repo.check_duplicate.return_value = {
+            'id': 123, 'barcode': 'BARCODE123', 'job_id': 3, 'sub_job_id': 10
+        }
+
+        result = scan_service.process_scan(
+            barcode="BARCODE123",
+            job_type_name="Outbound",
+            job_id=3,
+            sub_job_type_name="Picking",
+            user_id="user1"
+        )
+
+        assert result['success'] is False
+        assert 'ซ้ำ' in result['message']
+        assert result['data']['duplicate_info']['id'] == 123
+        mock_scan_log_repo.create_scan_if_new.assert_not_called()
 
     def test_process_scan_save_error(
         self, scan_service, mock_scan_log_repo, mock_sub_job_repo, mock_dependency_repo
     ):
         """Test scan handles save errors"""
         mock_sub_job_repo.find_by_name.return_value = {'id': 10, 'sub_job_name': 'Receiving'}
-        mock_scan_log_repo.check_duplicate.return_value = None
-        mock_dependency_repo.get_required_jobs.return_value = []
-        mock_scan_log_repo.create_scan.side_effect = Exception("Database error")
+        mock_dependency_repo.get_missing_required_jobs.return_value = []
+        mock_scan_log_repo.create_scan_if_new.side_effect = Exception("Database error")
 
         result = scan_service.process_scan(
             barcode="BARCODE123",
@@ -347,3 +372,92 @@ class TestScanServiceProcessScan:
 
         assert result['success'] is False
         assert 'บันทึก' in result['message']
+
+
+@pytest.mark.unit
+@pytest.mark.services
+class TestScanServiceTodayCount:
+    """Test cached today's scan count"""
+
+    def test_get_today_count_queries_repository(self, scan_service, mock_scan_log_repo):
+        """Test count comes from the grouped per-sub-job counts"""
+        mock_scan_log_repo.get_today_counts_by_sub_job.return_value = {2: 7, 3: 4, None: 1}
+
+        count = scan_service.get_today_count(1, sub_job_id=2, notes_filter="box")
+
+        assert count == 7
+        mock_scan_log_repo.get_today_counts_by_sub_job.assert_called_once_with(
+            job_id=1, notes_filter="box"
+        )
+
+    def test_get_today_count_whole_job(self, scan_service, mock_scan_log_repo):
+        """Test no sub job sums every sub job, missing sub jobs count zero"""
+        mock_scan_log_repo.get_today_counts_by_sub_job.return_value = {2: 7, 3: 4, None: 1}
+
+        assert scan_service.get_today_count(1) == 12
+        assert scan_service.get_today_count(1, sub_job_id=99) == 0
+
+    def test_get_today_count_is_cached(self, scan_service, mock_scan_log_repo):
+        """Test repeated requests within the TTL reuse the counts"""
+        mock_scan_log_repo.get_today_counts_by_sub_job.return_value = {2: 7}
+
+        scan_service.get_today_count(1)
+        scan_service.get_today_count(1, sub_job_id=2)
+        scan_service.get_today_count(1, notes_filter="")
+
+        mock_scan_log_repo.get_today_counts_by_sub_job.assert_called_once()
+
+    def test_get_today_count_is_safe_across_threads(self, scan_service, mock_scan_log_repo):
+        """Test concurrent counts and cache clears never raise"""
+        import threading
+        mock_scan_log_repo.get_today_counts_by_sub_job.return_value = {2: 7}
+        errors = []
+
+        def count():
+            try:
+                for index in range(2000):
+                    scan_service.get_today_count(index % 5)
+            except Exception as e:
+                errors.append(e)
+
+        def clear():
+            for _ in range(2000):
+                with scan_service._today_count_lock:
+                    scan_service._today_count_cache.clear()
+
+        threads = [threading.Thread(target=count) for _ in range(4)]
+        threads.append(threading.Thread(target=clear))
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+
+    def test_get_today_count_expires(self, scan_service, mock_scan_log_repo):
+        """Test counts older than the TTL are re-queried"""
+        from src import constants
+        mock_scan_log_repo.get_today_counts_by_sub_job.side_effect = [{None: 7}, {None: 8}]
+
+        with patch('src.services.scan_service.time.monotonic', side_effect=[100.0, 100.0 + constants.TODAY_COUNT_CACHE_TTL_SECONDS]):
+            assert scan_service.get_today_count(1) == 7
+            assert scan_service.get_today_count(1) == 8
+
+    def test_successful_scan_clears_cached_counts(
+        self, scan_service, mock_scan_log_repo, mock_sub_job_repo, mock_dependency_repo
+    ):
+        """Test a saved scan makes the next count hit the database"""
+        mock_scan_log_repo.get_today_counts_by_sub_job.side_effect = [{10: 7}, {10: 8}]
+        mock_sub_job_repo.find_by_name.return_value = {'id': 10, 'sub_job_name': 'Receiving'}
+        mock_dependency_repo.get_missing_required_jobs.return_value = []
+        mock_scan_log_repo.create_scan_if_new.return_value = 1
+
+        assert scan_service.get_today_count(1) == 7
+        scan_service.process_scan(
+            barcode="BARCODE123",
+            job_type_name="Inbound",
+            job_id=1,
+            sub_job_type_name="Receiving",
+            user_id="user1"
+        )
+        assert scan_service.get_today_count(1) == 8
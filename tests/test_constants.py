@@ -30,6 +30,7 @@ class TestUIComponentSizes:
     def test_entry_field_widths(self):
         assert constants.ENTRY_FIELD_WIDTH == 40
         assert constants.COMBOBOX_WIDTH == 30
+        assert constants.COMBOBOX_MAX_ITEMS == 100
 
     def test_treeview_heights(self):
         """Test treeview height constants"""
@@ -59,6 +60,12 @@ class TestTimeSettings:
     def test_default_date_range(self):
         assert constants.DEFAULT_DATE_RANGE_DAYS == 7
 
+    def test_search_debounce(self):
+        assert constants.SEARCH_DEBOUNCE_MS == 150
+
+    def test_scan_success_toast(self):
+        assert constants.SCAN_SUCCESS_TOAST_MS == 1500
+
 
 class TestDataLimits:
     """Test data limit constants"""
@@ -66,10 +73,37 @@ class TestDataLimits:
     def test_scan_limits(self):
         assert constants.RECENT_SCANS_LIMIT == 50
         assert constants.HISTORY_SCANS_LIMIT == 10000
+        assert constants.HISTORY_PAGE_SIZE == 500
+
+    def test_report_cache_limits(self):
+        assert constants.REPORT_PAGE_SIZE == 500
+        assert constants.REPORT_CACHE_SIZE == 16
+        assert constants.REPORT_CACHE_TTL_SECONDS == 60
+
+    def test_today_count_cache_limits(self):
+        assert constants.TODAY_COUNT_CACHE_SIZE == 64
+        assert constants.TODAY_COUNT_CACHE_TTL_SECONDS == 5
+
+    def test_master_data_cache_limits(self):
+        assert constants.MASTER_DATA_CACHE_SIZE == 128
+        assert constants.MASTER_DATA_CACHE_TTL_SECONDS == 60
+
+    def test_connection_validate_idle(self):
+        assert constants.CONNECTION_VALIDATE_IDLE_SECONDS == 30
+
+    def test_db_pool_max_idle(self):
+        assert constants.DB_POOL_MAX_IDLE == 4
+
+    def test_db_fetch_batch_size(self):
+        assert constants.DB_FETCH_BATCH_SIZE == 1000
+
+    def test_db_statement_cache_size(self):
+        assert constants.DB_STATEMENT_CACHE_SIZE == 64
 
     def test_import_limits(self):
         assert constants.IMPORT_PREVIEW_LIMIT == 20
         assert constants.IMPORT_ERRORS_DISPLAY_LIMIT == 10
+        assert constants.IMPORT_INSERT_BATCH_SIZE == 500
 
 
 class TestFileExtensions:
@@ -230,6 +264,17 @@ class TestPaddingConstants:
         assert constants.PADDING_SECTION_TOP == {"pady": (0, 20)}
         assert constants.PADDING_SECTION_VERTICAL == {"pady": (0, 10)}
 
+    def test_padding_is_read_only(self):
+        """Shared padding mappings must not be mutable by callers"""
+        with pytest.raises(TypeError):
+            constants.PADDING_STANDARD["padx"] = 0
+
+    def test_padding_unpacks_as_kwargs(self):
+        def pack(**kwargs):
+            return kwargs
+
+        assert pack(**constants.PADDING_SMALL) == {"padx": 5, "pady": 5}
+
 
 class TestFonts:
     """Test font constants"""
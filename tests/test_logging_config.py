@@ -5,6 +5,7 @@ Tests all logging functionality including setup, handlers, formatters,
 specialized loggers, and logging utilities.
 """
 import logging
+import logging.handlers
 import os
 from pathlib import Path
 from unittest.mock import Mock, MagicMock, patch, call
@@ -26,6 +27,7 @@ from src.logging_config import (
     MAX_BYTES,
     BACKUP_COUNT,
     setup_logging,
+    stop_queue_listener,
     get_logger,
     get_database_logger,
     get_service_logger,
@@ -253,6 +255,59 @@ class TestSetupLogging:
             assert formatter.datefmt == LOG_DATE_FORMAT
 
 
+class TestQueueLogging:
+    """Test setup_logging with use_queue=True"""
+
+    def teardown_method(self):
+        stop_queue_listener()
+
+    def test_queue_mode_installs_single_queue_handler(self, tmp_path):
+        """Root logger should only hold a QueueHandler"""
+        logger = setup_logging(
+            log_dir=str(tmp_path / "queue_logs"), console_output=True, use_queue=True
+        )
+
+        assert len(logger.handlers) == 1
+        assert isinstance(logger.handlers[0], logging.handlers.QueueHandler)
+
+    def test_queue_mode_writes_to_file(self, tmp_path):
+        """Records should reach the file once the listener is stopped"""
+        log_dir = tmp_path / "queue_file_logs"
+        setup_logging(log_dir=str(log_dir), console_output=False, use_queue=True)
+
+        get_logger("test.queue").info("Queued message")
+        stop_queue_listener()
+
+        content = (log_dir / LOG_FILE_APP).read_text(encoding="utf-8")
+        assert "Queued message" in content
+
+    def test_queue_mode_respects_error_handler_level(self, tmp_path):
+        """Error log should still only receive ERROR and above"""
+        log_dir = tmp_path / "queue_level_logs"
+        setup_logging(log_dir=str(log_dir), console_output=False, use_queue=True)
+
+        logger = get_logger("test.queue.levels")
+        logger.info("Info only")
+        logger.error("Real error")
+        stop_queue_listener()
+
+        content = (log_dir / LOG_FILE_ERROR).read_text(encoding="utf-8")
+        assert "Real error" in content
+        assert "Info only" not in content
+
+    def test_setup_again_replaces_listener(self, tmp_path):
+        """Calling setup_logging twice should not stack handlers"""
+        setup_logging(log_dir=str(tmp_path / "q1"), console_output=False, use_queue=True)
+        logger = setup_logging(log_dir=str(tmp_path / "q2"), console_output=False, use_queue=True)
+
+        assert len(logger.handlers) == 1
+
+    def test_stop_queue_listener_without_listener(self):
+        """Stopping when no listener is running should be a no-op"""
+        stop_queue_listener()
+        stop_queue_listener()
+
+
 class TestGetLogger:
     """Test get_logger function"""
 
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for ScanningTab job type lookups
+"""
+
+import pytest
+from unittest.mock import MagicMock
+from src.ui.tabs.scanning_tab import ScanningTab
+
+
+@pytest.fixture
+def scanning_tab():
+    """ScanningTab with mocked repositories and widgets (no Tk window needed)"""
+    tab = ScanningTab.__new__(ScanningTab)
+    tab.job_type_repo = MagicMock()
+    tab.sub_job_repo = MagicMock()
+    tab.job_type_combo = MagicMock()
+    tab.sub_job_type_combo = MagicMock()
+    tab.job_type_var = MagicMock()
+    tab._job_id_by_name = {}
+    tab._sub_id_by_name = {}
+    return tab
+
+
+@pytest.mark.unit
+@pytest.mark.ui
+class TestScanningTabJobLookups:
+    """Test the name -> id maps built from repository rows"""
+
+    def test_refresh_job_types_maps_names_to_ids(self, scanning_tab):
+        """Test job types are keyed on job_name as returned by get_all_job_types"""
+        scanning_tab.job_type_repo.get_all_job_types.return_value = [
+            {'id': 1, 'job_name': 'Inbound'},
+            {'id': 2, 'job_name': 'Outbound'}
+        ]
+
+        scanning_tab.refresh_job_types()
+
+        assert scanning_tab._job_id_by_name == {'Inbound': 1, 'Outbound': 2}
+        scanning_tab.job_type_combo.__setitem__.assert_called_once_with(
+            'values', ['Inbound', 'Outbound']
+        )
+        scanning_tab.job_type_combo.set.assert_called_once_with('Inbound')
+
+    def test_on_job_type_change_maps_sub_job_names_to_ids(self, scanning_tab):
+        """Test sub jobs are keyed on sub_job_name as returned by get_by_main_job"""
+        scanning_tab._job_id_by_name = {'Inbound': 1}
+        scanning_tab.job_type_var.get.return_value = 'Inbound'
+        scanning_tab.sub_job_repo.get_by_main_job.return_value = [
+            {'id': 10, 'sub_job_name': 'Receiving'},
+            {'id': 11, 'sub_job_name': 'Putaway'}
+        ]
+
+        scanning_tab.on_job_type_change()
+
+        scanning_tab.sub_job_repo.get_by_main_job.assert_called_once_with(1, active_only=True)
+        assert scanning_tab._sub_id_by_name == {'Receiving': 10, 'Putaway': 11}
+        scanning_tab.sub_job_type_combo.set.assert_called_once_with('Receiving')
@@ -253,6 +253,23 @@ BEGIN
     PRINT 'Index IX_scan_logs_sub_job_id created.';
 END
 
+-- 2.5 สร้าง Covering Index สำหรับรายงาน (ช่วงวันที่ + งานหลัก)
+-- =====================================================
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_scan_logs_date_job')
+BEGIN
+    CREATE INDEX IX_scan_logs_date_job ON scan_logs(scan_date, job_id)
+        INCLUDE (barcode, notes, user_id, sub_job_id);
+    PRINT 'Index IX_scan_logs_date_job created.';
+END
+
+-- 2.6 สร้าง Index สำหรับนับจำนวนสแกนวันนี้ต่องานหลัก/งานรอง
+-- =====================================================
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_scan_logs_job_date')
+BEGIN
+    CREATE INDEX IX_scan_logs_job_date ON scan_logs(job_id, sub_job_id, scan_date);
+    PRINT 'Index IX_scan_logs_job_date created.';
+END
+
 -- =====================================================
 -- ส่วนที่ 3: Stored Procedures สำหรับรายงาน
 -- =====================================================
@@ -587,6 +604,37 @@ BEGIN
 END
 GO
 
+-- =====================================================
+-- ส่วนที่ 7: Full-Text Index สำหรับกรองหมายเหตุ (ไม่บังคับ)
+-- =====================================================
+-- รายงานที่กรองหมายเหตุแบบขึ้นต้นคำ (ลงท้ายด้วย *) จะใช้ CONTAINS แทน LIKE '%...%' เมื่อมี index นี้
+-- ต้องติดตั้ง Full-Text Search ใน SQL Server และรันนอก transaction
+
+IF FULLTEXTSERVICEPROPERTY('IsFullTextInstalled') = 1
+BEGIN
+    IF NOT EXISTS (SELECT * FROM sys.fulltext_catalogs WHERE name = 'wms_fulltext_catalog')
+        CREATE FULLTEXT CATALOG wms_fulltext_catalog;
+END
+ELSE
+    PRINT 'Full-Text Search is not installed - notes filter will use LIKE.';
+GO
+
+IF FULLTEXTSERVICEPROPERTY('IsFullTextInstalled') = 1
+   AND NOT EXISTS (SELECT * FROM sys.fulltext_indexes WHERE object_id = OBJECT_ID('scan_logs'))
+BEGIN
+    DECLARE @pk_name SYSNAME = (
+        SELECT name FROM sys.indexes
+        WHERE object_id = OBJECT_ID('scan_logs') AND is_primary_key = 1
+    );
+    -- EXEC() รับได้เฉพาะ literal/ตัวแปร จึงต้องประกอบคำสั่งใส่ตัวแปรก่อน
+    DECLARE @fulltext_sql NVARCHAR(MAX) =
+        N'CREATE FULLTEXT INDEX ON scan_logs(notes) KEY INDEX ' + QUOTENAME(@pk_name)
+        + N' ON wms_fulltext_catalog WITH CHANGE_TRACKING AUTO';
+    EXEC sp_executesql @fulltext_sql;
+    PRINT 'Created full-text index on scan_logs(notes).';
+END
+GO
+
 -- =====================================================
 -- สรุปการติดตั้งทั้งหมด
 -- =====================================================